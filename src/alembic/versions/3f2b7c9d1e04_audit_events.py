@@ -0,0 +1,67 @@
+"""audit events
+
+Revision ID: 3f2b7c9d1e04
+Revises: a4410be9559b
+Create Date: 2026-10-19 10:12:41.532104
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '3f2b7c9d1e04'
+down_revision: Union[str, Sequence[str], None] = 'a4410be9559b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'audit_events',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('resource', sa.String(length=64), nullable=False),
+        sa.Column('action', sa.String(length=64), nullable=False),
+        sa.Column('actor_id', sa.Integer(), nullable=True),
+        sa.Column('request_id', sa.String(length=64), nullable=True),
+        sa.Column(
+            'payload',
+            postgresql.JSONB(astext_type=sa.Text()),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint('id', 'created_at'),
+        postgresql_partition_by='RANGE (created_at)',
+    )
+    op.create_index(
+        'ix_audit_events_resource_created',
+        'audit_events',
+        ['resource', 'created_at'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_audit_events_actor_created',
+        'audit_events',
+        ['actor_id', 'created_at'],
+        unique=False,
+    )
+    # Помесячные секции создаёт core.audit; default-секция страхует
+    # вставку, если секция месяца ещё не создана.
+    op.execute(
+        'CREATE TABLE audit_events_default '
+        'PARTITION OF audit_events DEFAULT',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_audit_events_actor_created', table_name='audit_events')
+    op.drop_index(
+        'ix_audit_events_resource_created',
+        table_name='audit_events',
+    )
+    op.drop_table('audit_events')
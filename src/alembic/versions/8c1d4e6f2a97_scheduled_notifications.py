@@ -0,0 +1,82 @@
+"""scheduled notifications
+
+Revision ID: 8c1d4e6f2a97
+Revises: 3f2b7c9d1e04
+Create Date: 2026-10-19 11:02:17.418263
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '8c1d4e6f2a97'
+down_revision: Union[str, Sequence[str], None] = '3f2b7c9d1e04'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'scheduled_notifications',
+        sa.Column('booking_id', sa.Integer(), nullable=True),
+        sa.Column('kind', sa.String(length=32), nullable=False),
+        sa.Column('recipient', sa.String(length=254), nullable=False),
+        sa.Column('subject', sa.String(length=255), nullable=False),
+        sa.Column('body', sa.Text(), nullable=False),
+        sa.Column('due_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            'dispatched_at',
+            sa.DateTime(timezone=True),
+            nullable=True,
+        ),
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ['booking_id'],
+            ['bookings.id'],
+            ondelete='CASCADE',
+        ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        op.f('ix_scheduled_notifications_id'),
+        'scheduled_notifications',
+        ['id'],
+        unique=False,
+    )
+    op.create_index(
+        op.f('ix_scheduled_notifications_booking_id'),
+        'scheduled_notifications',
+        ['booking_id'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_scheduled_notifications_due_at',
+        'scheduled_notifications',
+        ['due_at'],
+        unique=False,
+        postgresql_where=sa.text('is_active AND dispatched_at IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        'ix_scheduled_notifications_due_at',
+        table_name='scheduled_notifications',
+    )
+    op.drop_index(
+        op.f('ix_scheduled_notifications_booking_id'),
+        table_name='scheduled_notifications',
+    )
+    op.drop_index(
+        op.f('ix_scheduled_notifications_id'),
+        table_name='scheduled_notifications',
+    )
+    op.drop_table('scheduled_notifications')
@@ -0,0 +1,45 @@
+"""manager booking digest
+
+Revision ID: b7e3c1a9f4d2
+Revises: 5e9a0b3c7d21
+Create Date: 2026-10-19 14:20:41.902315
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e3c1a9f4d2'
+down_revision: Union[str, Sequence[str], None] = '5e9a0b3c7d21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'users',
+        sa.Column(
+            'booking_digest',
+            sa.Boolean(),
+            server_default=sa.false(),
+            nullable=False,
+        ),
+    )
+    op.add_column(
+        'cafe_managers',
+        sa.Column(
+            'digest_sent_at',
+            sa.DateTime(timezone=True),
+            nullable=True,
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('cafe_managers', 'digest_sent_at')
+    op.drop_column('users', 'booking_digest')
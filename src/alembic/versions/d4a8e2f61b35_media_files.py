@@ -0,0 +1,49 @@
+"""media files
+
+Revision ID: d4a8e2f61b35
+Revises: b7e3c1a9f4d2
+Create Date: 2026-10-19 15:37:12.640018
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a8e2f61b35'
+down_revision: Union[str, Sequence[str], None] = 'b7e3c1a9f4d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'media_files',
+        sa.Column('media_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('sha256', sa.String(length=64), nullable=False),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.Column('ref_count', sa.Integer(), nullable=False),
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('media_id'),
+        sa.UniqueConstraint('sha256'),
+    )
+    op.create_index(
+        op.f('ix_media_files_id'),
+        'media_files',
+        ['id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_media_files_id'), table_name='media_files')
+    op.drop_table('media_files')
@@ -1,11 +1,13 @@
 from fastapi import APIRouter
 
 from .endpoints import action as action_router
+from .endpoints import audit as audit_router
 from .endpoints import auth as auth_router
 from .endpoints import booking as booking_router
 from .endpoints import cafe as cafe_router
 from .endpoints import dishes as dishes_router
 from .endpoints import media as media_router
+from .endpoints import profiles as profiles_router
 from .endpoints import slots as slots_router
 from .endpoints import table as table_router
 from .endpoints import users as users_router
@@ -20,6 +22,8 @@ api_router.include_router(dishes_router.router)
 api_router.include_router(booking_router.router)
 api_router.include_router(media_router.router)
 api_router.include_router(action_router.router)
+api_router.include_router(audit_router.router)
+api_router.include_router(profiles_router.router)
 
 
 __all__ = ['api_router']
@@ -1,10 +1,11 @@
-from typing import List
+from typing import List, Optional
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.exceptions import err
 from api.validators.cafe import check_cafe_permissions, get_cafe_or_404
+from core.fieldsets import Fieldset, partial_schema, public_names
 from crud.cafe import cafe_crud
 from models.user import User
 from schemas.cafe import CafeCreate, CafeInfo, CafeUpdate
@@ -19,18 +20,24 @@ class CafeService:
         session: AsyncSession,
         current_user: User,
         show_all: bool = False,
+        fields: Optional[Fieldset] = None,
     ) -> List[CafeInfo]:
-        """Получает список кафе и фильтрует их."""
-        cafes_db = await cafe_crud.get_multi(session=session)
+        """Получает список кафе и фильтрует их.
+
+        С `fields` из БД читаются и в ответ попадают только эти поля.
+        """
         is_admin_or_manager = current_user.role in (
             UserRole.ADMIN,
             UserRole.MANAGER,
         )
-        if not (is_admin_or_manager and show_all):
-            cafes_db = [cafe for cafe in cafes_db if cafe.is_active]
-
+        cafes_db = await cafe_crud.get_multi(
+            session=session,
+            only_active=not (is_admin_or_manager and show_all),
+            fields=fields,
+        )
+        schema = partial_schema(CafeInfo, fields)
         return [
-            CafeInfo.model_validate(cafe, from_attributes=True)
+            schema.model_validate(cafe, from_attributes=True)
             for cafe in cafes_db
         ]
 
@@ -39,9 +46,19 @@ class CafeService:
         session: AsyncSession,
         cafe_id: int,
         current_user: User,
+        fields: Optional[Fieldset] = None,
     ) -> CafeInfo:
-        """Получает конкретное кафе, проверяет права доступа."""
-        cafe_db = await get_cafe_or_404(cafe_id, session)
+        """Получает конкретное кафе, проверяет права доступа.
+
+        Из БД читаются только поля ответа или `fields` (и is_active для
+        проверки доступа), в ответ - только запрошенные.
+        """
+        load = fields or Fieldset(public_names(CafeInfo))
+        cafe_db = await get_cafe_or_404(
+            cafe_id,
+            session,
+            fields=load.with_fields('is_active'),
+        )
 
         is_admin_or_manager = current_user.role in (
             UserRole.ADMIN,
@@ -51,7 +68,9 @@ class CafeService:
         if not cafe_db.is_active and not is_admin_or_manager:
             raise err('NOT_FOUND', 'Кафе не найдено', 404)
 
-        return CafeInfo.model_validate(cafe_db, from_attributes=True)
+        return partial_schema(CafeInfo, fields).model_validate(
+            cafe_db, from_attributes=True,
+        )
 
     @staticmethod
     async def create_cafe(
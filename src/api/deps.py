@@ -1,12 +1,25 @@
-from typing import Annotated, Optional
-
-from fastapi import Depends, HTTPException, Request, Response, Security, status
+from typing import Annotated, Callable, Optional
+
+from fastapi import (
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    Security,
+    status,
+)
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from pydantic import BaseModel
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import load_only
 
+from api.exceptions import unprocessable
 from core.db import get_session
+from core.fieldsets import Fieldset, parse_fields, public_names
+from core.profiling import allow_profile, requested_format
+from core.reqctx import set_user
 from core.security import TokenError, decode_token
 from models.user import User
 from schemas.user import UserInfo, UserRole
@@ -23,6 +36,7 @@ USER_FIELDS_TO_LOAD = [
     User.tg_id,
     User.role,
     User.is_active,
+    User.booking_digest,
     User.created_at,
     User.updated_at,
 ]
@@ -125,8 +139,9 @@ async def inject_user_into_state(
     request: Request,
     user: Annotated[Optional[User], Depends(get_current_user_optional)],
 ) -> None:
-    """Кладёт пользователя (если есть) в request.state.user."""
+    """Кладёт пользователя (если есть) в request.state.user и контекст."""
     request.state.user = user
+    set_user(user)
 
 
 async def require_manager_or_admin(
@@ -139,3 +154,60 @@ async def require_manager_or_admin(
             detail='Forbidden',
         )
     return current
+
+
+async def allow_profiling(
+    request: Request,
+    user: Annotated[Optional[UserInfo], Depends(get_current_user_optional)],
+) -> None:
+    """Пускает запрос с флагом профилирования только менеджеру или админу.
+
+    Без флага ничего не делает. С флагом аноним получает 401, прочие
+    роли - 403 от `require_manager_or_admin`; иначе ProfilingMiddleware
+    сохранит отчёт.
+    """
+    if requested_format(request.scope) is None:
+        return
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail='Not authenticated',
+            headers={'WWW-Authenticate': 'Bearer'},
+        )
+    await require_manager_or_admin(user)
+    allow_profile(request.scope)
+
+
+async def require_admin(
+    current: Annotated[User, Depends(get_current_user)],
+) -> UserInfo:
+    """Проверяет, что текущий пользователь - админ."""
+    if current.role != int(UserRole.ADMIN):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail='Forbidden',
+        )
+    return current
+
+
+def fields_query(
+    schema: type[BaseModel],
+) -> Callable[..., Optional[Fieldset]]:
+    """Зависимость для `?fields=`: набор полей ответа по схеме."""
+    description = (
+        'Поля ответа через запятую, по умолчанию все: '
+        + ', '.join(public_names(schema))
+    )
+
+    def dependency(
+        fields: Annotated[
+            Optional[str],
+            Query(description=description),
+        ] = None,
+    ) -> Optional[Fieldset]:
+        try:
+            return parse_fields(fields, schema)
+        except ValueError as e:
+            raise unprocessable(str(e))
+
+    return dependency
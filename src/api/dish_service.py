@@ -7,6 +7,7 @@ from models.dish import Dish
 from models.user import User
 from schemas.dish import DishCreate, DishUpdate
 from schemas.dish import DishCreate, DishUpdate, DishInfo
+from schemas.dish import DishBulkCreate, DishBulkUpdate
 
 
 class DishService:
@@ -65,3 +66,46 @@ class DishService:
             DishInfo.model_validate(dish, from_attributes=True)
             for dish in dishes_db
         ]
+
+    async def create_many(
+        self,
+        dishes_in: DishBulkCreate,
+        session: AsyncSession,
+    ) -> List[DishInfo]:
+        """Создать пачку блюд."""
+        dishes_db = await self.crud.create_many(
+            dishes_in.items,
+            session=session,
+        )
+        return [
+            DishInfo.model_validate(dish, from_attributes=True)
+            for dish in dishes_db
+        ]
+
+    async def update_many(
+        self,
+        dishes_in: DishBulkUpdate,
+        session: AsyncSession,
+    ) -> List[DishInfo]:
+        """Обновить пачку блюд одинаковыми данными."""
+        dishes_db = await self.crud.update_many(
+            dishes_in.ids,
+            dishes_in.data,
+            session=session,
+        )
+        return [
+            DishInfo.model_validate(dish, from_attributes=True)
+            for dish in dishes_db
+        ]
+
+    async def deactivate_many(
+        self,
+        dish_ids: List[int],
+        session: AsyncSession,
+    ) -> List[DishInfo]:
+        """Деактивировать пачку блюд."""
+        dishes_db = await self.crud.deactivate_many(dish_ids, session=session)
+        return [
+            DishInfo.model_validate(dish, from_attributes=True)
+            for dish in dishes_db
+        ]
@@ -0,0 +1,70 @@
+from datetime import datetime
+from typing import Annotated, List, Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.deps import require_admin
+from api.responses import (
+    FORBIDDEN_RESPONSE,
+    SUCCESSFUL_RESPONSE,
+    UNAUTHORIZED_RESPONSE,
+    VALIDATION_ERROR_RESPONSE,
+)
+from core.constants import AUDIT_PAGE_MAX
+from core.db import get_session
+from crud.audit import audit_crud
+from schemas.audit import AuditEventInfo
+from schemas.user import UserInfo
+
+router = APIRouter(prefix='/audit', tags=['Аудит'])
+
+
+@router.get(
+    '',
+    response_model=List[AuditEventInfo],
+    summary='Журнал аудита',
+    responses={
+        **SUCCESSFUL_RESPONSE,
+        **FORBIDDEN_RESPONSE,
+        **UNAUTHORIZED_RESPONSE,
+        **VALIDATION_ERROR_RESPONSE,
+    },
+)
+async def list_audit_events(
+    _: Annotated[UserInfo, Depends(require_admin)],
+    session: Annotated[AsyncSession, Depends(get_session)],
+    resource: Annotated[
+        Optional[str],
+        Query(description='Ресурс, например cafes или booking'),
+    ] = None,
+    action: Annotated[
+        Optional[str],
+        Query(description='Действие, например created'),
+    ] = None,
+    actor_id: Annotated[
+        Optional[int],
+        Query(description='ID пользователя, выполнившего действие'),
+    ] = None,
+    since: Annotated[
+        Optional[datetime],
+        Query(description='Начало периода (включительно)'),
+    ] = None,
+    until: Annotated[
+        Optional[datetime],
+        Query(description='Конец периода (не включительно)'),
+    ] = None,
+    limit: Annotated[int, Query(ge=1, le=AUDIT_PAGE_MAX)] = 100,
+    offset: Annotated[int, Query(ge=0)] = 0,
+) -> List[AuditEventInfo]:
+    """Возвращает события аудита по фильтрам. Только для администраторов."""
+    return await audit_crud.get_multi(
+        session,
+        resource=resource,
+        action=action,
+        actor_id=actor_id,
+        since=since,
+        until=until,
+        limit=limit,
+        offset=offset,
+    )
@@ -1,17 +1,20 @@
-from typing import List, Optional
+from typing import Annotated, List, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from api.deps import get_current_user
+from api.deps import fields_query, get_current_user
+from api.idempotency import idempotent
 from api.responses import (
     BAD_RESPONSE,
+    CONFLICT_RESPONSE,
     FORBIDDEN_RESPONSE,
     NOT_FOUND_RESPONSE,
     UNAUTHORIZED_RESPONSE,
     VALIDATION_ERROR_RESPONSE,
 )
 from api.validators.booking import (
+    active_booking,
     admin_or_manager_check,
     ban_change_status,
     booking_exists,
@@ -24,7 +27,9 @@ from api.validators.booking import (
 from core.db import get_session
 from core.redis import get_redis, redis_cache
 from core.decorators.redis import cache_response
-from core.constants import EXPIRE_CASHE_TIME
+from core.constants import EXPIRE_CASHE_TIME, IDEMPOTENCY_KEY_MAX
+from core.fieldsets import Fieldset
+from core.serialization import json_response
 from crud.booking import booking_crud
 from models.user import User
 from schemas.booking import BookingCreate, BookingInfo, BookingUpdate
@@ -39,7 +44,7 @@ router = APIRouter(prefix='/booking', tags=['Бронирования'])
                 **VALIDATION_ERROR_RESPONSE},
             )
 @cache_response(
-    cache_key_template="booking:{user.role}:{show_all}",
+    cache_key_template="booking:{user.role}:{show_all}:{fields}",
     expire=EXPIRE_CASHE_TIME,
     response_model=BookingInfo
 )
@@ -50,11 +55,13 @@ async def get_list_booking(
     user_id: Optional[int] = None,
     session: AsyncSession = Depends(get_session),
     user: User = Depends(get_current_user),
+    fields: Optional[Fieldset] = Depends(fields_query(BookingInfo)),
 ) -> List[BookingInfo]:
     """Получение списка бронирований.
 
     Для администраторов и менеджеров - все бронирования (с возможностью
     фильтрации), для обычных пользователей - только свои бронирования.
+    `fields` ограничивает поля ответа, колонки и загружаемые связи.
     """
 
     if cafe_id:
@@ -62,11 +69,13 @@ async def get_list_booking(
     if not await admin_or_manager_check(user):
         return await booking_crud.get_multi_booking(
             session=session,
+            fields=fields,
             cafe_id=cafe_id,
             user_id=user.id,
         )
     return await booking_crud.get_multi_booking(
         session=session,
+        fields=fields,
         show_all=show_all,
         cafe_id=cafe_id,
         user_id=user_id,
@@ -78,16 +87,24 @@ async def get_list_booking(
              responses={
                  **UNAUTHORIZED_RESPONSE,
                  **VALIDATION_ERROR_RESPONSE,
-                 **BAD_RESPONSE},
+                 **BAD_RESPONSE,
+                 **CONFLICT_RESPONSE},
              )
+@idempotent(scope='booking', body_arg='booking')
 async def create_booking(
     booking: BookingCreate,
+    idempotency_key: Annotated[
+        Optional[str],
+        Header(alias='Idempotency-Key', max_length=IDEMPOTENCY_KEY_MAX),
+    ] = None,
     session: AsyncSession = Depends(get_session),
     user: User = Depends(get_current_user),
 ) -> BookingInfo:
     """Создает новое бронирования.
 
-    Только для авторизированных пользователей.
+    Только для авторизированных пользователей. Повтор запроса с тем же
+    заголовком Idempotency-Key в течение суток возвращает первый ответ
+    и не создаёт второе бронирование.
     """
     await check_booking_date(booking.booking_date)
     await check_all_objects(
@@ -117,6 +134,7 @@ async def get_booking(
     booking_id: int,
     session: AsyncSession = Depends(get_session),
     user: User = Depends(get_current_user),
+    fields: Optional[Fieldset] = Depends(fields_query(BookingInfo)),
 ) -> BookingInfo:
     """Получение информации о бронировании по его ID.
 
@@ -124,12 +142,17 @@ async def get_booking(
     для обычных пользователей - только свои бронирования.
     """
     if not await admin_or_manager_check(user):
-        return await booking_crud.get_booking_current_user(
+        booking = await booking_crud.get_booking_current_user(
             booking_id,
             user,
             session,
+            fields,
         )
-    return await booking_exists(booking_id, session)
+        if booking is None:
+            return booking
+    else:
+        booking = await active_booking(booking_id, session, fields)
+    return json_response(booking, BookingInfo)
 
 
 @router.patch('/{booking_id}', response_model=BookingInfo,
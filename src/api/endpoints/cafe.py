@@ -1,11 +1,15 @@
-from typing import Annotated, List, Annotated
+from typing import Annotated, List, Annotated, Optional
 
 import redis
 from fastapi import APIRouter, Depends, Path, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.cafe_service import CafeService
-from api.deps import get_current_user, require_manager_or_admin
+from api.deps import (
+    fields_query,
+    get_current_user,
+    require_manager_or_admin,
+)
 from api.responses import (CAFE_DUPLICATE_RESPONSE, FORBIDDEN_RESPONSE,
                            INVALID_ID_RESPONSE, INVALID_MANAGER_ID_RESPONSE,
                            NOT_FOUND_RESPONSE, SUCCESSFUL_RESPONSE,
@@ -14,6 +18,7 @@ from core.db import get_session
 from core.redis import get_redis, redis_cache
 from core.decorators.redis import cache_response
 from core.constants import EXPIRE_CASHE_TIME
+from core.fieldsets import Fieldset
 from schemas.cafe import CafeCreate, CafeInfo, CafeUpdate
 from schemas.user import UserInfo
 
@@ -31,7 +36,7 @@ router = APIRouter(prefix='/cafes', tags=['Кафе'])
     },
 )
 @cache_response(
-    cache_key_template="cafe:{current_user.role}:{show_all}",
+    cache_key_template="cafe:{current_user.role}:{show_all}:{fields}",
     expire=EXPIRE_CASHE_TIME,
     response_model=CafeInfo
 )
@@ -48,17 +53,23 @@ async def get_all_cafes(
             ),
         ),
     ] = False,
+    fields: Annotated[
+        Optional[Fieldset],
+        Depends(fields_query(CafeInfo)),
+    ] = None,
 ) -> List[CafeInfo]:
     """Получение списка кафе.
 
     Для администраторов и менеджеров - все кафе
     (с возможностью выбора), для пользователей - только активные.
+    `fields` ограничивает поля ответа и читаемые из БД колонки.
     """
 
     cafes = await CafeService.get_all_cafes(
         session,
         current_user,
         show_all,
+        fields,
     )
     return cafes
 
@@ -104,7 +115,7 @@ async def create_cafe(
     },
 )
 @cache_response(
-    cache_key_template="cafes:{cafe_id}",
+    cache_key_template="cafes:{cafe_id}:{fields}",
     expire=EXPIRE_CASHE_TIME,
     response_model=CafeInfo
 )
@@ -118,6 +129,10 @@ async def get_cafe_by_id(
     session: Annotated[AsyncSession, Depends(get_session)],
     current_user: Annotated[UserInfo, Depends(get_current_user)],
     redis_client: Annotated[redis.Redis, Depends(get_redis)],
+    fields: Annotated[
+        Optional[Fieldset],
+        Depends(fields_query(CafeInfo)),
+    ] = None,
 ) -> CafeInfo:
     """Получение информации о кафе по его ID.
 
@@ -125,7 +140,9 @@ async def get_cafe_by_id(
     для пользователей - только активные.
     """
 
-    return await CafeService.get_cafe(session, cafe_id, current_user)
+    return await CafeService.get_cafe(
+        session, cafe_id, current_user, fields,
+    )
 
 
 @router.patch(
@@ -9,13 +9,15 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.deps import get_current_user, require_manager_or_admin
 from api.dish_service import DishService
+from api.exceptions import bad_request
 from api.validators.dishes import (
     check_cafe_exists,
     check_dish_access,
     check_name_unique,
 )
 from api.validators.dishes import (check_cafe_exists, check_dish_access,
-                                   check_name_unique)
+                                   check_dishes_exist, check_name_unique,
+                                   check_names_unique)
 from core.db import get_session
 from core.logging import get_user_logger
 from core.redis import get_redis, redis_cache
@@ -23,7 +25,9 @@ from core.decorators.redis import cache_response
 from core.constants import EXPIRE_CASHE_TIME
 from crud.dishes import dish_crud
 from models.user import User
-from schemas.dish import DishCreate, DishInfo, DishUpdate
+from schemas.common import BulkDeactivate
+from schemas.dish import (DishBulkCreate, DishBulkUpdate, DishCreate,
+                          DishInfo, DishUpdate)
 
 router = APIRouter(prefix="/dishes", tags=["Блюда"])
 dish_service = DishService(crud=dish_crud)
@@ -85,6 +89,75 @@ async def create_dish(
     return dish
 
 
+@router.post(
+    "/bulk",
+    response_model=List[DishInfo],
+    summary="Массовое создание блюд",
+    description="Только для администраторов и менеджеров.",
+)
+async def create_dishes_bulk(
+    dishes_in: DishBulkCreate,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(require_manager_or_admin),
+) -> List[DishInfo]:
+    """Создание пачки блюд одним запросом."""
+    await check_names_unique(
+        session,
+        [dish_in.name for dish_in in dishes_in.items],
+    )
+    await check_cafe_exists(
+        session,
+        list({
+            cafe_id
+            for dish_in in dishes_in.items
+            for cafe_id in dish_in.cafes_id
+        }),
+    )
+    dishes = await dish_service.create_many(dishes_in, session)
+    await redis_cache.delete_pattern('dishes:*')
+    return dishes
+
+
+@router.patch(
+    "/bulk",
+    response_model=List[DishInfo],
+    summary="Массовое обновление блюд",
+    description="Только для администраторов и менеджеров.",
+)
+async def update_dishes_bulk(
+    dishes_in: DishBulkUpdate,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(require_manager_or_admin),
+) -> List[DishInfo]:
+    """Обновление пачки блюд одинаковыми данными."""
+    if dishes_in.data.name is not None:
+        raise bad_request("Массово изменять название блюд нельзя.")
+    if dishes_in.data.cafes_id is not None:
+        await check_cafe_exists(session, dishes_in.data.cafes_id)
+    await check_dishes_exist(session, dishes_in.ids)
+    dishes = await dish_service.update_many(dishes_in, session)
+    await redis_cache.delete_pattern('dishes:*')
+    return dishes
+
+
+@router.post(
+    "/bulk/deactivate",
+    response_model=List[DishInfo],
+    summary="Массовая деактивация блюд",
+    description="Только для администраторов и менеджеров.",
+)
+async def deactivate_dishes_bulk(
+    payload: BulkDeactivate,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(require_manager_or_admin),
+) -> List[DishInfo]:
+    """Деактивация пачки блюд одним запросом."""
+    await check_dishes_exist(session, payload.ids)
+    dishes = await dish_service.deactivate_many(payload.ids, session)
+    await redis_cache.delete_pattern('dishes:*')
+    return dishes
+
+
 @router.get(
     "/{dish_id}",
     response_model=DishInfo,
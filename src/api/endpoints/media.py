@@ -1,18 +1,56 @@
-import uuid
+from email.utils import formatdate, parsedate_to_datetime
 from pathlib import Path
+from typing import Annotated, Optional
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
-from fastapi.responses import FileResponse
+import anyio.to_thread
+from PIL import Image
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Header,
+    Query,
+    Request,
+    UploadFile,
+    status,
+)
+from fastapi.responses import FileResponse, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.deps import require_manager_or_admin
-from api.validators.media import check_len_file, media_allowed_content_type
-from celery_tasks.tasks import save_image
+from api.validators.media import (
+    Upload,
+    media_allowed_content_type,
+    stream_upload,
+)
 from core.config import settings
+from core.constants import (
+    MEDIA_CACHE_CONTROL,
+    MEDIA_INLINE_MAX_PIXELS,
+    MEDIA_UPLOAD_DIR,
+    MEDIA_WIDTH_MAX,
+)
+from core.db import get_session, uow
+from core.media import (
+    DEFAULT_FORMAT,
+    FORMATS,
+    FULL_VARIANT,
+    delete_variants,
+    lookup_paths,
+    negotiate_format,
+    pick_variant,
+    save_variants_inline,
+    variant_filename,
+)
+from crud.media import media_crud
+from crud.outbox import outbox_crud
 from schemas.media import MediaUploadResponse
 
 router = APIRouter(prefix='/media', tags=['Медиа'])
 
 MEDIA_PATH = Path(settings.MEDIA_PATH)
+UPLOAD_PATH = MEDIA_PATH / MEDIA_UPLOAD_DIR
 
 
 @router.post(
@@ -21,38 +59,153 @@ MEDIA_PATH = Path(settings.MEDIA_PATH)
     summary='Загрузка изображений',
     dependencies=[Depends(require_manager_or_admin)],
 )
-async def upload_image(file: UploadFile = File(...)) -> MediaUploadResponse:
-    """Эндпоинт загрузки изображений."""
+async def upload_image(
+    file: UploadFile = File(...),
+    session: AsyncSession = Depends(get_session),
+) -> MediaUploadResponse:
+    """Эндпоинт загрузки изображений.
+
+    Небольшие картинки (до MEDIA_INLINE_MAX_SIZE байт) обрабатываются
+    сразу, и к ответу они уже доступны по GET /media/{id}. Остальные
+    сохраняются на общий с воркерами том, а задача `save_image` с путём
+    к файлу пишется в outbox той же транзакцией, что и запись
+    media_files. Повторная загрузка тех же байтов возвращает прежний
+    media_id без повторной обработки.
+    """
     file = media_allowed_content_type(file)
-    contents = await check_len_file(file)
-    media_id = str(uuid.uuid4())
+    UPLOAD_PATH.mkdir(parents=True, exist_ok=True)
+    upload = await stream_upload(file, UPLOAD_PATH)
+    queued = inline = False
     try:
-        save_image.delay(contents, media_id)
+        async with uow(session):
+            media_id, created = await media_crud.register(
+                upload.sha256, upload.size, session,
+            )
+            if created:
+                inline = await _save_inline(upload, str(media_id))
+                if not inline:
+                    outbox_crud.add(
+                        session,
+                        'save_image',
+                        upload_path=str(upload.path),
+                        media_id=str(media_id),
+                    )
+        # Файл нужен воркеру, только если событие зафиксировано.
+        queued = created and not inline
         return {
             'media_id': media_id,
         }
+    except HTTPException:
+        raise
     except Exception as e:
+        if inline:
+            await anyio.to_thread.run_sync(
+                delete_variants, str(media_id), MEDIA_PATH,
+            )
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f'Ошибка при обработке изображения: {str(e)}',
         )
+    finally:
+        if not queued:
+            upload.path.unlink(missing_ok=True)
+
+
+async def _save_inline(upload: Upload, media_id: str) -> bool:
+    """Обработать небольшую картинку в API; False - отдать в Celery.
+
+    В Celery уходят файлы больше MEDIA_INLINE_MAX_SIZE, картинки больше
+    MEDIA_INLINE_MAX_PIXELS пикселей и загрузки, пришедшие, когда пул
+    обработки в API занят.
+    """
+    if upload.size > settings.MEDIA_INLINE_MAX_SIZE:
+        return False
+    try:
+        saved = await save_variants_inline(
+            upload.path, media_id, MEDIA_PATH, MEDIA_INLINE_MAX_PIXELS,
+        )
+    except Image.DecompressionBombError:
+        return False
+    except (OSError, ValueError, SyntaxError):
+        await anyio.to_thread.run_sync(delete_variants, media_id, MEDIA_PATH)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='Не удалось обработать изображение',
+        )
+    return saved is not None
+
+
+def _not_modified(request: Request, etag: str, mtime: float) -> bool:
+    """Условный GET: совпал If-None-Match или файл не изменился с даты."""
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match is not None:
+        tags = {
+            tag.strip().removeprefix('W/') for tag in if_none_match.split(',')
+        }
+        return '*' in tags or etag in tags
+    if_modified_since = request.headers.get('if-modified-since')
+    if if_modified_since is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    return int(mtime) <= since.timestamp()
 
 
 @router.get('/{media_id}', summary='Получение изображения по ID')
-async def get_image(media_id: str) -> FileResponse:
-    """Получение изображения по ID."""
-    from api.validators.media import check_media_id, media_exist
+async def get_image(
+    request: Request,
+    media_id: str,
+    w: Annotated[
+        Optional[int],
+        Query(ge=1, le=MEDIA_WIDTH_MAX, description='Ширина на экране, px'),
+    ] = None,
+    accept: Annotated[Optional[str], Header()] = None,
+) -> Response:
+    """Получение изображения по ID.
 
-    media_id = check_media_id(media_id)
-    filename = f'{media_id}.jpg'
-    file_path = media_exist(MEDIA_PATH / filename)
+    Отдаётся наименьший вариант не уже `w` (без `w` - полный), в WebP,
+    если клиент указал его в Accept, иначе в JPEG. Для загрузок без
+    вариантов отдаётся исходный JPEG. Файл ищется в каталоге шарда,
+    затем в корне MEDIA_PATH (загрузки до перехода на шарды).
+
+    Файлы по media_id не меняются, поэтому ответ кэшируется навсегда
+    (immutable), а ETag и Last-Modified позволяют ответить 304. Range
+    обрабатывает FileResponse. С MEDIA_ACCEL_REDIRECT файл отдаёт nginx
+    через X-Accel-Redirect, приложение байты картинки не читает.
+    """
+    from api.validators.media import check_media_id, media_stat
 
+    media_id = check_media_id(media_id)
+    fmt = negotiate_format(accept)
+    file_path, stat_result = await media_stat(
+        *lookup_paths(media_id, pick_variant(w), fmt, MEDIA_PATH),
+    )
+    filename = file_path.name
+    if filename == variant_filename(media_id, FULL_VARIANT, DEFAULT_FORMAT):
+        fmt = DEFAULT_FORMAT
+    headers = {
+        'Cache-Control': MEDIA_CACHE_CONTROL,
+        'ETag': f'"{filename}-{stat_result.st_size:x}"',
+        'Last-Modified': formatdate(stat_result.st_mtime, usegmt=True),
+        'Vary': 'Accept',
+    }
+    if _not_modified(request, headers['ETag'], stat_result.st_mtime):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers=headers,
+        )
+    headers['Content-Disposition'] = f'inline; filename="{filename}"'
+    if settings.MEDIA_ACCEL_REDIRECT:
+        headers['X-Accel-Redirect'] = (
+            settings.MEDIA_ACCEL_REDIRECT
+            + file_path.relative_to(MEDIA_PATH).as_posix()
+        )
+        return Response(media_type=FORMATS[fmt].media_type, headers=headers)
     return FileResponse(
         path=file_path,
-        media_type='image/jpeg',
-        filename=filename,
-        headers={
-            'Content-Disposition': f'inline; filename="{filename}"',
-            'Cache-Control': 'public, max-age=3600'
-        }
+        media_type=FORMATS[fmt].media_type,
+        headers=headers,
+        stat_result=stat_result,
     )
@@ -0,0 +1,29 @@
+from pathlib import Path
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import FileResponse
+
+from api.deps import require_manager_or_admin
+from core.config import settings
+from core.profiling import is_report_name, report_media_type
+
+router = APIRouter(prefix='/profiles', tags=['Профилирование'])
+
+
+@router.get(
+    '/{name}',
+    summary='Отчёт профилирования запроса',
+    dependencies=[Depends(require_manager_or_admin)],
+)
+async def get_profile(name: str) -> FileResponse:
+    """Отчёт из заголовка X-Profile-Report (HTML или speedscope JSON).
+
+    Speedscope-отчёт открывается на https://www.speedscope.app.
+    """
+    path = Path(settings.PROFILE_DIR) / name
+    if not is_report_name(name) or not path.is_file():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail='Отчёт не найден',
+        )
+    return FileResponse(path, media_type=report_media_type(name))
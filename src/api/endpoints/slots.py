@@ -9,15 +9,18 @@ from api.exceptions import err
 from api.responses import (FORBIDDEN_RESPONSE, NOT_FOUND_RESPONSE,
                            UNAUTHORIZED_RESPONSE, VALIDATION_ERROR_RESPONSE)
 from api.validators.slots import (cafe_exists, slot_exists,
-                                  user_can_manage_cafe,
-                                  validate_no_time_overlap)
+                                  slots_in_cafe_exist, user_can_manage_cafe,
+                                  validate_no_time_overlap,
+                                  validate_no_time_overlap_many)
 from core.db import get_session
 from core.decorators.redis import cache_response
 from core.constants import EXPIRE_CASHE_TIME
 from crud.slots import slot_crud
 from core.redis import get_redis, redis_cache
 from models.user import User
-from schemas.slots import TimeSlotCreate, TimeSlotInfo, TimeSlotUpdate
+from schemas.common import BulkDeactivate
+from schemas.slots import (TimeSlotBulkCreate, TimeSlotBulkUpdate,
+                           TimeSlotCreate, TimeSlotInfo, TimeSlotUpdate)
 from schemas.user import UserRole
 
 router = APIRouter(
@@ -94,6 +97,109 @@ async def create_slot(
     return TimeSlotInfo.model_validate(slot, from_attributes=True)
 
 
+@router.post(
+    '/bulk',
+    response_model=List[TimeSlotInfo],
+    status_code=status.HTTP_201_CREATED,
+    summary='Массово создать временные слоты',
+    responses={
+        **UNAUTHORIZED_RESPONSE,
+        **FORBIDDEN_RESPONSE,
+        **VALIDATION_ERROR_RESPONSE,
+        **NOT_FOUND_RESPONSE,
+    },
+)
+async def create_slots_bulk(
+    cafe_id: Annotated[int, Path(description='ID кафе')],
+    payload: TimeSlotBulkCreate,
+    current_user: Annotated[User, Depends(require_manager_or_admin)],
+    session: Annotated[AsyncSession, Depends(get_session)],
+) -> List[TimeSlotInfo]:
+    """Создание пачки временных слотов одним запросом."""
+    cafe = await cafe_exists(cafe_id, session)
+    user_can_manage_cafe(current_user, cafe)
+    await validate_no_time_overlap_many(payload.items, session, cafe_id)
+    slots = await slot_crud.create_many(
+        payload.items,
+        session,
+        cafe_id=cafe_id,
+    )
+    await redis_cache.delete_pattern('slots:*')
+    return [TimeSlotInfo.model_validate(
+        slot, from_attributes=True) for slot in slots]
+
+
+@router.patch(
+    '/bulk',
+    response_model=List[TimeSlotInfo],
+    summary='Массово обновить временные слоты',
+    responses={
+        **UNAUTHORIZED_RESPONSE,
+        **FORBIDDEN_RESPONSE,
+        **VALIDATION_ERROR_RESPONSE,
+        **NOT_FOUND_RESPONSE,
+    },
+)
+async def update_slots_bulk(
+    cafe_id: Annotated[int, Path(description='ID кафе')],
+    payload: TimeSlotBulkUpdate,
+    current_user: Annotated[User, Depends(require_manager_or_admin)],
+    session: Annotated[AsyncSession, Depends(get_session)],
+) -> List[TimeSlotInfo]:
+    """Обновить описание или активность нескольких слотов сразу.
+
+    Время массово менять нельзя: одинаковое время у нескольких слотов
+    всегда даёт пересечение. Активируемые слоты проверяются на
+    пересечение с активными слотами кафе и друг с другом.
+    """
+    cafe = await cafe_exists(cafe_id, session)
+    user_can_manage_cafe(current_user, cafe)
+    if (
+        payload.data.start_time is not None
+        or payload.data.end_time is not None
+    ):
+        raise err(
+            'BAD_REQUEST',
+            'Массово изменять start_time и end_time нельзя',
+            400)
+    slots = await slots_in_cafe_exist(payload.ids, cafe_id, session)
+    if payload.data.is_active:
+        await validate_no_time_overlap_many(
+            slots, session, cafe_id, exclude_ids=payload.ids,
+        )
+    slots = await slot_crud.update_many(payload.ids, payload.data, session)
+    await redis_cache.delete_pattern('slots:*')
+    return [TimeSlotInfo.model_validate(
+        slot, from_attributes=True) for slot in slots]
+
+
+@router.post(
+    '/bulk/deactivate',
+    response_model=List[TimeSlotInfo],
+    summary='Массово деактивировать временные слоты',
+    responses={
+        **UNAUTHORIZED_RESPONSE,
+        **FORBIDDEN_RESPONSE,
+        **VALIDATION_ERROR_RESPONSE,
+        **NOT_FOUND_RESPONSE,
+    },
+)
+async def deactivate_slots_bulk(
+    cafe_id: Annotated[int, Path(description='ID кафе')],
+    payload: BulkDeactivate,
+    current_user: Annotated[User, Depends(require_manager_or_admin)],
+    session: Annotated[AsyncSession, Depends(get_session)],
+) -> List[TimeSlotInfo]:
+    """Деактивировать несколько слотов кафе одним запросом."""
+    cafe = await cafe_exists(cafe_id, session)
+    user_can_manage_cafe(current_user, cafe)
+    await slots_in_cafe_exist(payload.ids, cafe_id, session)
+    slots = await slot_crud.deactivate_many(payload.ids, session)
+    await redis_cache.delete_pattern('slots:*')
+    return [TimeSlotInfo.model_validate(
+        slot, from_attributes=True) for slot in slots]
+
+
 @router.get(
     '/{slot_id}',
     response_model=TimeSlotInfo,
@@ -14,7 +14,9 @@ from core.db import get_session
 from core.redis import get_redis, redis_cache
 from core.decorators.redis import cache_response
 from core.constants import EXPIRE_CASHE_TIME
-from schemas.table import TableCreate, TableInfo, TableUpdate
+from schemas.common import BulkDeactivate
+from schemas.table import (TableBulkCreate, TableBulkUpdate, TableCreate,
+                           TableInfo, TableUpdate)
 from schemas.user import UserInfo
 
 router = APIRouter(prefix='/cafe/{cafe_id}/tables', tags=['Столы'])
@@ -153,6 +155,121 @@ async def create_table(
     )
 
 
+@router.post(
+    '/bulk',
+    response_model=List[TableInfo],
+    status_code=status.HTTP_200_OK,
+    summary='Массовое создание столов в кафе',
+    responses={
+        **SUCCESSFUL_RESPONSE,
+        **NOT_FOUND_RESPONSE,
+        **FORBIDDEN_RESPONSE,
+        **UNAUTHORIZED_RESPONSE,
+        **VALIDATION_ERROR_RESPONSE,
+        **INVALID_ID_RESPONSE,
+    },
+)
+async def create_tables_bulk(
+    cafe_id: Annotated[
+        int,
+        Path(
+            description='ID кафе',
+        ),
+    ],
+    tables_in: TableBulkCreate,
+    current_user: Annotated[UserInfo, Depends(require_manager_or_admin)],
+    session: Annotated[AsyncSession, Depends(get_session)],
+) -> List[TableInfo]:
+    """Создание пачки столов кафе одним запросом.
+
+    Только для администраторов и менеджеров.
+    """
+    tables = await TableService.create_tables_bulk(
+        session=session,
+        cafe_id=cafe_id,
+        tables_in=tables_in,
+        current_user=current_user,
+    )
+    await redis_cache.delete_pattern('tables:*')
+    return tables
+
+
+@router.patch(
+    '/bulk',
+    response_model=List[TableInfo],
+    summary='Массовое обновление столов в кафе',
+    responses={
+        **SUCCESSFUL_RESPONSE,
+        **TABLE_NOT_FOUND_IN_CAFE_RESPONSE,
+        **FORBIDDEN_RESPONSE,
+        **UNAUTHORIZED_RESPONSE,
+        **VALIDATION_ERROR_RESPONSE,
+        **INVALID_ID_RESPONSE,
+    },
+)
+async def update_tables_bulk(
+    cafe_id: Annotated[
+        int,
+        Path(
+            description='ID кафе',
+        ),
+    ],
+    tables_in: TableBulkUpdate,
+    current_user: Annotated[UserInfo, Depends(require_manager_or_admin)],
+    session: Annotated[AsyncSession, Depends(get_session)],
+) -> List[TableInfo]:
+    """Обновление пачки столов кафе одинаковыми данными.
+
+    Только для администраторов и менеджеров.
+    """
+    tables = await TableService.update_tables_bulk(
+        session=session,
+        cafe_id=cafe_id,
+        tables_in=tables_in,
+        current_user=current_user,
+    )
+    await redis_cache.delete_pattern('tables:*')
+    return tables
+
+
+@router.post(
+    '/bulk/deactivate',
+    response_model=List[TableInfo],
+    summary='Массовая деактивация столов в кафе',
+    responses={
+        **SUCCESSFUL_RESPONSE,
+        **TABLE_NOT_FOUND_IN_CAFE_RESPONSE,
+        **FORBIDDEN_RESPONSE,
+        **UNAUTHORIZED_RESPONSE,
+        **VALIDATION_ERROR_RESPONSE,
+        **INVALID_ID_RESPONSE,
+    },
+)
+async def deactivate_tables_bulk(
+    cafe_id: Annotated[
+        int,
+        Path(
+            description='ID кафе',
+        ),
+    ],
+    tables_in: BulkDeactivate,
+    current_user: Annotated[UserInfo, Depends(require_manager_or_admin)],
+    session: Annotated[AsyncSession, Depends(get_session)],
+) -> List[TableInfo]:
+    """Деактивация пачки столов кафе.
+
+    Только для администраторов и менеджеров.
+    """
+    tables = await TableService.deactivate_tables_bulk(
+        session=session,
+        cafe_id=cafe_id,
+        tables_in=tables_in,
+        current_user=current_user,
+    )
+    await redis_cache.delete_pattern('tables:*')
+    return tables
+
+
 @router.patch(
     '/{table_id}',
     response_model=TableInfo,
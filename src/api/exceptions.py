@@ -13,6 +13,7 @@ DEFAULT_MESSAGES: Final[dict[int, str]] = {
     401: 'Требуется авторизация',
     403: 'Недостаточно прав',
     404: 'Не найдено',
+    409: 'Конфликт',
     422: 'Неверные данные запроса',
 }
 
@@ -49,6 +50,11 @@ def not_found(message: str) -> HTTPException:
     return err(404, message, 404)
 
 
+def conflict(message: str) -> HTTPException:
+    """409 Conflict."""
+    return err(409, message, 409)
+
+
 def unprocessable(message: str) -> HTTPException:
     """422 Unprocessable Entity."""
     return err(422, message, 422)
@@ -0,0 +1,84 @@
+"""Поддержка заголовка Idempotency-Key для небезопасных запросов."""
+from __future__ import annotations
+
+import logging
+from contextlib import suppress
+from functools import wraps
+from typing import Any, Callable
+
+from fastapi import status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from redis.exceptions import RedisError
+
+from api.exceptions import conflict, unprocessable
+from core.idempotency import (
+    IdempotencyInFlight,
+    IdempotencyKeyReused,
+    fingerprint,
+    idempotency_store,
+)
+
+logger = logging.getLogger(__name__)
+
+REPLAYED_HEADER = 'Idempotent-Replayed'
+
+
+def idempotent(
+    scope: str,
+    body_arg: str,
+    status_code: int = status.HTTP_200_OK,
+) -> Callable:
+    """Повтор запроса с тем же Idempotency-Key возвращает первый ответ.
+
+    Эндпоинт должен принимать `idempotency_key` (заголовок) и `user`.
+    Ключ действует в пределах пользователя и `scope`; тело запроса
+    берётся из аргумента `body_arg`. `status_code` - код успешного
+    ответа маршрута, с ним отдаются повторы. Без заголовка или при
+    недоступном Redis запрос выполняется как обычно.
+    """
+
+    def decorator(function: Callable) -> Callable:
+        @wraps(function)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            key = kwargs.get('idempotency_key')
+            if not key:
+                return await function(*args, **kwargs)
+            key = f'{scope}:{kwargs["user"].id}:{key}'
+            digest = fingerprint(jsonable_encoder(kwargs[body_arg]))
+            try:
+                saved = await idempotency_store.acquire(key, digest)
+            except IdempotencyKeyReused:
+                raise unprocessable(
+                    'Idempotency-Key уже использован с другим запросом',
+                ) from None
+            except IdempotencyInFlight:
+                raise conflict(
+                    'Запрос с этим ключом ещё выполняется',
+                ) from None
+            except RedisError as e:
+                logger.warning(f'Idempotency-Key не проверен: {e}')
+                return await function(*args, **kwargs)
+            if saved is not None:
+                return JSONResponse(
+                    saved['body'],
+                    status_code=saved['status'],
+                    headers={REPLAYED_HEADER: 'true'},
+                )
+            try:
+                result = await function(*args, **kwargs)
+            except BaseException:
+                with suppress(RedisError):
+                    await idempotency_store.release(key)
+                raise
+            try:
+                await idempotency_store.save(
+                    key, digest, status_code, jsonable_encoder(result),
+                )
+            except RedisError as e:
+                logger.warning(f'Ответ по Idempotency-Key не сохранён: {e}')
+            return result
+
+        return wrapper
+
+    return decorator
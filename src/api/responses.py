@@ -64,6 +64,21 @@ VALIDATION_ERROR_RESPONSE = {
     },
 }
 
+CONFLICT_RESPONSE = {
+    409: {
+        'description': 'Запрос с этим Idempotency-Key ещё выполняется',
+        'content': {
+            'application/json': {
+                'schema': ErrorResponse.model_json_schema(),
+                'example': {
+                    'code': 'CONFLICT',
+                    'message': 'Запрос с этим ключом ещё выполняется',
+                },
+            },
+        },
+    },
+}
+
 BAD_RESPONSE = {
     400: {
         'description': 'Ошибка в параметрах запроса',
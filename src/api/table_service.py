@@ -4,10 +4,20 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.exceptions import err
 from api.validators.cafe import check_cafe_permissions, get_cafe_or_404
-from api.validators.table import get_table_in_cafe_or_404
+from api.validators.table import (
+    get_table_in_cafe_or_404,
+    get_tables_in_cafe_or_404,
+)
 from crud.table import table_crud
 from models.user import User
-from schemas.table import TableCreate, TableInfo, TableUpdate
+from schemas.common import BulkDeactivate
+from schemas.table import (
+    TableBulkCreate,
+    TableBulkUpdate,
+    TableCreate,
+    TableInfo,
+    TableUpdate,
+)
 from schemas.user import UserRole
 
 
@@ -98,3 +108,64 @@ class TableService:
         )
 
         return TableInfo.model_validate(updated_table_db, from_attributes=True)
+
+    @staticmethod
+    async def create_tables_bulk(
+        session: AsyncSession,
+        cafe_id: int,
+        tables_in: TableBulkCreate,
+        current_user: User,
+    ) -> List[TableInfo]:
+        """Создает пачку столов в кафе одним запросом."""
+        cafe_db = await get_cafe_or_404(cafe_id, session)
+        check_cafe_permissions(cafe=cafe_db, user=current_user)
+        tables_db = await table_crud.create_many(
+            tables_in.items,
+            session,
+            cafe_id=cafe_id,
+        )
+
+        return [
+            TableInfo.model_validate(table, from_attributes=True)
+            for table in tables_db
+        ]
+
+    @staticmethod
+    async def update_tables_bulk(
+        session: AsyncSession,
+        cafe_id: int,
+        tables_in: TableBulkUpdate,
+        current_user: User,
+    ) -> List[TableInfo]:
+        """Обновляет пачку столов кафе одинаковыми данными."""
+        cafe_db = await get_cafe_or_404(cafe_id, session)
+        check_cafe_permissions(cafe=cafe_db, user=current_user)
+        await get_tables_in_cafe_or_404(cafe_id, tables_in.ids, session)
+        tables_db = await table_crud.update_many(
+            tables_in.ids,
+            tables_in.data,
+            session,
+        )
+
+        return [
+            TableInfo.model_validate(table, from_attributes=True)
+            for table in tables_db
+        ]
+
+    @staticmethod
+    async def deactivate_tables_bulk(
+        session: AsyncSession,
+        cafe_id: int,
+        tables_in: BulkDeactivate,
+        current_user: User,
+    ) -> List[TableInfo]:
+        """Деактивирует пачку столов кафе одним запросом."""
+        cafe_db = await get_cafe_or_404(cafe_id, session)
+        check_cafe_permissions(cafe=cafe_db, user=current_user)
+        await get_tables_in_cafe_or_404(cafe_id, tables_in.ids, session)
+        tables_db = await table_crud.deactivate_many(tables_in.ids, session)
+
+        return [
+            TableInfo.model_validate(table, from_attributes=True)
+            for table in tables_db
+        ]
@@ -5,12 +5,14 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.exceptions import bad_request, forbidden, not_found, unprocessable
+from core.fieldsets import Fieldset
+from crud.booking import booking_crud
 from models.booking import Booking, BookingStatus
 from models.cafe import Cafe
 from models.slots import Slot
 from models.table import Table
 from models.user import User
-from schemas.booking import BookingCreate
+from schemas.booking import BookingCreate, BookingInfo
 from schemas.user import UserRole
 
 
@@ -22,6 +24,20 @@ async def booking_exists(booking_id: int, session: AsyncSession) -> Booking:
     return booking
 
 
+async def active_booking(
+    booking_id: int,
+    session: AsyncSession,
+    fields: Optional[Fieldset] = None,
+) -> BookingInfo:
+    """Активная бронь для ответа (только поля `fields`) или 404."""
+    booking = await booking_crud.get_booking(
+        booking_id, session, fields, status=BookingStatus.ACTIVE.value,
+    )
+    if booking is None:
+        raise not_found('Такой брони нет или она не активна.')
+    return booking
+
+
 async def check_booking_date(booking_date: date) -> None:
     """Проверяет, что дата бронирования не в прошлом."""
     if booking_date < date.today():
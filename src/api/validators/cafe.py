@@ -1,17 +1,24 @@
 from __future__ import annotations
 
+from typing import Optional
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.exceptions import err
+from core.fieldsets import Fieldset
 from crud.cafe import cafe_crud
 from models.cafe import Cafe
 from models.user import User
 from schemas.user import UserRole
 
 
-async def get_cafe_or_404(cafe_id: int, session: AsyncSession) -> Cafe:
+async def get_cafe_or_404(
+    cafe_id: int,
+    session: AsyncSession,
+    fields: Optional[Fieldset] = None,
+) -> Cafe:
     """Получить объект кафе по ID или выбросить ошибку 404."""
-    cafe = await cafe_crud.get(obj_id=cafe_id, session=session)
+    cafe = await cafe_crud.get(obj_id=cafe_id, session=session, fields=fields)
     if cafe_id <= 0:
         raise err(
             'INVALID_ID_FORMAT',
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Sequence
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -17,6 +17,33 @@ async def check_name_unique(session: AsyncSession, obj_name: str) -> None:
         raise bad_request(f"Блюдо '{obj_name}' уже существует.")
 
 
+async def check_names_unique(
+        session: AsyncSession,
+        names: Sequence[str],
+) -> None:
+    """Проверяет уникальность имён пачки блюд одним запросом."""
+    duplicates = {name for name in names if names.count(name) > 1}
+    if duplicates:
+        raise bad_request(f"Имена блюд повторяются: {sorted(duplicates)}.")
+    query = await session.execute(
+        select(Dish.name).where(Dish.name.in_(names)),
+    )
+    existing = sorted(query.scalars().all())
+    if existing:
+        raise bad_request(f"Блюда {existing} уже существуют.")
+
+
+async def check_dishes_exist(
+        session: AsyncSession,
+        dish_ids: Sequence[int],
+) -> None:
+    """Проверяет, что все блюда из списка существуют."""
+    res = await session.execute(select(Dish.id).where(Dish.id.in_(dish_ids)))
+    missing = set(dish_ids) - set(res.scalars().all())
+    if missing:
+        raise not_found(f"Блюда с id {missing} не существуют.")
+
+
 async def check_cafe_exists(
         session: AsyncSession,
         cafe_ids: List[int],
@@ -1,9 +1,14 @@
+import hashlib
 import os
 import uuid
+from pathlib import Path
+from typing import NamedTuple
 
+import anyio
+import anyio.to_thread
 from fastapi import HTTPException, UploadFile, status
 
-from core.constants import MAX_LEN_MEDIA_CONTENT
+from core.constants import MAX_LEN_MEDIA_CONTENT, MEDIA_UPLOAD_CHUNK
 
 
 def media_allowed_content_type(file: UploadFile) -> UploadFile:
@@ -18,15 +23,44 @@ def media_allowed_content_type(file: UploadFile) -> UploadFile:
     return file
 
 
-async def check_len_file(file: UploadFile) -> bytes:
-    """Проверяет размер файла."""
-    contents = await file.read()
-    if len(contents) > MAX_LEN_MEDIA_CONTENT:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail='Размер файла не должен превышать 5Мб.',
-        )
-    return contents
+def _too_large() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail='Размер файла не должен превышать 5Мб.',
+    )
+
+
+class Upload(NamedTuple):
+    """Временный файл загрузки, sha256 и размер содержимого."""
+
+    path: Path
+    sha256: str
+    size: int
+
+
+async def stream_upload(file: UploadFile, directory: Path) -> Upload:
+    """Сохраняет загрузку во временный файл порциями, проверяя размер.
+
+    В памяти держится не больше одной порции; хэш считается по ходу
+    записи. При превышении лимита файл удаляется.
+    """
+    if file.size is not None and file.size > MAX_LEN_MEDIA_CONTENT:
+        raise _too_large()
+    path = directory / f'{uuid.uuid4()}.upload'
+    digest = hashlib.sha256()
+    written = 0
+    try:
+        async with await anyio.open_file(path, 'wb') as target:
+            while chunk := await file.read(MEDIA_UPLOAD_CHUNK):
+                written += len(chunk)
+                if written > MAX_LEN_MEDIA_CONTENT:
+                    raise _too_large()
+                digest.update(chunk)
+                await target.write(chunk)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+    return Upload(path, digest.hexdigest(), written)
 
 
 def check_media_id(media_id: uuid) -> uuid:
@@ -41,11 +75,14 @@ def check_media_id(media_id: uuid) -> uuid:
     return media_id
 
 
-def media_exist(file_path: str) -> str:
-    """Проверяет наличие изображения по uuid."""
-    if not os.path.exists(file_path):
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail='Изображение не найдено',
-        )
-    return file_path
+async def media_stat(*paths: Path) -> tuple[Path, os.stat_result]:
+    """Первый существующий файл из `paths` и его stat (вне event loop)."""
+    for path in paths:
+        try:
+            return path, await anyio.to_thread.run_sync(os.stat, path)
+        except FileNotFoundError:
+            continue
+    raise HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail='Изображение не найдено',
+    )
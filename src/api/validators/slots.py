@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, List, Sequence
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -26,6 +26,26 @@ async def slot_exists(slot_id: int, session: AsyncSession) -> Slot:
     return slot
 
 
+async def slots_in_cafe_exist(
+    slot_ids: Sequence[int],
+    cafe_id: int,
+    session: AsyncSession,
+) -> List[Slot]:
+    """Проверяет одним запросом, что все слоты существуют в данном кафе."""
+    res = await session.execute(
+        select(Slot).where(Slot.id.in_(slot_ids), Slot.cafe_id == cafe_id),
+    )
+    slots = list(res.scalars().all())
+    missing = sorted(set(slot_ids) - {slot.id for slot in slots})
+    if missing:
+        raise err(
+            'NOT_FOUND',
+            f'Слоты {missing} не найдены в данном кафе',
+            404,
+        )
+    return slots
+
+
 def user_can_manage_cafe(user: User, cafe: Cafe) -> None:
     """Проверяет, что текущий пользователь может управлять данным кафе."""
     if user.role == int(UserRole.ADMIN):
@@ -70,3 +90,34 @@ async def validate_no_time_overlap(
                 'Слот пересекается с другим по времени.',
                 400,
             )
+
+
+async def validate_no_time_overlap_many(
+    payloads: Sequence[Any],
+    session: AsyncSession,
+    cafe_id: int,
+    exclude_ids: Sequence[int] = (),
+) -> None:
+    """Проверяет пачку новых слотов на пересечения.
+
+    Существующие слоты кафе читаются одним запросом; новые слоты
+    проверяются как с ними, так и друг с другом. При повторной активации
+    `payloads` - сами слоты, их `exclude_ids` не сравниваются сами с собой.
+    """
+    stmt = select(Slot).where(
+        Slot.cafe_id == cafe_id, Slot.is_active.is_(True),
+    )
+    if exclude_ids:
+        stmt = stmt.where(Slot.id.not_in(exclude_ids))
+    res = await session.execute(stmt)
+    intervals = [(slot.start_time, slot.end_time) for slot in res.scalars()]
+
+    for payload in payloads:
+        for start, end in intervals:
+            if not (payload.end_time <= start or payload.start_time >= end):
+                raise err(
+                    'BAD_REQUEST',
+                    'Слот пересекается с другим по времени.',
+                    400,
+                )
+        intervals.append((payload.start_time, payload.end_time))
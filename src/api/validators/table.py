@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import List, Sequence
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.exceptions import err
@@ -28,3 +30,25 @@ async def get_table_in_cafe_or_404(
     if not table or table.cafe_id != cafe_id:
         raise err('NOT_FOUND', 'Стол не найден в данном кафе', 404)
     return table
+
+
+async def get_tables_in_cafe_or_404(
+    cafe_id: int,
+    table_ids: Sequence[int],
+    session: AsyncSession,
+) -> List[Table]:
+    """Получает столы по списку ID одним запросом.
+
+    Выбрасывает 404, если хотя бы один стол не найден
+    или не принадлежит кафе.
+    """
+    tables = await table_crud.get_by_ids(table_ids, session)
+    found_ids = {table.id for table in tables if table.cafe_id == cafe_id}
+    missing = sorted(set(table_ids) - found_ids)
+    if missing:
+        raise err(
+            'NOT_FOUND',
+            f'Столы {missing} не найдены в данном кафе',
+            404,
+        )
+    return tables
@@ -52,6 +52,7 @@ _MUTABLE_FIELDS: Iterable[str] = (
     'phone',
     'tg_id',
     'role',
+    'booking_digest',
 )
 
 
@@ -0,0 +1,149 @@
+"""Микробенчмарк RequestLoggingMiddleware.
+
+Сравнивает текущий ASGI-middleware с прежней реализацией на
+BaseHTTPMiddleware: обычный JSON-ответ и потоковый ответ из многих
+чанков. Приложение вызывается напрямую через ASGI, без сети и HTTP
+клиента, логи уходят в никуда - меряется только накладной расход.
+
+Запуск из каталога src:
+    python -m benchmarks.request_logging [--requests 5000]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import time
+import uuid
+from typing import Callable
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message
+
+from core.reqctx import reset_ctx, set_ctx
+from middleware.request_logging import RequestLoggingMiddleware
+
+STREAM_CHUNKS = 64
+
+
+class LegacyRequestLoggingMiddleware(BaseHTTPMiddleware):
+    """Прежняя реализация на BaseHTTPMiddleware (для сравнения)."""
+
+    def __init__(self, app: ASGIApp, logger_name: str = 'api') -> None:
+        """Инициализирует middleware."""
+        super().__init__(app)
+        self._base_logger = logging.getLogger(logger_name)
+
+    async def dispatch(
+        self,
+        request: Request,
+        call_next: Callable,
+    ) -> Response:
+        """Логирует запрос так же, как делала прежняя версия."""
+        req_id = request.headers.get('X-Request-ID') or str(uuid.uuid4())
+        request.state.request_id = req_id
+        tokens = set_ctx(req_id, getattr(request.state, 'user', None))
+        ip = request.client.host if request.client else '-'
+        ua = request.headers.get('user-agent', '-')
+        started = time.perf_counter()
+        try:
+            response: Response = await call_next(request)
+        finally:
+            reset_ctx(tokens)
+        duration_ms = int((time.perf_counter() - started) * 1000)
+        self._base_logger.info(
+            f'HTTP {request.method} {request.url.path} -> '
+            f'{response.status_code} '
+            f'[{duration_ms}ms; req_id={req_id}; ip={ip}; ua={ua}]',
+        )
+        response.headers.setdefault('X-Request-ID', req_id)
+        return response
+
+
+def build_app(middleware: type) -> FastAPI:
+    """Минимальное приложение с JSON- и потоковым эндпоинтом."""
+    app = FastAPI()
+
+    @app.get('/ping')
+    async def ping() -> dict[str, str]:
+        return {'status': 'ok'}
+
+    @app.get('/stream')
+    async def stream() -> StreamingResponse:
+        async def chunks():  # noqa: ANN202
+            for _ in range(STREAM_CHUNKS):
+                yield b'x' * 1024
+
+        return StreamingResponse(chunks())
+
+    app.add_middleware(middleware)
+    return app
+
+
+async def call(app: ASGIApp, path: str) -> None:
+    """Один запрос напрямую через ASGI-интерфейс."""
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'root_path': '',
+        'query_string': b'',
+        'headers': [(b'user-agent', b'bench')],
+        'client': ('127.0.0.1', 5000),
+        'server': ('test', 80),
+    }
+
+    body_sent = False
+    disconnected = asyncio.Event()
+
+    async def receive() -> Message:
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await disconnected.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message: Message) -> None:
+        pass
+
+    await app(scope, receive, send)
+
+
+async def measure(app: ASGIApp, path: str, requests: int) -> float:
+    """Среднее время запроса в микросекундах."""
+    for _ in range(min(requests, 200)):
+        await call(app, path)
+    started = time.perf_counter()
+    for _ in range(requests):
+        await call(app, path)
+    return (time.perf_counter() - started) / requests * 1_000_000
+
+
+async def main(requests: int) -> None:
+    """Прогоняет оба middleware и печатает таблицу."""
+    logging.getLogger('api').disabled = True
+    apps = {
+        'BaseHTTPMiddleware': build_app(LegacyRequestLoggingMiddleware),
+        'pure ASGI': build_app(RequestLoggingMiddleware),
+    }
+    print(f'{"middleware":<20}{"/ping, us":>12}{"/stream, us":>14}')
+    for name, app in apps.items():
+        ping = await measure(app, '/ping', requests)
+        stream = await measure(app, '/stream', requests // 4)
+        print(f'{name:<20}{ping:>12.1f}{stream:>14.1f}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
@@ -0,0 +1,184 @@
+"""Бенчмарк сериализации списка бронирований (GET /booking).
+
+Сравнивает способы отдать список BookingInfo (кафе, пользователь,
+столы и слоты внутри) на 1k и 10k бронирований:
+
+* JSONResponse - response_model + json.dumps (FastAPI < 0.130 или
+  любой свой default_response_class);
+* ORJSONResponse - то же, но orjson (если установлен);
+* response_model - FastAPI >= 0.130: повторная валидация и
+  сериализация ядром pydantic сразу в байты;
+* dump_json - core.serialization без повторной валидации (промах
+  cache_response);
+* кэш: модели - прежнее попадание в cache_response: двойной json.loads,
+  model_validate каждого элемента и response_model;
+* готовый JSON - попадание в cache_response сейчас.
+
+Приложение вызывается напрямую через ASGI, без сети и БД.
+
+Запуск из каталога src:
+    python -m benchmarks.serialization [--bookings 1000 10000]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+import warnings
+from datetime import date, datetime
+from typing import List
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, Response
+
+from benchmarks.request_logging import call
+from core.serialization import dump_json
+from schemas.booking import BookingInfo
+
+try:
+    import orjson  # noqa: F401
+except ImportError:
+    orjson = None
+
+
+def make_bookings(count: int) -> list[BookingInfo]:
+    """Проверенные модели бронирований, как их возвращает CRUD."""
+    now = datetime(2026, 1, 1, 12, 0)
+    return [
+        BookingInfo.model_validate({
+            'id': booking_id,
+            'user_id': 1,
+            'booking_date': date(2026, 1, 2),
+            'status': 0,
+            'user': {
+                'id': 1,
+                'username': 'user',
+                'email': 'user@example.com',
+                'phone': '+79990000000',
+            },
+            'cafe': {
+                'id': 1,
+                'name': 'Кафе',
+                'address': 'ул. Ленина, 1',
+                'phone': '+79990000000',
+                'description': 'Описание кафе',
+                'photo_id': None,
+            },
+            'tables_id': [
+                {'id': table_id, 'description': 'Стол', 'seat_number': 4}
+                for table_id in range(1, 3)
+            ],
+            'slots_id': [
+                {
+                    'id': slot_id,
+                    'start_time': '10:00',
+                    'end_time': '11:00',
+                    'description': 'Слот',
+                }
+                for slot_id in range(1, 4)
+            ],
+            'guest_number': 2,
+            'note': 'У окна',
+            'is_active': True,
+            'created_at': now,
+            'updated_at': now,
+        })
+        for booking_id in range(1, count + 1)
+    ]
+
+
+def build_app(bookings: list[BookingInfo]) -> FastAPI:
+    """Эндпоинт на каждый способ сериализации одних и тех же данных."""
+    app = FastAPI()
+    cached = dump_json(bookings, BookingInfo).decode()
+    legacy_cached = json.dumps(json.dumps([
+        booking.model_dump(mode='json', by_alias=True)
+        for booking in bookings
+    ]))
+
+    @app.get(
+        '/json-response',
+        response_model=List[BookingInfo],
+        response_class=JSONResponse,
+    )
+    async def json_response() -> List[BookingInfo]:
+        return bookings
+
+    if orjson is not None:
+        from fastapi.responses import ORJSONResponse
+
+        @app.get(
+            '/orjson',
+            response_model=List[BookingInfo],
+            response_class=ORJSONResponse,
+        )
+        async def orjson_response() -> List[BookingInfo]:
+            return bookings
+
+    @app.get('/response-model', response_model=List[BookingInfo])
+    async def response_model() -> List[BookingInfo]:
+        return bookings
+
+    @app.get('/dump-json', response_model=List[BookingInfo])
+    async def direct() -> Response:
+        return Response(
+            dump_json(bookings, BookingInfo),
+            media_type='application/json',
+        )
+
+    @app.get('/legacy-cached', response_model=List[BookingInfo])
+    async def from_legacy_cache() -> List[BookingInfo]:
+        return [
+            BookingInfo.model_validate(item)
+            for item in json.loads(json.loads(legacy_cached))
+        ]
+
+    @app.get('/cached', response_model=List[BookingInfo])
+    async def from_cache() -> Response:
+        return Response(cached, media_type='application/json')
+
+    return app
+
+
+async def measure(app: FastAPI, path: str, repeat: int) -> float:
+    """Среднее время запроса в миллисекундах."""
+    await call(app, path)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        await call(app, path)
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+async def main(sizes: list[int], repeat: int) -> None:
+    """Прогоняет все способы и печатает таблицу."""
+    # В новых FastAPI ORJSONResponse помечен устаревшим.
+    warnings.filterwarnings('ignore', message='ORJSONResponse')
+    paths = {
+        'JSONResponse': '/json-response',
+        'ORJSONResponse': '/orjson',
+        'response_model': '/response-model',
+        'dump_json': '/dump-json',
+        'кэш: модели': '/legacy-cached',
+        'готовый JSON': '/cached',
+    }
+    if orjson is None:
+        paths.pop('ORJSONResponse')
+    print(f'{"способ":<18}' + ''.join(f'{n:>10} шт' for n in sizes))
+    apps = [build_app(make_bookings(size)) for size in sizes]
+    for name, path in paths.items():
+        timings = [await measure(app, path, repeat) for app in apps]
+        print(f'{name:<18}' + ''.join(f'{t:>10.1f} мс' for t in timings))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--bookings',
+        type=int,
+        nargs='+',
+        default=[1000, 10000],
+    )
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.bookings, args.repeat))
@@ -1,10 +1,50 @@
 from celery import Celery
+from kombu import Exchange, Queue
 
 from core.config import settings
+from core.constants import (
+    BOOKING_TIMEZONE,
+    CELERY_MAX_PRIORITY,
+    CELERY_PRIORITY_HIGH,
+    CELERY_PRIORITY_LOW,
+    CELERY_PRIORITY_NORMAL,
+    CELERY_QUEUE_BULK,
+    CELERY_QUEUE_MAIL,
+    CELERY_QUEUE_MEDIA,
+    CELERY_QUEUE_SCHEDULING,
+    MANAGER_DIGEST_INTERVAL,
+    MEDIA_GC_INTERVAL,
+    NOTIFICATION_DISPATCH_INTERVAL,
+    OUTBOX_PURGE_INTERVAL,
+    OUTBOX_RELAY_INTERVAL,
+)
 from core.logging import setup_logging
 
 setup_logging()
 
+tasks_exchange = Exchange('tasks', type='direct')
+
+
+def _queue(name: str) -> Queue:
+    """Очередь с поддержкой приоритетов RabbitMQ."""
+    return Queue(
+        name,
+        tasks_exchange,
+        routing_key=name,
+        queue_arguments={'x-max-priority': CELERY_MAX_PRIORITY},
+    )
+
+
+def _route(queue: str, priority: int) -> dict:
+    """Маршрут задачи: очередь и приоритет по умолчанию."""
+    return {
+        'queue': queue,
+        'exchange': tasks_exchange.name,
+        'routing_key': queue,
+        'priority': priority,
+    }
+
+
 celery_app = Celery(
     'media_processor',
     broker=settings.CELERY_BROKER_URL,
@@ -15,10 +55,75 @@ celery_app.conf.update(
     result_serializer='json',
     accept_content=['json'],
     enable_utc=True,
-    timezone='Europe/Moscow',
+    timezone=BOOKING_TIMEZONE,
     broker_connection_retry_on_startup=True,
     task_acks_late=True,
     task_reject_on_worker_lost=True,
+    # Каждый класс задач живёт в своей очереди и обслуживается своим
+    # пулом воркеров (см. docker-compose), поэтому массовая рассылка
+    # не задерживает обработку картинок и письма о бронировании.
+    task_queues=[
+        _queue(CELERY_QUEUE_MEDIA),
+        _queue(CELERY_QUEUE_MAIL),
+        _queue(CELERY_QUEUE_BULK),
+        _queue(CELERY_QUEUE_SCHEDULING),
+    ],
+    task_default_queue=CELERY_QUEUE_MAIL,
+    task_default_exchange=tasks_exchange.name,
+    task_default_routing_key=CELERY_QUEUE_MAIL,
+    task_default_priority=CELERY_PRIORITY_NORMAL,
+    task_routes={
+        'save_image': _route(CELERY_QUEUE_MEDIA, CELERY_PRIORITY_NORMAL),
+        'collect_unused_media': _route(
+            CELERY_QUEUE_MEDIA, CELERY_PRIORITY_LOW,
+        ),
+        'send_email_task': _route(CELERY_QUEUE_MAIL, CELERY_PRIORITY_HIGH),
+        'send_booking_notification': _route(
+            CELERY_QUEUE_MAIL, CELERY_PRIORITY_HIGH,
+        ),
+        'send_mass_mail': _route(CELERY_QUEUE_BULK, CELERY_PRIORITY_LOW),
+        'send_mail_batch': _route(CELERY_QUEUE_BULK, CELERY_PRIORITY_LOW),
+        'dispatch_due_notifications': _route(
+            CELERY_QUEUE_SCHEDULING, CELERY_PRIORITY_HIGH,
+        ),
+        'relay_outbox': _route(
+            CELERY_QUEUE_SCHEDULING, CELERY_PRIORITY_HIGH,
+        ),
+        'purge_outbox': _route(
+            CELERY_QUEUE_SCHEDULING, CELERY_PRIORITY_LOW,
+        ),
+        'send_manager_digests': _route(
+            CELERY_QUEUE_SCHEDULING, CELERY_PRIORITY_NORMAL,
+        ),
+    },
+    # С acks_late воркер держит не больше одной неподтверждённой задачи
+    # на процесс: длинная задача не «запирает» за собой очередь.
+    # Воркерам коротких задач множитель поднимается ключом
+    # --prefetch-multiplier.
+    worker_prefetch_multiplier=1,
+    beat_schedule={
+        'dispatch-due-notifications': {
+            'task': 'dispatch_due_notifications',
+            'schedule': NOTIFICATION_DISPATCH_INTERVAL,
+        },
+        'relay-outbox': {
+            'task': 'relay_outbox',
+            'schedule': OUTBOX_RELAY_INTERVAL,
+        },
+        'purge-outbox': {
+            'task': 'purge_outbox',
+            'schedule': OUTBOX_PURGE_INTERVAL,
+        },
+        'send-manager-digests': {
+            'task': 'send_manager_digests',
+            'schedule': MANAGER_DIGEST_INTERVAL,
+        },
+        'collect-unused-media': {
+            'task': 'collect_unused_media',
+            'schedule': MEDIA_GC_INTERVAL,
+        },
+    },
 )
 
+import celery_tasks.metrics  # noqa
 import celery_tasks.tasks  # noqa
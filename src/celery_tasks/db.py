@@ -0,0 +1,101 @@
+"""Синхронный движок БД для Celery-воркеров.
+
+Движок создаётся один раз на процесс воркера и переиспользуется всеми
+задачами: prefork/solo - на `worker_process_init` с пулом на одно
+соединение (процесс выполняет одну задачу за раз), threads/gevent -
+лениво при первой задаче с пулом по concurrency воркера.
+"""
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any, Optional
+
+from celery.signals import (
+    worker_init,
+    worker_process_init,
+    worker_process_shutdown,
+    worker_shutdown,
+)
+from sqlalchemy import Engine, create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from core.config import settings
+from core.logging import get_logger
+from core.metrics import instrument_pool
+
+logger = get_logger(__name__)
+
+POOL_MAX_OVERFLOW = 2
+
+_engine: Optional[Engine] = None
+_worker_concurrency = 1
+
+SessionLocal = sessionmaker()
+
+
+def sync_database_url() -> str:
+    """URL БД для синхронного драйвера psycopg2."""
+    return settings.DATABASE_URL.replace('asyncpg', 'psycopg2')
+
+
+def init_engine(pool_size: int) -> Engine:
+    """Создать движок процесса с пулом на `pool_size` соединений."""
+    global _engine
+    if _engine is not None:
+        # Соединения родителя после fork использовать нельзя.
+        _engine.dispose(close=False)
+    _engine = create_engine(
+        sync_database_url(),
+        pool_size=pool_size,
+        max_overflow=POOL_MAX_OVERFLOW,
+        pool_pre_ping=True,
+    )
+    SessionLocal.configure(bind=_engine)
+    instrument_pool(_engine, 'celery')
+    logger.info('celery db engine ready pool_size=%s', pool_size)
+    return _engine
+
+
+def dispose_engine() -> None:
+    """Закрыть соединения пула процесса."""
+    global _engine
+    if _engine is not None:
+        _engine.dispose()
+        _engine = None
+
+
+def get_engine() -> Engine:
+    """Движок процесса; для пулов без fork создаётся при первом вызове."""
+    if _engine is None:
+        return init_engine(_worker_concurrency)
+    return _engine
+
+
+@contextmanager
+def task_session() -> Iterator[Session]:
+    """Сессия на одну задачу поверх общего движка процесса."""
+    get_engine()
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@worker_init.connect
+def _remember_concurrency(sender: Any = None, **kwargs: Any) -> None:
+    """Запомнить concurrency воркера для размера пула threads/gevent."""
+    global _worker_concurrency
+    _worker_concurrency = getattr(sender, 'concurrency', None) or 1
+
+
+@worker_process_init.connect
+def _init_process_engine(**kwargs: Any) -> None:
+    """Prefork/solo: процесс выполняет задачи по одной."""
+    init_engine(pool_size=1)
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def _dispose_process_engine(**kwargs: Any) -> None:
+    """Вернуть соединения при остановке процесса воркера."""
+    dispose_engine()
@@ -0,0 +1,85 @@
+"""Дедупликация задач Celery по ключу в Redis.
+
+Доставка задач at-least-once (acks_late, outbox), поэтому задача с
+побочным эффектом может прийти дважды. Ключ задачи ставится через
+SET NX: пока задача выполняется, он живёт `dedupe_lock_ttl` секунд,
+после успеха - `dedupe_ttl`. При ошибке ключ снимается, и повтор
+выполнится заново.
+"""
+import inspect
+from contextlib import suppress
+from typing import Any, Optional
+
+import redis
+from celery import Task
+
+from core.config import settings
+from core.constants import TASK_DEDUPE_LOCK_TTL, TASK_DEDUPE_TTL
+from core.logging import get_logger
+
+logger = get_logger(__name__)
+
+_STATE_RUNNING = 'running'
+_STATE_DONE = 'done'
+
+_client: Optional[redis.Redis] = None
+
+
+def get_redis() -> redis.Redis:
+    """Синхронный клиент Redis процесса воркера."""
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(
+            settings.REDIS_URL,
+            decode_responses=True,
+            socket_connect_timeout=5,
+        )
+    return _client
+
+
+class DedupTask(Task):
+    """Задача, которая по ключу выполняется не больше одного раза.
+
+    `dedupe_key` - шаблон ключа, подставляются аргументы вызова:
+    `@celery_app.task(base=DedupTask, dedupe_key='booking:{booking_id}')`.
+    """
+
+    dedupe_key: Optional[str] = None
+    dedupe_ttl: int = TASK_DEDUPE_TTL
+    dedupe_lock_ttl: int = TASK_DEDUPE_LOCK_TTL
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        """Выполнить задачу, если её ключ ещё не занят."""
+        if self.dedupe_key is None:
+            return super().__call__(*args, **kwargs)
+        key = self._format_key(args, kwargs)
+        try:
+            client = get_redis()
+            claimed = client.set(
+                key, _STATE_RUNNING, nx=True, ex=self.dedupe_lock_ttl,
+            )
+        except redis.RedisError:
+            logger.warning('dedupe: Redis недоступен, %s без проверки', key)
+            return super().__call__(*args, **kwargs)
+        if not claimed:
+            logger.info('dedupe: %s уже выполнена или выполняется', key)
+            return None
+        try:
+            result = super().__call__(*args, **kwargs)
+        except BaseException:
+            with suppress(redis.RedisError):
+                client.delete(key)
+            raise
+        try:
+            client.set(key, _STATE_DONE, ex=self.dedupe_ttl)
+        except redis.RedisError:
+            logger.warning('dedupe: не удалось отметить %s', key)
+        return result
+
+    def _format_key(self, args: tuple, kwargs: dict) -> str:
+        """Ключ `dedupe:<имя задачи>:<шаблон с аргументами>`."""
+        bound = inspect.signature(self.run).bind(*args, **kwargs)
+        bound.apply_defaults()
+        return f'dedupe:{self.name}:' + self.dedupe_key.format(
+            **bound.arguments,
+        )
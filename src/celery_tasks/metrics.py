@@ -0,0 +1,85 @@
+"""Метрики задач Celery и HTTP-сервер метрик воркера.
+
+Время и исход каждой задачи пишутся в процессе, где она выполнялась
+(для prefork - в дочернем). Главный процесс воркера с
+CELERY_METRICS_PORT поднимает HTTP-сервер, отдающий метрики всех
+процессов из PROMETHEUS_MULTIPROC_DIR.
+"""
+import time
+from typing import Any, Optional
+
+from celery import Task
+from celery.signals import (
+    task_failure,
+    task_postrun,
+    task_prerun,
+    worker_init,
+    worker_process_shutdown,
+)
+from prometheus_client import start_http_server
+
+from core.config import settings
+from core.logging import get_logger
+from core.metrics import (
+    CELERY_TASK_DURATION,
+    CELERY_TASK_FAILURES,
+    mark_process_dead,
+    metrics_registry,
+    remove_stale_files,
+)
+
+logger = get_logger(__name__)
+
+_started: dict[str, float] = {}
+
+
+@task_prerun.connect
+def _task_started(task_id: str, **kwargs: Any) -> None:
+    """Запомнить начало задачи."""
+    _started[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def _task_finished(
+    task_id: str,
+    task: Task,
+    state: Optional[str] = None,
+    **kwargs: Any,
+) -> None:
+    """Время задачи по имени и итоговому состоянию."""
+    started = _started.pop(task_id, None)
+    if started is None:
+        return
+    CELERY_TASK_DURATION.labels(task.name, state or 'UNKNOWN').observe(
+        time.perf_counter() - started,
+    )
+
+
+@task_failure.connect
+def _task_failed(sender: Task, **kwargs: Any) -> None:
+    """Задача завершилась исключением."""
+    CELERY_TASK_FAILURES.labels(sender.name).inc()
+
+
+@worker_init.connect
+def _start_metrics_server(**kwargs: Any) -> None:
+    """Главный процесс: убрать прежние файлы метрик и открыть порт."""
+    remove_stale_files()
+    if not settings.CELERY_METRICS_PORT:
+        return
+    try:
+        start_http_server(
+            settings.CELERY_METRICS_PORT, registry=metrics_registry(),
+        )
+    except OSError:
+        logger.exception(
+            'metrics server failed port=%s', settings.CELERY_METRICS_PORT,
+        )
+        return
+    logger.info('metrics server port=%s', settings.CELERY_METRICS_PORT)
+
+
+@worker_process_shutdown.connect
+def _forget_process(pid: Optional[int] = None, **kwargs: Any) -> None:
+    """Убрать live-метрики завершившегося процесса пула."""
+    mark_process_dead(pid)
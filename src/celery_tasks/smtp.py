@@ -0,0 +1,185 @@
+"""Пул авторизованных SMTP-соединений процесса воркера.
+
+STARTTLS и LOGIN выполняются один раз на соединение, дальше оно
+переиспользуется задачами. Соединение перед выдачей проверяется NOOP,
+если долго простаивало, и закрывается после SMTP_POOL_MAX_MESSAGES
+писем (многие серверы рвут длинные сессии сами).
+"""
+from __future__ import annotations
+
+import smtplib
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+from celery.signals import worker_process_init, worker_process_shutdown
+
+from core.config import settings
+from core.constants import (
+    SMTP_POOL_CHECK_IDLE,
+    SMTP_POOL_MAX_MESSAGES,
+    SMTP_POOL_SIZE,
+    SMTP_TIMEOUT,
+)
+from core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class _PooledConnection:
+    """SMTP-сессия и её счётчики."""
+
+    server: smtplib.SMTP
+    sent: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class SMTPPool:
+    """Потокобезопасный пул SMTP-соединений."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: str = '',
+        password: str = '',
+        starttls: bool = True,
+        size: int = SMTP_POOL_SIZE,
+        max_messages: int = SMTP_POOL_MAX_MESSAGES,
+        check_idle: float = SMTP_POOL_CHECK_IDLE,
+        timeout: float = SMTP_TIMEOUT,
+    ) -> None:
+        """Сохранить параметры сервера и лимиты пула."""
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.size = size
+        self.max_messages = max_messages
+        self.check_idle = check_idle
+        self.timeout = timeout
+        self._idle: deque[_PooledConnection] = deque()
+        self._lock = threading.Lock()
+
+    def sendmail(self, sender: str, recipient: str, message: str) -> None:
+        """Отправить письмо через соединение из пула.
+
+        При обрыве (SMTPServerDisconnected) соединение выбрасывается и
+        отправка повторяется один раз на новом. Остальные ошибки SMTP
+        пробрасываются; соединение при этом остаётся рабочим.
+        """
+        conn = self._acquire()
+        try:
+            conn.server.sendmail(sender, recipient, message)
+        except smtplib.SMTPServerDisconnected:
+            logger.warning('smtp: соединение разорвано, переподключение')
+            self._close(conn)
+            conn = self._connect()
+            try:
+                conn.server.sendmail(sender, recipient, message)
+            except BaseException:
+                self._close(conn)
+                raise
+        except (
+            smtplib.SMTPRecipientsRefused,
+            smtplib.SMTPResponseException,
+        ):
+            self._release(conn)
+            raise
+        except BaseException:
+            self._close(conn)
+            raise
+        conn.sent += 1
+        self._release(conn)
+
+    def close(self) -> None:
+        """Закрыть все простаивающие соединения."""
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+        for conn in idle:
+            self._close(conn)
+
+    def reset(self) -> None:
+        """Забыть соединения без QUIT (после fork они принадлежат родителю)."""
+        with self._lock:
+            self._idle = deque()
+
+    def _acquire(self) -> _PooledConnection:
+        """Взять живое соединение из пула или открыть новое."""
+        while True:
+            with self._lock:
+                conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                return self._connect()
+            if time.monotonic() - conn.last_used < self.check_idle:
+                return conn
+            if self._is_alive(conn):
+                return conn
+            self._close(conn)
+
+    def _release(self, conn: _PooledConnection) -> None:
+        """Вернуть соединение в пул или закрыть по лимитам."""
+        conn.last_used = time.monotonic()
+        if conn.sent >= self.max_messages:
+            self._close(conn)
+            return
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append(conn)
+                return
+        self._close(conn)
+
+    def _connect(self) -> _PooledConnection:
+        """Открыть соединение, выполнить STARTTLS и LOGIN."""
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.starttls:
+                server.starttls()
+            if self.username:
+                server.login(self.username, self.password)
+        except BaseException:
+            server.close()
+            raise
+        return _PooledConnection(server)
+
+    @staticmethod
+    def _is_alive(conn: _PooledConnection) -> bool:
+        """Проверка соединения командой NOOP."""
+        try:
+            return conn.server.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    @staticmethod
+    def _close(conn: _PooledConnection) -> None:
+        """Закрыть соединение, не обращая внимания на ошибки."""
+        try:
+            conn.server.quit()
+        except (smtplib.SMTPException, OSError):
+            conn.server.close()
+
+
+smtp_pool = SMTPPool(
+    settings.SMTP_HOST,
+    settings.SMTP_PORT,
+    settings.SMTP_USERNAME,
+    settings.SMTP_PASSWORD,
+    starttls=settings.SMTP_STARTTLS,
+)
+"""Пул SMTP-соединений текущего процесса воркера."""
+
+
+@worker_process_init.connect
+def _reset_smtp_pool(**kwargs: Any) -> None:
+    """Новый процесс начинает с пустым пулом."""
+    smtp_pool.reset()
+
+
+@worker_process_shutdown.connect
+def _close_smtp_pool(**kwargs: Any) -> None:
+    """Вежливо закрыть SMTP-сессии при остановке процесса."""
+    smtp_pool.close()
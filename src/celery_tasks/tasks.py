@@ -1,75 +1,142 @@
-import io
 import smtplib
-from datetime import datetime, timedelta
+import uuid
+from collections import defaultdict
+from collections.abc import Iterator
+from datetime import datetime, timedelta, timezone
 from email.header import Header
 from email.mime.text import MIMEText
 from email.utils import formatdate
 from pathlib import Path
-from typing import Optional
+from typing import Any
+from zoneinfo import ZoneInfo
 
-from PIL import Image
-from celery.result import AsyncResult
-from sqlalchemy import create_engine, select
-from sqlalchemy.orm import sessionmaker
+from celery import Task, group
+from sqlalchemy import delete, func, select, tuple_, union_all, update
+from sqlalchemy.orm import Session, noload, selectinload
 
 from celery_tasks.celery_app import celery_app
+from celery_tasks.db import task_session
+from celery_tasks.dedupe import DedupTask
+from celery_tasks.smtp import smtp_pool
 from core.config import settings
+from core.constants import (
+    BOOKING_REMINDER_KIND,
+    MANAGER_DIGEST_INTERVAL,
+    MANAGER_DIGEST_LAG,
+    MANAGER_DIGEST_MAX_LOOKBACK,
+    MASS_MAIL_BATCH,
+    MASS_MAIL_CHUNK,
+    MASS_MAIL_MAX_RETRIES,
+    MASS_MAIL_RETRY_BACKOFF,
+    MEDIA_GC_GRACE_HOURS,
+    MEDIA_UPLOAD_DIR,
+    NOTIFICATION_DISPATCH_BATCH,
+    OUTBOX_RELAY_BATCH,
+    OUTBOX_RETENTION_HOURS,
+)
 from core.email_templates import (
-    BOOKING_CONFIRMATION_TEMPLATE,
     BOOKING_INFORMATION_FOR_MANAGER,
+    MANAGER_DIGEST_LINE,
+    MANAGER_DIGEST_TEMPLATE,
+)
+from core.logging import get_logger
+from core.media import delete_stale_uploads, delete_variants, save_variants
+from core.notifications import (
+    booking_confirmation_body,
+    reminder_due_at,
+    slot_bounds,
 )
+from models.action import Action
 from models.booking import Booking
 from models.cafe import Cafe
+from models.dish import Dish
+from models.media import MediaFile
+from models.notification import ScheduledNotification
+from models.outbox import OutboxEvent
+from models.relations import cafe_managers
 from models.user import User
 
+logger = get_logger(__name__)
+
 MEDIA_PATH = Path(settings.MEDIA_PATH)
 MEDIA_PATH.mkdir(parents=True, exist_ok=True)
-SMTP_HOST = settings.SMTP_HOST
-SMTP_PORT = settings.SMTP_PORT
+UPLOAD_PATH = MEDIA_PATH / MEDIA_UPLOAD_DIR
 SMTP_USERNAME = settings.SMTP_USERNAME
-SMTP_PASSWORD = settings.SMTP_PASSWORD
 
 
 @celery_app.task(name='save_image')
-def save_image(image_data: bytes, media_id: str) -> dict[str, str]:
-    """Сохранить картинку как JPEG `<media_id>.jpg`."""
+def save_image(upload_path: str, media_id: str) -> dict[str, str]:
+    """Сохранить варианты загруженной картинки (см. core.media).
+
+    `upload_path` - временный файл API в MEDIA_PATH/.incoming; после
+    обработки он удаляется. Если картинку обработать не удалось, она
+    убирается из индекса media_files, чтобы повторная загрузка тех же
+    байтов не получила id без файлов.
+    """
+    upload = Path(upload_path)
+    if upload.resolve().parent != UPLOAD_PATH.resolve():
+        return {'media_id': media_id, 'error': 'Файл вне каталога загрузок'}
     try:
-        image = Image.open(io.BytesIO(image_data))
-        if image.mode != 'RGB':
-            image = image.convert('RGB')
-        filename = f'{media_id}.jpg'
-        file_path = MEDIA_PATH / filename
-        image.save(file_path, 'JPEG', optimize=True)
+        save_variants(upload, media_id, MEDIA_PATH)
         return {'media_id': media_id}
     except Exception as e:  # noqa: BLE001
+        delete_variants(media_id, MEDIA_PATH)
+        with task_session() as session:
+            session.execute(
+                delete(MediaFile).where(
+                    MediaFile.media_id == uuid.UUID(media_id),
+                ),
+            )
+            session.commit()
         return {'media_id': media_id, 'error': str(e)}
+    finally:
+        upload.unlink(missing_ok=True)
+
+
+def _build_message(recipient: str, subject: str, body: str) -> MIMEText:
+    """Собрать письмо с заголовками."""
+    message = MIMEText(body, 'plain', 'utf-8')
+    message['Subject'] = Header(subject, 'utf-8')
+    message['From'] = SMTP_USERNAME
+    message['To'] = recipient
+    message['Date'] = formatdate(localtime=True)
+    return message
 
 
 def send_email_smtp(recipient: str, subject: str, body: str) -> bool:
     """Общая функция для отправки email через SMTP."""
     try:
-        server = smtplib.SMTP(SMTP_HOST, SMTP_PORT)
-        server.starttls()
-        server.login(SMTP_USERNAME, SMTP_PASSWORD)
-        message = MIMEText(body, 'plain', 'utf-8')
-        message['Subject'] = Header(subject, 'utf-8')
-        message['From'] = SMTP_USERNAME
-        message['To'] = recipient
-        message['Date'] = formatdate(localtime=True)
-        server.sendmail(SMTP_USERNAME, recipient, message.as_string())
-        server.quit()
+        message = _build_message(recipient, subject, body)
+        smtp_pool.sendmail(SMTP_USERNAME, recipient, message.as_string())
         return True
     except Exception:
         return False
 
 
-def create_sync_session():
-    """Функция создания синхронной сессии для celery задач"""
-    sync_database_url = settings.DATABASE_URL.replace('asyncpg', 'psycopg2')
-    engine = create_engine(sync_database_url)
-    Session = sessionmaker(bind=engine)
-    session = Session()
-    return session, engine
+def iter_recipient_chunks(
+    session: Session,
+    chunk_size: int = MASS_MAIL_CHUNK,
+) -> Iterator[list[tuple[int, str]]]:
+    """Активные получатели с email порциями по keyset (id > last_id).
+
+    Читаются только id и email, в памяти не больше одной порции.
+    """
+    last_id = 0
+    while True:
+        rows = session.execute(
+            select(User.id, User.email)
+            .where(
+                User.is_active.is_(True),
+                User.email.is_not(None),
+                User.id > last_id,
+            )
+            .order_by(User.id)
+            .limit(chunk_size),
+        ).all()
+        if not rows:
+            return
+        yield [(row.id, row.email) for row in rows]
+        last_id = rows[-1].id
 
 
 @celery_app.task(name='send_email_task')
@@ -85,61 +152,125 @@ def send_email_task(
     return f'Ошибка отправки сообщения для {recipient}'
 
 
-@celery_app.task(name='send_mass_mail')
-def send_mass_mail(body: str, subject: str = 'Новая акция') -> str:
-    """Разослать письмо всем активным пользователям."""
-    session, engine = create_sync_session()
-    try:
-        recipients = session.execute(select(User).where(User.is_active))
-        recipients = recipients.scalars().all()
-        if not recipients:
-            return 'Нет активных пользователей'
-        successful_sends = 0
-        for recipient in recipients:
-            success = send_email_smtp(recipient.email, subject, body)
-            if success:
-                successful_sends += 1
-        return f'Сообщение отправлено {successful_sends} пользователям'
-    finally:
-        session.close()
-        engine.dispose()
+def _rejected_for_recipient(exc: OSError) -> bool:
+    """Постоянный отказ (5xx) по одному письму, а не сбой сервера."""
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        return True
+    return (
+        isinstance(exc, smtplib.SMTPResponseException)
+        and not isinstance(exc, smtplib.SMTPAuthenticationError)
+        and 500 <= exc.smtp_code < 600
+    )
 
 
-@celery_app.task(name='send_booking_notification')
-def send_booking_notification(
-        booking_id: int,
-        reminder_task_id: Optional[str] = None) -> str:
-    """Основная задача отправки уведомлений о бронировании"""
-    if reminder_task_id:
-        task = AsyncResult(reminder_task_id)
-        task.revoke(terminate=True)
-        return f"Задача напоминания {reminder_task_id} отменена"
+@celery_app.task(
+    name='send_mail_batch',
+    bind=True,
+    max_retries=MASS_MAIL_MAX_RETRIES,
+)
+def send_mail_batch(
+    self: Task,
+    recipients: list[str],
+    subject: str,
+    body: str,
+    sent: int = 0,
+    failed: int = 0,
+) -> dict[str, int]:
+    """Отправить одно письмо пачке адресов через пул SMTP-соединений.
 
-    session, engine = create_sync_session()
-    try:
+    Постоянный отказ (5xx) по конкретному адресу считается неудачей
+    этого адреса. Обрыв соединения, ошибка авторизации, временный отказ
+    (4xx) или ошибка сокета ставят повтор с нарастающей задержкой
+    только для неотправленного хвоста пачки; `sent` и `failed`
+    переносят счётчики прошлых попыток.
+    """
+    for index, recipient in enumerate(recipients):
+        message = _build_message(recipient, subject, body)
+        try:
+            smtp_pool.sendmail(
+                SMTP_USERNAME,
+                recipient,
+                message.as_string(),
+            )
+        except OSError as exc:
+            if _rejected_for_recipient(exc):
+                logger.warning(
+                    'mail batch: письмо для %s отклонено: %s', recipient, exc,
+                )
+                failed += 1
+                continue
+            logger.exception(
+                'mail batch: ошибка SMTP, отправлено=%s осталось=%s',
+                sent,
+                len(recipients) - index,
+            )
+            raise self.retry(
+                args=(recipients[index:], subject, body),
+                kwargs={'sent': sent, 'failed': failed},
+                exc=exc,
+                countdown=MASS_MAIL_RETRY_BACKOFF * 2 ** self.request.retries,
+            )
+        sent += 1
+    return {'sent': sent, 'failed': failed}
+
+
+@celery_app.task(name='send_mass_mail', bind=True)
+def send_mass_mail(
+    self: Task,
+    body: str,
+    subject: str = 'Новая акция',
+) -> dict[str, Any]:
+    """Разослать письмо всем активным пользователям.
+
+    Получатели читаются порциями по keyset, каждая порция уходит
+    группой задач `send_mail_batch`. Прогресс постановки виден в
+    состоянии задачи (PROGRESS), ход доставки - по сохранённым
+    GroupResult из `groups`.
+    """
+    recipients = 0
+    groups: list[str] = []
+    with task_session() as session:
+        for chunk in iter_recipient_chunks(session):
+            emails = [email for _, email in chunk]
+            job = group(
+                send_mail_batch.s(emails[i:i + MASS_MAIL_BATCH], subject, body)
+                for i in range(0, len(emails), MASS_MAIL_BATCH)
+            )
+            result = job.apply_async()
+            result.save()
+            groups.append(result.id)
+            recipients += len(emails)
+            self.update_state(
+                state='PROGRESS',
+                meta={'recipients': recipients, 'groups': groups},
+            )
+    return {'recipients': recipients, 'groups': groups}
+
+
+@celery_app.task(
+    name='send_booking_notification',
+    base=DedupTask,
+    dedupe_key='{booking_id}',
+)
+def send_booking_notification(booking_id: int) -> str:
+    """Основная задача отправки уведомлений о бронировании.
+
+    Напоминание не ставится в брокер с ETA, а записывается в
+    scheduled_notifications; отправит его `dispatch_due_notifications`.
+    Повторная доставка задачи для той же брони пропускается.
+    Менеджеры, включившие дайджест, получат бронь в
+    `send_manager_digests`.
+    """
+    with task_session() as session:
         booking = session.get(Booking, booking_id)
         if not booking.is_active:
             return 'Бронирование отменено'
         cafe = session.get(Cafe, booking.cafe_id)
         user = session.get(User, booking.user_id)
         managers = cafe.managers
-        slots = booking.slots_id
-        earliest_slot = min(
-            slots,
-            key=lambda x: datetime.strptime(
-                x.start_time, '%H:%M',
-            ))
-        lastest_slot = max(
-            slots,
-            key=lambda x: datetime.strptime(
-                x.start_time, '%H:%M',
-            ))
-        email_body = BOOKING_CONFIRMATION_TEMPLATE.format(
-            username='ddd',
-            booking_date=booking.booking_date,
-            cafe=cafe.name,
-            first_slot=earliest_slot.start_time,
-            last_slot=lastest_slot.end_time,
+        earliest_slot, lastest_slot = slot_bounds(booking.slots_id)
+        email_body = booking_confirmation_body(
+            booking.booking_date, cafe.name, booking.slots_id,
         )
         if user.email:
             send_email_task.delay(
@@ -147,15 +278,16 @@ def send_booking_notification(
                 'Подтверждение бронирования',
                 body=email_body,
             )
-            reminder_task = send_email_task.apply_async(
-                args=[user.email, 'Напоминание о бронировании', email_body],
-                eta=datetime.combine(
-                    booking.booking_date,
-                    datetime.strptime(
-                        earliest_slot.start_time, '%H:%M',
-                    ).time()) - timedelta(hours=1),
-            )
-            booking.reminder_task_id = reminder_task.id
+            session.add(ScheduledNotification(
+                booking_id=booking.id,
+                kind=BOOKING_REMINDER_KIND,
+                recipient=user.email,
+                subject='Напоминание о бронировании',
+                body=email_body,
+                due_at=reminder_due_at(
+                    booking.booking_date, booking.slots_id,
+                ),
+            ))
             session.commit()
         email_body = BOOKING_INFORMATION_FOR_MANAGER.format(
             cafe=cafe.name,
@@ -165,13 +297,277 @@ def send_booking_notification(
             table=booking.tables_id,
         )
         for manager in managers:
-            if manager.email:
+            if manager.email and not manager.booking_digest:
                 send_email_task.delay(
                     manager.email,
                     'Новое бронирование',
                     email_body,
                 )
         return 'Сообщение направлено менеджерам и пользователю'
-    finally:
-        session.close()
-        engine.dispose()
+
+
+@celery_app.task(name='dispatch_due_notifications')
+def dispatch_due_notifications() -> int:
+    """Поставить в очередь созревшие отложенные уведомления.
+
+    Запускается beat'ом раз в NOTIFICATION_DISPATCH_INTERVAL секунд.
+    Строки забираются пачками через FOR UPDATE SKIP LOCKED, поэтому
+    параллельные диспетчеры не отправят одно письмо дважды.
+    """
+    dispatched = 0
+    with task_session() as session:
+        while True:
+            now = datetime.now(timezone.utc)
+            notifications = session.scalars(
+                select(ScheduledNotification)
+                .where(
+                    ScheduledNotification.is_active.is_(True),
+                    ScheduledNotification.dispatched_at.is_(None),
+                    ScheduledNotification.due_at <= now,
+                )
+                .order_by(ScheduledNotification.due_at)
+                .limit(NOTIFICATION_DISPATCH_BATCH)
+                .with_for_update(skip_locked=True),
+            ).all()
+            if not notifications:
+                break
+            for notification in notifications:
+                send_email_task.delay(
+                    notification.recipient,
+                    notification.subject,
+                    notification.body,
+                )
+                notification.dispatched_at = now
+            session.commit()
+            dispatched += len(notifications)
+            if len(notifications) < NOTIFICATION_DISPATCH_BATCH:
+                break
+    return dispatched
+
+
+@celery_app.task(name='relay_outbox')
+def relay_outbox() -> int:
+    """Опубликовать неотправленные события outbox как задачи Celery.
+
+    Запускается beat'ом раз в OUTBOX_RELAY_INTERVAL секунд. Пачка
+    забирается через FOR UPDATE SKIP LOCKED, каждое событие помечается
+    published_at после публикации. При сбое брокера опубликованные
+    события фиксируются, остальные уйдут в следующий запуск (доставка
+    at-least-once).
+    """
+    published = 0
+    with task_session() as session:
+        while True:
+            events = session.scalars(
+                select(OutboxEvent)
+                .where(OutboxEvent.published_at.is_(None))
+                .order_by(OutboxEvent.id)
+                .limit(OUTBOX_RELAY_BATCH)
+                .with_for_update(skip_locked=True),
+            ).all()
+            if not events:
+                break
+            now = datetime.now(timezone.utc)
+            failed = False
+            for event in events:
+                event.attempts += 1
+                try:
+                    celery_app.send_task(event.task, kwargs=event.payload)
+                except Exception:  # noqa: BLE001
+                    logger.exception(
+                        'outbox: не удалось опубликовать событие id=%s '
+                        'task=%s attempts=%s',
+                        event.id,
+                        event.task,
+                        event.attempts,
+                    )
+                    failed = True
+                    break
+                event.published_at = now
+                published += 1
+            session.commit()
+            if failed or len(events) < OUTBOX_RELAY_BATCH:
+                break
+    return published
+
+
+@celery_app.task(name='purge_outbox')
+def purge_outbox() -> int:
+    """Удалить опубликованные события старше OUTBOX_RETENTION_HOURS.
+
+    Неопубликованные строки не трогаются. Возвращает число удалённых.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(
+        hours=OUTBOX_RETENTION_HOURS,
+    )
+    with task_session() as session:
+        result = session.execute(
+            delete(OutboxEvent).where(OutboxEvent.published_at < cutoff),
+        )
+        session.commit()
+    return result.rowcount
+
+
+def _digest_body(
+    cafe: str,
+    since: datetime,
+    until: datetime,
+    bookings: list[Booking],
+) -> str:
+    """Текст дайджеста: по строке на бронирование."""
+    tz = ZoneInfo(celery_app.conf.timezone)
+    lines = []
+    for booking in bookings:
+        slots = sorted(booking.slots_id, key=lambda slot: slot.start_time)
+        lines.append(MANAGER_DIGEST_LINE.format(
+            booking_date=booking.booking_date,
+            first_slot=slots[0].start_time if slots else '-',
+            last_slot=slots[-1].end_time if slots else '-',
+            table=', '.join(str(table.id) for table in booking.tables_id),
+            guests=booking.guest_number,
+        ))
+    return MANAGER_DIGEST_TEMPLATE.format(
+        cafe=cafe,
+        count=len(bookings),
+        since=since.astimezone(tz),
+        until=until.astimezone(tz),
+        bookings='\n'.join(lines),
+    )
+
+
+@celery_app.task(name='send_manager_digests')
+def send_manager_digests() -> int:
+    """Разослать менеджерам дайджест новых бронирований их кафе.
+
+    Запускается beat'ом раз в MANAGER_DIGEST_INTERVAL секунд. Окно
+    каждой пары (кафе, менеджер) начинается с cafe_managers.digest_sent_at
+    и заканчивается на MANAGER_DIGEST_LAG секунд раньше текущего
+    момента, чтобы не пропустить ещё не закоммиченные брони. Окно не
+    длиннее MANAGER_DIGEST_MAX_LOOKBACK: давняя отметка одной пары не
+    растягивает выборку для всех. Бронирования всех окон читаются одним
+    запросом, каждой паре уходит одно письмо.
+    """
+    until = datetime.now(timezone.utc) - timedelta(seconds=MANAGER_DIGEST_LAG)
+    first_since = until - timedelta(seconds=MANAGER_DIGEST_INTERVAL)
+    oldest_since = until - timedelta(seconds=MANAGER_DIGEST_MAX_LOOKBACK)
+    sent = 0
+    with task_session() as session:
+        pairs = session.execute(
+            select(
+                cafe_managers.c.cafe_id,
+                cafe_managers.c.user_id,
+                cafe_managers.c.digest_sent_at,
+                User.email,
+                Cafe.name,
+            )
+            .join(User, User.id == cafe_managers.c.user_id)
+            .join(Cafe, Cafe.id == cafe_managers.c.cafe_id)
+            .where(
+                User.booking_digest.is_(True),
+                User.is_active.is_(True),
+                User.email.is_not(None),
+            )
+            .with_for_update(of=cafe_managers, skip_locked=True),
+        ).all()
+        if not pairs:
+            return 0
+        windows = {
+            (pair.cafe_id, pair.user_id): max(
+                pair.digest_sent_at or first_since, oldest_since,
+            )
+            for pair in pairs
+        }
+        bookings = session.scalars(
+            select(Booking)
+            .where(
+                Booking.cafe_id.in_({pair.cafe_id for pair in pairs}),
+                Booking.is_active.is_(True),
+                Booking.created_at > min(windows.values()),
+                Booking.created_at <= until,
+            )
+            .order_by(Booking.booking_date, Booking.id)
+            .options(
+                noload('*'),
+                selectinload(Booking.slots_id).noload('*'),
+                selectinload(Booking.tables_id).noload('*'),
+            ),
+        ).all()
+        by_cafe: dict[int, list[Booking]] = defaultdict(list)
+        for booking in bookings:
+            by_cafe[booking.cafe_id].append(booking)
+        for pair in pairs:
+            since = windows[(pair.cafe_id, pair.user_id)]
+            fresh = [
+                booking for booking in by_cafe[pair.cafe_id]
+                if booking.created_at > since
+            ]
+            if not fresh:
+                continue
+            send_email_task.delay(
+                pair.email,
+                f'Новые бронирования: {pair.name}',
+                _digest_body(pair.name, since, until, fresh),
+            )
+            sent += 1
+        session.execute(
+            update(cafe_managers)
+            .where(
+                tuple_(
+                    cafe_managers.c.cafe_id,
+                    cafe_managers.c.user_id,
+                ).in_(list(windows)),
+            )
+            .values(digest_sent_at=until),
+        )
+        session.commit()
+    return sent
+
+
+@celery_app.task(name='collect_unused_media')
+def collect_unused_media() -> int:
+    """Пересчитать ссылки на картинки и удалить неиспользуемые.
+
+    ref_count каждой записи media_files пересчитывается одним UPDATE по
+    photo_id кафе, блюд и акций. Картинки без ссылок, которые дольше
+    MEDIA_GC_GRACE_HOURS не загружались повторно (updated_at), удаляются
+    вместе с файлами всех вариантов. Файлы стираются после коммита.
+    Заодно из MEDIA_PATH/.incoming удаляются временные файлы загрузок
+    старше MEDIA_GC_GRACE_HOURS, которые так и не забрала save_image.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(
+        hours=MEDIA_GC_GRACE_HOURS,
+    )
+    refs = union_all(
+        select(Cafe.photo_id.label('media_id')),
+        select(Dish.photo_id),
+        select(Action.photo_id),
+    ).subquery()
+    is_ref = refs.c.media_id == MediaFile.media_id
+    with task_session() as session:
+        session.execute(
+            update(MediaFile).values(
+                ref_count=select(func.count())
+                .select_from(refs)
+                .where(is_ref)
+                .scalar_subquery(),
+                # Пересчёт не продлевает отсрочку удаления.
+                updated_at=MediaFile.updated_at,
+            ),
+        )
+        unused = session.scalars(
+            delete(MediaFile)
+            .where(
+                MediaFile.ref_count == 0,
+                MediaFile.updated_at < cutoff,
+                # Ссылка могла появиться после пересчёта.
+                ~select(refs.c.media_id).where(is_ref).exists(),
+            )
+            .returning(MediaFile.media_id),
+        ).all()
+        session.commit()
+    for media_id in unused:
+        delete_variants(str(media_id), MEDIA_PATH)
+    stale = delete_stale_uploads(UPLOAD_PATH, cutoff.timestamp())
+    if stale:
+        logger.info('media gc: удалено %s брошенных загрузок', stale)
+    return len(unused)
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import date, datetime, timezone
+from typing import Any, Optional
+
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm.exc import DetachedInstanceError
+
+from core.constants import (
+    AUDIT_BATCH_SIZE,
+    AUDIT_FLUSH_INTERVAL,
+    AUDIT_QUEUE_MAX,
+)
+from core.db import engine
+from core.logging import get_logger
+from models.audit import AuditEvent
+
+_PRIMITIVES = (str, int, float, bool, type(None))
+
+log = get_logger('app.audit')
+
+
+def _actor_id(user: Any | None) -> Optional[int]:
+    """ID пользователя из контекста без ленивых догрузок."""
+    if user is None:
+        return None
+    try:
+        return getattr(user, 'id', None)
+    except DetachedInstanceError:
+        return None
+
+
+def _jsonable(fields: dict[str, Any]) -> dict[str, Any]:
+    """Привести значения полей к типам, которые пишутся в JSONB."""
+    return {
+        key: val if isinstance(val, _PRIMITIVES) else str(val)
+        for key, val in fields.items()
+    }
+
+
+def _month_bounds(day: date) -> tuple[date, date]:
+    """Границы месячной секции: [1-е число, 1-е число следующего)."""
+    start = day.replace(day=1)
+    if start.month == 12:
+        return start, start.replace(year=start.year + 1, month=1)
+    return start, start.replace(month=start.month + 1)
+
+
+class AuditSink:
+    """Асинхронный приёмник событий аудита.
+
+    `enqueue()` только кладёт событие в очередь процесса. Фоновая задача
+    забирает события пачками и пишет их в `audit_events` одним
+    многострочным INSERT. Пока приёмник не запущен (Celery, скрипты),
+    события пишутся в лог, как раньше.
+    """
+
+    def __init__(
+        self,
+        db_engine: AsyncEngine,
+        batch_size: int = AUDIT_BATCH_SIZE,
+        flush_interval: float = AUDIT_FLUSH_INTERVAL,
+        queue_max: int = AUDIT_QUEUE_MAX,
+    ) -> None:
+        """Сохранить движок БД и параметры пакетной записи."""
+        self._engine = db_engine
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue_max = queue_max
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._partitions: set[date] = set()
+        self.dropped = 0
+
+    @property
+    def running(self) -> bool:
+        """Запущена ли фоновая запись."""
+        return self._task is not None and not self._task.done()
+
+    def enqueue(
+        self,
+        resource: str,
+        action: str,
+        fields: dict[str, Any],
+        user: Any | None = None,
+        request_id: Optional[str] = None,
+    ) -> bool:
+        """Поставить событие в очередь; False - приёмник не запущен."""
+        if not self.running:
+            return False
+        row = {
+            'created_at': datetime.now(timezone.utc),
+            'resource': resource,
+            'action': action,
+            'actor_id': _actor_id(user),
+            'request_id': request_id,
+            'payload': _jsonable(fields),
+        }
+        try:
+            self._queue.put_nowait(row)
+        except asyncio.QueueFull:
+            self.dropped += 1
+        return True
+
+    def start(self) -> None:
+        """Запустить фоновую задачу записи в текущем event loop."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self._queue_max)
+        self._task = asyncio.create_task(self._run(), name='audit-sink')
+
+    async def stop(self) -> None:
+        """Дописать накопленные события и остановить фоновую задачу."""
+        if not self.running:
+            return
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        """Цикл: ждать событие, подкопить пачку, записать её."""
+        while True:
+            first = await self._queue.get()
+            if first is None:
+                return
+            if self._queue.qsize() < self.batch_size - 1:
+                await asyncio.sleep(self.flush_interval)
+            batch, stopping = self._drain([first])
+            await self._write(batch)
+            if stopping:
+                return
+
+    def _drain(self, batch: list[dict]) -> tuple[list[dict], bool]:
+        """Забрать из очереди до batch_size событий без ожидания."""
+        while len(batch) < self.batch_size:
+            try:
+                row = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            if row is None:
+                return batch, True
+            batch.append(row)
+        return batch, False
+
+    async def _write(self, batch: list[dict]) -> None:
+        """Записать пачку одним INSERT; ошибки только логируются."""
+        months = {row['created_at'].date().replace(day=1) for row in batch}
+        for month in months - self._partitions:
+            await self._ensure_partition(month)
+        try:
+            async with self._engine.begin() as conn:
+                await conn.execute(insert(AuditEvent.__table__), batch)
+        except Exception:
+            log.exception('audit: не удалось записать %s событий', len(batch))
+            return
+        if self.dropped:
+            log.warning(
+                'audit: очередь переполнена, потеряно %s событий',
+                self.dropped,
+            )
+            self.dropped = 0
+
+    async def _ensure_partition(self, month: date) -> None:
+        """Создать секцию месяца, если её ещё нет."""
+        if self._engine.dialect.name != 'postgresql':
+            self._partitions.add(month)
+            return
+        start, end = _month_bounds(month)
+        ddl = text(
+            f'CREATE TABLE IF NOT EXISTS audit_events_{start:%Y_%m} '
+            'PARTITION OF audit_events '
+            f"FOR VALUES FROM ('{start} 00:00+00') TO ('{end} 00:00+00')",
+        )
+        try:
+            async with self._engine.begin() as conn:
+                await conn.execute(ddl)
+        except Exception:
+            # Например, строки месяца уже лежат в default-секции:
+            # вставка всё равно пройдёт, просто без отдельной секции.
+            log.exception('audit: не удалось создать секцию %s', start)
+        self._partitions.add(month)
+
+
+audit_sink = AuditSink(engine)
+"""Приёмник аудита процесса; запускается в lifespan приложения."""
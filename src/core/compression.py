@@ -0,0 +1,131 @@
+"""Сжатие ответов gzip и brotli: выбор кодировки и кодировщики.
+
+brotli - необязательная зависимость: без пакета `brotli` ответы
+сжимаются только gzip.
+"""
+from __future__ import annotations
+
+import zlib
+from typing import Optional
+
+from core.config import settings
+from core.constants import COMPRESSIBLE_CONTENT_TYPES
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+GZIP = 'gzip'
+BROTLI = 'br'
+# Начало любого gzip-потока; JSON так начинаться не может.
+GZIP_MAGIC = b'\x1f\x8b'
+# Порядок предпочтения при равном согласии клиента.
+ENCODINGS = (BROTLI, GZIP) if brotli is not None else (GZIP,)
+
+
+def accepted_encodings(accept_encoding: str) -> dict[str, float]:
+    """Разбирает Accept-Encoding: кодировка -> q."""
+    accepted = {}
+    for item in accept_encoding.split(','):
+        name, *params = (part.strip() for part in item.split(';'))
+        if not name:
+            continue
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition('=')
+            if key.strip() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[name.lower()] = q
+    return accepted
+
+
+def accepts(accept_encoding: str, encoding: str) -> bool:
+    """Клиент принимает `encoding`: q > 0 у неё или у `*`."""
+    accepted = accepted_encodings(accept_encoding)
+    return accepted.get(encoding, accepted.get('*', 0.0)) > 0
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Кодировка ответа: brotli, затем gzip; None - без сжатия."""
+    for encoding in ENCODINGS:
+        if accepts(accept_encoding, encoding):
+            return encoding
+    return None
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    """Тип ответа из COMPRESSIBLE_CONTENT_TYPES (без параметров)."""
+    if not content_type:
+        return False
+    media_type = content_type.partition(';')[0].strip().lower()
+    return any(
+        media_type.startswith(allowed)
+        if allowed.endswith('/')
+        else media_type == allowed
+        for allowed in COMPRESSIBLE_CONTENT_TYPES
+    )
+
+
+class GzipEncoder:
+    """Потоковый gzip: каждая порция доходит до клиента сразу."""
+
+    def __init__(self, level: int = settings.COMPRESSION_GZIP_LEVEL) -> None:
+        """Кодировщик с уровнем сжатия `level` (1-9)."""
+        self._compressor = zlib.compressobj(
+            level, zlib.DEFLATED, 16 + zlib.MAX_WBITS,
+        )
+
+    def compress(self, chunk: bytes) -> bytes:
+        """Сжать порцию и сбросить её (Z_SYNC_FLUSH)."""
+        return (
+            self._compressor.compress(chunk)
+            + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        )
+
+    def finish(self, chunk: bytes = b'') -> bytes:
+        """Последняя порция и конец потока."""
+        return self._compressor.compress(chunk) + self._compressor.flush()
+
+
+class BrotliEncoder:
+    """Потоковый brotli: каждая порция доходит до клиента сразу."""
+
+    def __init__(
+        self,
+        quality: int = settings.COMPRESSION_BROTLI_QUALITY,
+    ) -> None:
+        """Кодировщик с качеством `quality` (0-11)."""
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, chunk: bytes) -> bytes:
+        """Сжать порцию и сбросить её."""
+        return self._compressor.process(chunk) + self._compressor.flush()
+
+    def finish(self, chunk: bytes = b'') -> bytes:
+        """Последняя порция и конец потока."""
+        return self._compressor.process(chunk) + self._compressor.finish()
+
+
+def new_encoder(encoding: str) -> GzipEncoder | BrotliEncoder:
+    """Потоковый кодировщик для `encoding` из ENCODINGS."""
+    return BrotliEncoder() if encoding == BROTLI else GzipEncoder()
+
+
+def compress(data: bytes, encoding: str = GZIP) -> bytes:
+    """Сжать тело ответа целиком."""
+    if encoding == BROTLI:
+        return brotli.compress(
+            data, quality=settings.COMPRESSION_BROTLI_QUALITY,
+        )
+    return zlib.compress(
+        data, settings.COMPRESSION_GZIP_LEVEL, wbits=16 + zlib.MAX_WBITS,
+    )
+
+
+def decompress_gzip(data: bytes) -> bytes:
+    """Распаковать gzip (для клиентов без поддержки сжатия)."""
+    return zlib.decompress(data, wbits=16 + zlib.MAX_WBITS)
@@ -34,6 +34,18 @@ class Settings:
 
     # Media
     MEDIA_PATH: Path = Path(os.getenv('MEDIA_PATH', '/media'))
+    # Варианты картинок: имя и максимальная ширина, по возрастанию.
+    MEDIA_VARIANTS: str = os.getenv(
+        'MEDIA_VARIANTS',
+        'thumb:160,card:640,full:1920',
+    )
+    # Префикс internal-location nginx; пусто - файл отдаёт приложение.
+    MEDIA_ACCEL_REDIRECT: str = os.getenv('MEDIA_ACCEL_REDIRECT', '')
+    # Загрузки не больше этого размера (байт) обрабатываются прямо в API,
+    # остальные - в Celery; 0 - всегда Celery.
+    MEDIA_INLINE_MAX_SIZE: int = int(
+        os.getenv('MEDIA_INLINE_MAX_SIZE', str(512 * 1024)),
+    )
 
     CELERY_BROKER_URL: str = os.getenv(
         'CELERY_BROKER_URL',
@@ -52,15 +64,38 @@ class Settings:
         'python-plus-53-54-cafe@yandex.ru',
     )
     SMTP_PASSWORD: str = os.getenv('SMTP_PASSWORD', 'jlezoiiqptbwgmae')
+    SMTP_STARTTLS: bool = os.getenv('SMTP_STARTTLS', '1').lower() in (
+        '1',
+        'true',
+    )
 
     # Logging
     LOG_LEVEL: str = os.getenv('LOG_LEVEL', 'INFO')
     LOG_FILE: str | None = os.getenv('LOG_FILE')
+    LOG_JSON: bool = os.getenv('LOG_JSON', '').lower() in ('1', 'true')
+    LOG_SAMPLING: str = os.getenv('LOG_SAMPLING', '')
 
     # Redis
     REDIS_URL: str = os.getenv('REDIS_URL', 'redis://redis:6379/0')
     REDIS_CACHE_TTL: int = os.getenv('REDIS_CACHE_TTL', 300)
 
+    # Метрики: каталог файлов метрик процессов (пусто - один процесс)
+    # и порт HTTP-сервера метрик воркера Celery (0 - не запускать).
+    PROMETHEUS_MULTIPROC_DIR: str = os.getenv('PROMETHEUS_MULTIPROC_DIR', '')
+    CELERY_METRICS_PORT: int = int(os.getenv('CELERY_METRICS_PORT', '0'))
+
+    # Отчёты профилирования запросов (X-Profile): каталог и сколько
+    # последних отчётов хранить.
+    PROFILE_DIR: Path = Path(os.getenv('PROFILE_DIR', '/tmp/profiles'))
+    PROFILE_MAX_REPORTS: int = int(os.getenv('PROFILE_MAX_REPORTS', '50'))
+
+    # Сжатие ответов: ответы короче порога (байт) отдаются как есть.
+    COMPRESSION_MIN_SIZE: int = int(os.getenv('COMPRESSION_MIN_SIZE', '1024'))
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv('COMPRESSION_GZIP_LEVEL', '6'))
+    COMPRESSION_BROTLI_QUALITY: int = int(
+        os.getenv('COMPRESSION_BROTLI_QUALITY', '4'),
+    )
+
 
 settings = Settings()
 """Экземпляр настроек для использования в проекте."""
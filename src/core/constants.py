@@ -30,3 +30,93 @@ DESCRIPTION_MIN = 1
 BOOKING_NOTE_MAX = 255
 BOOKING_NOTE_MIN = 1
 EXPIRE_CASHE_TIME = 24 * 60 * 60
+BULK_MAX_ITEMS = 500
+
+AUDIT_RESOURCE_MAX = 64
+AUDIT_ACTION_MAX = 64
+AUDIT_REQUEST_ID_MAX = 64
+AUDIT_QUEUE_MAX = 10_000
+AUDIT_BATCH_SIZE = 500
+AUDIT_FLUSH_INTERVAL = 1.0
+AUDIT_PAGE_MAX = 500
+
+MASS_MAIL_CHUNK = 1000
+MASS_MAIL_BATCH = 50
+MASS_MAIL_MAX_RETRIES = 5
+MASS_MAIL_RETRY_BACKOFF = 30
+
+SMTP_POOL_SIZE = 4
+SMTP_POOL_MAX_MESSAGES = 100
+SMTP_POOL_CHECK_IDLE = 30.0
+SMTP_TIMEOUT = 30.0
+
+NOTIFICATION_KIND_MAX = 32
+NOTIFICATION_SUBJECT_MAX = 255
+NOTIFICATION_DISPATCH_BATCH = 500
+NOTIFICATION_DISPATCH_INTERVAL = 60.0
+BOOKING_REMINDER_BEFORE_HOURS = 1
+BOOKING_REMINDER_KIND = 'booking_reminder'
+BOOKING_TIMEZONE = 'Europe/Moscow'
+
+OUTBOX_TASK_MAX = 128
+OUTBOX_RELAY_BATCH = 500
+OUTBOX_RELAY_INTERVAL = 5.0
+OUTBOX_PURGE_INTERVAL = 60 * 60.0
+OUTBOX_RETENTION_HOURS = 7 * 24
+
+CELERY_QUEUE_MEDIA = 'media'
+CELERY_QUEUE_MAIL = 'transactional-mail'
+CELERY_QUEUE_BULK = 'bulk-mail'
+CELERY_QUEUE_SCHEDULING = 'scheduling'
+CELERY_MAX_PRIORITY = 9
+CELERY_PRIORITY_HIGH = 8
+CELERY_PRIORITY_NORMAL = 5
+CELERY_PRIORITY_LOW = 1
+
+IDEMPOTENCY_KEY_MAX = 255
+IDEMPOTENCY_TTL = 24 * 60 * 60
+IDEMPOTENCY_LOCK_TTL = 30
+IDEMPOTENCY_WAIT = 10.0
+IDEMPOTENCY_POLL = 0.1
+TASK_DEDUPE_TTL = 24 * 60 * 60
+TASK_DEDUPE_LOCK_TTL = 10 * 60
+
+MANAGER_DIGEST_INTERVAL = 15 * 60.0
+MANAGER_DIGEST_LAG = 60.0
+MANAGER_DIGEST_MAX_LOOKBACK = 24 * 60 * 60.0
+
+MEDIA_UPLOAD_CHUNK = 64 * 1024
+MEDIA_UPLOAD_DIR = '.incoming'
+MEDIA_JPEG_QUALITY = 85
+MEDIA_WEBP_QUALITY = 80
+MEDIA_WIDTH_MAX = 4096
+MEDIA_HASH_LEN = 64
+MEDIA_GC_INTERVAL = 6 * 60 * 60.0
+MEDIA_GC_GRACE_HOURS = 24
+MEDIA_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+MEDIA_MIGRATE_WORKERS = 8
+MEDIA_MIGRATE_BATCH = 1000
+MEDIA_MAX_PIXELS = 50_000_000
+MEDIA_INLINE_WORKERS = 4
+# Больше - обработка в Celery даже для маленького файла.
+MEDIA_INLINE_MAX_PIXELS = 4_000_000
+
+# Типы ответов, которые сжимаются; '/' в конце - любой подтип.
+# Картинки (JPEG, WebP) уже сжаты и в список не входят.
+COMPRESSIBLE_CONTENT_TYPES = (
+    'application/json',
+    'application/javascript',
+    'application/xml',
+    'image/svg+xml',
+    'text/',
+)
+
+# Границы гистограммы времени задач Celery, секунды.
+CELERY_TASK_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 900)
+UNMATCHED_ROUTE = '<unmatched>'
+
+PROFILE_HEADER = 'X-Profile'
+PROFILE_QUERY = 'profile'
+PROFILE_REPORT_HEADER = 'X-Profile-Report'
+# Период сэмплирования профилировщика, секунды.
+PROFILE_INTERVAL = 0.001
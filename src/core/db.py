@@ -1,4 +1,5 @@
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
 
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import (AsyncSession, async_sessionmaker,
@@ -8,6 +9,7 @@ from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from core.config import settings
 from core.logging import get_logger
+from core.metrics import instrument_pool
 
 logger = get_logger(__name__)
 
@@ -18,6 +20,7 @@ engine = create_async_engine(
     echo=False,
     pool_pre_ping=True,
 )
+instrument_pool(engine.sync_engine, 'api')
 
 AsyncSessionLocal = async_sessionmaker(
     bind=engine,
@@ -44,4 +47,72 @@ async def get_session() -> AsyncIterator[AsyncSession]:
             logger.info('Сессия закрыта.')
 
 
-__all__ = ['engine', 'AsyncSessionLocal', 'get_session']
+_UOW_DEPTH_KEY = 'uow_depth'
+_UOW_AFTER_COMMIT_KEY = 'uow_after_commit'
+
+
+@asynccontextmanager
+async def uow(session: AsyncSession) -> AsyncIterator[AsyncSession]:
+    """Единица работы над несколькими CRUD-вызовами.
+
+    Внутри блока CRUD-методы делают только flush, commit выполняется
+    один раз на выходе, rollback - при исключении. Вложенные блоки
+    присоединяются к внешнему. Действия из `after_commit` выполняются
+    после commit внешнего блока и отбрасываются при rollback.
+    """
+    depth = session.info.get(_UOW_DEPTH_KEY, 0)
+    session.info[_UOW_DEPTH_KEY] = depth + 1
+    committed = False
+    try:
+        yield session
+        if depth == 0:
+            await session.commit()
+            committed = True
+    except BaseException:
+        if depth == 0:
+            await session.rollback()
+        raise
+    finally:
+        session.info[_UOW_DEPTH_KEY] = depth
+        if depth == 0:
+            callbacks = session.info.pop(_UOW_AFTER_COMMIT_KEY, [])
+            if committed:
+                for callback in callbacks:
+                    callback()
+
+
+def in_uow(session: AsyncSession) -> bool:
+    """Проверить, выполняется ли сессия внутри `uow()`."""
+    return session.info.get(_UOW_DEPTH_KEY, 0) > 0
+
+
+def after_commit(session: AsyncSession, callback: Callable[[], None]) -> None:
+    """Выполнить `callback`, когда изменения сессии зафиксированы.
+
+    Внутри `uow()` вызов откладывается до commit внешнего блока и
+    отбрасывается при rollback. Вне единицы работы CRUD-методы уже
+    закоммитили изменения, и `callback` вызывается сразу.
+    """
+    if in_uow(session):
+        session.info.setdefault(_UOW_AFTER_COMMIT_KEY, []).append(callback)
+    else:
+        callback()
+
+
+async def commit_or_flush(session: AsyncSession) -> None:
+    """Commit вне единицы работы, flush - внутри неё."""
+    if in_uow(session):
+        await session.flush()
+    else:
+        await session.commit()
+
+
+__all__ = [
+    'engine',
+    'AsyncSessionLocal',
+    'get_session',
+    'uow',
+    'in_uow',
+    'after_commit',
+    'commit_or_flush',
+]
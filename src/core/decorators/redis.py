@@ -1,53 +1,122 @@
-from functools import wraps
 import asyncio
-import json
-from typing import Callable, Type, TypeVar, Optional, Any
+from functools import wraps
+from typing import Any, Callable, Optional, Type, TypeVar
+
+from fastapi.responses import Response
+
+from core.compression import (
+    GZIP,
+    GZIP_MAGIC,
+    accepts,
+    compress,
+    decompress_gzip,
+)
+from core.config import settings
+from core.metrics import CACHE_REQUESTS
 from core.redis import redis_cache
+from core.reqctx import get_accept_encoding
+from core.serialization import dump_json
 
 T = TypeVar('T')
 
+# Возвращается методами redis_cache вместо None, если Redis недоступен.
+_CACHE_ERROR = object()
+
 
 def cache_response(
     cache_key_template: Optional[str] = None,
     expire: int = 600,
     response_model: Optional[Type[T]] = None
 ):
+    """Кэширует ответ эндпоинта в Redis.
+
+    С `response_model` в кэш кладётся готовый JSON ответа, и он же
+    отдаётся при попадании: без разбора, валидации и повторной
+    сериализации. Модели, построенные эндпоинтом, тоже сериализуются
+    сразу, минуя вторую проверку FastAPI. JSON не короче
+    COMPRESSION_MIN_SIZE хранится сжатым gzip и отдаётся клиентам,
+    принимающим gzip, без повторного сжатия.
+
+    Попадания, промахи и ошибки Redis считаются в метрике
+    cache_requests_total по семейству ключей - началу шаблона до ':'.
+    """
     def decorator(function: Callable) -> Callable:
+        family = (cache_key_template or function.__name__).partition(':')[0]
+
         @wraps(function)
         async def wrapper(*args, **kwargs) -> Any:
             if cache_key_template:
                 cache_key = cache_key_template.format(**kwargs)
             else:
                 cache_key = f"{function.__module__}:{function.__name__}"
-            cached_json = await redis_cache.get_cached_data(cache_key)
+            if response_model:
+                return await _cached_json(
+                    function, args, kwargs,
+                    f'{cache_key}:json', expire, response_model, family,
+                )
+            cached_json = _record(
+                family,
+                await redis_cache.get_cached_data(cache_key, _CACHE_ERROR),
+            )
             if cached_json is not None:
-                if response_model and cached_json:
-                    try:
-                        cached_data = json.loads(cached_json)
-                        if isinstance(cached_data, list):
-                            return [
-                                response_model.model_validate(
-                                    item) for item in cached_data]
-                        else:
-                            return response_model.model_validate(cached_data)
-                    except json.JSONDecodeError:
-                        return cached_json
                 return cached_json
             result = await function(*args, **kwargs)
-            if response_model and result:
-                if isinstance(result, list):
-                    cache_data = [item.model_dump(
-                        mode='json') for item in result]
-                else:
-                    cache_data = result.model_dump(mode='json')
-                cache_value = json.dumps(cache_data)
-            else:
-                cache_value = result
             asyncio.create_task(
                 redis_cache.set_cached_data(
-                    cache_key, cache_value, expire=expire)
+                    cache_key, result, expire=expire)
             )
 
             return result
         return wrapper
     return decorator
+
+
+async def _cached_json(
+    function: Callable,
+    args: tuple,
+    kwargs: dict,
+    cache_key: str,
+    expire: int,
+    response_model: type,
+    family: str,
+) -> Any:
+    """Ответ из кэша как есть или JSON только что построенных моделей."""
+    cached = _record(
+        family, await redis_cache.get_raw(cache_key, _CACHE_ERROR),
+    )
+    if cached is not None:
+        return _cached_response(cached)
+    result = await function(*args, **kwargs)
+    if result is None or isinstance(result, Response):
+        return result
+    body = dump_json(result, response_model)
+    if len(body) >= settings.COMPRESSION_MIN_SIZE:
+        body = compress(body, GZIP)
+    asyncio.create_task(redis_cache.set_raw(cache_key, body, expire=expire))
+    return _cached_response(body)
+
+
+def _record(family: str, cached: Any) -> Any:
+    """Учесть обращение к кэшу; вернуть запись или None."""
+    if cached is _CACHE_ERROR:
+        CACHE_REQUESTS.labels(family, 'error').inc()
+        return None
+    CACHE_REQUESTS.labels(family, 'miss' if cached is None else 'hit').inc()
+    return cached
+
+
+def _cached_response(body: bytes) -> Response:
+    """Ответ из записи кэша: сжатая запись - как есть, если можно."""
+    if not body.startswith(GZIP_MAGIC):
+        return Response(content=body, media_type='application/json')
+    if not accepts(get_accept_encoding(), GZIP):
+        return Response(
+            content=decompress_gzip(body),
+            media_type='application/json',
+            headers={'Vary': 'Accept-Encoding'},
+        )
+    return Response(
+        content=body,
+        media_type='application/json',
+        headers={'Content-Encoding': GZIP, 'Vary': 'Accept-Encoding'},
+    )
@@ -20,3 +20,15 @@ BOOKING_INFORMATION_FOR_MANAGER = """
 Время: {first_slot} - {last_slot}
 Стол: {table}
 """
+
+MANAGER_DIGEST_TEMPLATE = """
+Новые бронирования в кафе {cafe}: {count}
+За период с {since:%d.%m.%Y %H:%M} по {until:%d.%m.%Y %H:%M}
+
+{bookings}
+"""
+
+MANAGER_DIGEST_LINE = (
+    '{booking_date}, {first_slot} - {last_slot}, '
+    'стол: {table}, гостей: {guests}'
+)
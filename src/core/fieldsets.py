@@ -0,0 +1,72 @@
+"""Частичные ответы (`?fields=`): набор полей и урезанные схемы."""
+from functools import lru_cache
+from typing import Any, Optional
+
+from pydantic import BaseModel, create_model
+
+
+class Fieldset(tuple):
+    """Отсортированные имена полей ответа (как в JSON, с алиасами).
+
+    Строковое представление стабильно и годится для ключа кэша.
+    """
+
+    def __str__(self) -> str:
+        """Поля через запятую."""
+        return ','.join(self)
+
+    def with_fields(self, *names: str) -> 'Fieldset':
+        """Набор с дополнительными полями (например, для проверок)."""
+        return Fieldset(sorted({*self, *names}))
+
+
+@lru_cache(maxsize=None)
+def public_names(schema: type[BaseModel]) -> dict[str, str]:
+    """Имя поля в JSON -> имя поля схемы."""
+    return {
+        field.alias or name: name
+        for name, field in schema.model_fields.items()
+    }
+
+
+def parse_fields(
+    raw: Optional[str],
+    schema: type[BaseModel],
+) -> Optional[Fieldset]:
+    """Разобрать 'id,name' из запроса; None - все поля схемы.
+
+    Неизвестные имена - ValueError.
+    """
+    if not raw:
+        return None
+    names = {part.strip() for part in raw.split(',')} - {''}
+    unknown = names - public_names(schema).keys()
+    if unknown:
+        raise ValueError(f'Неизвестные поля: {", ".join(sorted(unknown))}')
+    return Fieldset(sorted(names)) if names else None
+
+
+@lru_cache(maxsize=None)
+def partial_schema(
+    schema: type[BaseModel],
+    fields: Optional[Fieldset],
+) -> type[BaseModel]:
+    """Схема только с полями `fields` (без них - сама `schema`)."""
+    if fields is None:
+        return schema
+    model = create_model(
+        f'{schema.__name__}Fields',
+        __config__=schema.model_config,
+        **{
+            name: (field.annotation, field)
+            for name, field in schema.model_fields.items()
+            if (field.alias or name) in fields
+        },
+    )
+    model.__partial_of__ = schema
+    return model
+
+
+def schema_of(obj: Any) -> type:
+    """Полная схема объекта ответа (для частичного - исходная)."""
+    return getattr(type(obj), '__partial_of__', type(obj))
@@ -0,0 +1,133 @@
+"""Хранилище идемпотентных ответов в Redis.
+
+Для ключа `<scope>` держатся две записи:
+
+* `idem:<scope>:lock` - запрос с этим ключом выполняется прямо сейчас
+  (SET NX с коротким TTL, значение - отпечаток тела запроса);
+* `idem:<scope>` - сохранённый ответ: отпечаток, статус и тело.
+
+Повтор с тем же ключом получает сохранённый ответ, параллельный
+дубликат ждёт, пока первый запрос его запишет.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+from typing import Any, Optional
+
+import redis.asyncio as redis
+
+from core.constants import (
+    IDEMPOTENCY_LOCK_TTL,
+    IDEMPOTENCY_POLL,
+    IDEMPOTENCY_TTL,
+    IDEMPOTENCY_WAIT,
+)
+from core.redis import redis_cache
+
+
+class IdempotencyError(Exception):
+    """Базовая ошибка идемпотентного запроса."""
+
+
+class IdempotencyKeyReused(IdempotencyError):
+    """Ключ уже использован с другим телом запроса."""
+
+
+class IdempotencyInFlight(IdempotencyError):
+    """Запрос с этим ключом всё ещё выполняется."""
+
+
+def fingerprint(payload: Any) -> str:
+    """Отпечаток тела запроса (sha256 канонического JSON)."""
+    data = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+class IdempotencyStore:
+    """Блокировка «в работе» и сохранённые ответы по ключу."""
+
+    def __init__(
+        self,
+        client: Optional[redis.Redis] = None,
+        ttl: int = IDEMPOTENCY_TTL,
+        lock_ttl: int = IDEMPOTENCY_LOCK_TTL,
+        wait: float = IDEMPOTENCY_WAIT,
+        poll: float = IDEMPOTENCY_POLL,
+    ) -> None:
+        """Клиент Redis по умолчанию берётся из `redis_cache`."""
+        self._client = client
+        self.ttl = ttl
+        self.lock_ttl = lock_ttl
+        self.wait = wait
+        self.poll = poll
+
+    async def acquire(self, key: str, digest: str) -> Optional[dict]:
+        """Занять ключ или получить сохранённый ответ.
+
+        Возвращает None, если ключ занят этим вызовом и запрос нужно
+        выполнить, иначе - словарь `{'status', 'body'}` первого ответа.
+        Пока первый запрос выполняется, ждёт до `wait` секунд.
+        """
+        client = await self._redis()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.wait
+        while True:
+            saved = await client.get(self._result_key(key))
+            if saved is not None:
+                record = json.loads(saved)
+                if record['fingerprint'] != digest:
+                    raise IdempotencyKeyReused(key)
+                return {'status': record['status'], 'body': record['body']}
+            if await client.set(
+                self._lock_key(key), digest, nx=True, ex=self.lock_ttl,
+            ):
+                return None
+            holder = await client.get(self._lock_key(key))
+            if holder is not None and holder != digest:
+                raise IdempotencyKeyReused(key)
+            if loop.time() >= deadline:
+                raise IdempotencyInFlight(key)
+            await asyncio.sleep(self.poll)
+
+    async def save(
+        self,
+        key: str,
+        digest: str,
+        status: int,
+        body: Any,
+    ) -> None:
+        """Сохранить ответ на `ttl` и снять блокировку."""
+        client = await self._redis()
+        record = json.dumps(
+            {'fingerprint': digest, 'status': status, 'body': body},
+            default=str,
+        )
+        async with client.pipeline(transaction=True) as pipe:
+            pipe.set(self._result_key(key), record, ex=self.ttl)
+            pipe.delete(self._lock_key(key))
+            await pipe.execute()
+
+    async def release(self, key: str) -> None:
+        """Снять блокировку без ответа (запрос завершился ошибкой)."""
+        client = await self._redis()
+        await client.delete(self._lock_key(key))
+
+    async def _redis(self) -> redis.Redis:
+        """Клиент Redis."""
+        if self._client is None:
+            return await redis_cache.get_redis()
+        return self._client
+
+    @staticmethod
+    def _lock_key(key: str) -> str:
+        return f'idem:{key}:lock'
+
+    @staticmethod
+    def _result_key(key: str) -> str:
+        return f'idem:{key}'
+
+
+idempotency_store = IdempotencyStore()
+"""Хранилище идемпотентных ответов API."""
@@ -1,14 +1,29 @@
+import atexit
+import json
 import logging
+import os
+import queue
+import random
 import sys
+from datetime import datetime, timezone
 from logging import Logger, LoggerAdapter
-from logging.handlers import RotatingFileHandler
-from typing import Any, Dict, Tuple
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Any, Dict, Optional, Tuple
 
 from sqlalchemy.orm.exc import DetachedInstanceError
 
 from core.config import settings
-from core.constants import (DEFAULT_USER_ID, DEFAULT_USER_NAME,
-                            LOG_BACKUP_COUNT, LOG_FORMAT, LOG_MAX_BYTES)
+from core.constants import (
+    DEFAULT_USER_ID,
+    DEFAULT_USER_NAME,
+    LOG_BACKUP_COUNT,
+    LOG_FORMAT,
+    LOG_MAX_BYTES,
+)
+from core.reqctx import get_request_id, get_user
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
 
 
 class SafeExtraFormatter(logging.Formatter):
@@ -33,8 +48,114 @@ class UserAdapter(LoggerAdapter):
         return msg, kwargs
 
 
+class JsonFormatter(logging.Formatter):
+    """Одна запись - одна JSON-строка с req_id и user-контекстом."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Собирает JSON из полей записи."""
+        data = {
+            'ts': datetime.fromtimestamp(
+                record.created,
+                tz=timezone.utc,
+            ).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'req_id': getattr(record, 'req_id', None),
+            'user': getattr(record, 'user', DEFAULT_USER_NAME),
+            'user_id': getattr(record, 'user_id', DEFAULT_USER_ID),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data['exc'] = record.exc_text
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class ContextFilter(logging.Filter):
+    """Снимает req_id и пользователя из reqctx в момент вызова лога.
+
+    Форматирование идёт в потоке QueueListener, где контекста запроса
+    уже нет, поэтому значения копируются в запись заранее.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Дописывает req_id/user/user_id, если их нет в записи."""
+        record.req_id = get_request_id()
+        if not hasattr(record, 'user'):
+            user = get_user()
+            if user is not None:
+                record.user = _safe_getattr(
+                    user,
+                    'username',
+                    DEFAULT_USER_NAME,
+                )
+                record.user_id = _safe_getattr(user, 'id', DEFAULT_USER_ID)
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Пропускает долю INFO/DEBUG-записей выбранных логгеров.
+
+    `rates` - {префикс имени логгера: доля 0..1}; берётся самый длинный
+    подходящий префикс. WARNING и выше проходят всегда.
+    """
+
+    def __init__(self, rates: Dict[str, float]) -> None:
+        """Сохраняет доли, длинные префиксы проверяются первыми."""
+        super().__init__()
+        self._rates = sorted(
+            rates.items(),
+            key=lambda item: len(item[0]),
+            reverse=True,
+        )
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Решает, оставить ли запись."""
+        if record.levelno > logging.INFO:
+            return True
+        for prefix, rate in self._rates:
+            if record.name == prefix or record.name.startswith(prefix + '.'):
+                return rate >= 1 or random.random() < rate
+        return True
+
+
+class _ContextQueueHandler(QueueHandler):
+    """QueueHandler, сохраняющий extra-поля и трейсбек отдельно."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Подставляет аргументы в сообщение до передачи в поток."""
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(
+                record.exc_info,
+            )
+            record.exc_info = None
+        return record
+
+
+def parse_sampling(spec: str) -> Dict[str, float]:
+    """Разбирает строку вида 'core.db=0.1,api=0.5' в словарь долей."""
+    rates: Dict[str, float] = {}
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        name, _, rate = item.partition('=')
+        rates[name.strip()] = min(max(float(rate), 0.0), 1.0)
+    return rates
+
+
 def setup_logging() -> None:
-    """Инициализируем базовый конфиг логирования."""
+    """Инициализируем конфиг логирования.
+
+    Корневой логгер получает только QueueHandler: запись в поток вывода
+    и файл выполняет QueueListener в отдельном потоке, event loop не
+    блокируется на I/O.
+    """
+    global _listener, _queue_handler
+
+    shutdown_logging()
+
     level_name = getattr(settings, 'LOG_LEVEL', 'INFO')
     level = getattr(logging, level_name.upper(), logging.INFO)
 
@@ -50,15 +171,55 @@ def setup_logging() -> None:
         )
         handlers.append(file_handler)
 
-    formatter = SafeExtraFormatter(LOG_FORMAT)
+    if settings.LOG_JSON:
+        formatter: logging.Formatter = JsonFormatter()
+    else:
+        formatter = SafeExtraFormatter(LOG_FORMAT)
     for h in handlers:
         h.setFormatter(formatter)
 
+    _queue_handler = _ContextQueueHandler(queue.SimpleQueue())
+    _queue_handler.addFilter(ContextFilter())
+    rates = parse_sampling(settings.LOG_SAMPLING)
+    if rates:
+        _queue_handler.addFilter(SamplingFilter(rates))
+    _listener = QueueListener(
+        _queue_handler.queue,
+        *handlers,
+        respect_handler_level=True,
+    )
+    _listener.start()
+
     root = logging.getLogger()
     root.handlers.clear()
     root.setLevel(level)
-    for h in handlers:
-        root.addHandler(h)
+    root.addHandler(_queue_handler)
+
+
+def shutdown_logging() -> None:
+    """Дописывает очередь логов и останавливает поток QueueListener."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def _restart_listener_after_fork() -> None:
+    """Поток QueueListener не переживает fork (Celery prefork)."""
+    global _listener
+    if _listener is None or _queue_handler is None:
+        return
+    _queue_handler.queue = queue.SimpleQueue()
+    _listener = QueueListener(
+        _queue_handler.queue,
+        *_listener.handlers,
+        respect_handler_level=True,
+    )
+    _listener.start()
+
+
+atexit.register(shutdown_logging)
+os.register_at_fork(after_in_child=_restart_listener_after_fork)
 
 
 def get_logger(name: str) -> Logger:
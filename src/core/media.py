@@ -0,0 +1,249 @@
+"""Варианты изображений: размеры, форматы, имена файлов и генерация.
+
+Для каждой загрузки сохраняется набор вариантов из MEDIA_VARIANTS
+(имя -> максимальная ширина) в JPEG и WebP. Полный JPEG лежит под
+прежним именем `<media_id>.jpg`, остальные - `<media_id>_<имя>.<ext>`.
+
+Файлы раскладываются по двум уровням каталогов по префиксу media_id
+(`ab/cd/<media_id>.jpg`). Старые загрузки могут ещё лежать в корне
+MEDIA_PATH, пока их не перенесёт `python -m services.media_migrate`.
+"""
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, BinaryIO, Optional, Union
+
+import anyio
+import anyio.to_thread
+from PIL import Image
+
+from core.config import settings
+from core.constants import (
+    MEDIA_INLINE_WORKERS,
+    MEDIA_JPEG_QUALITY,
+    MEDIA_MAX_PIXELS,
+    MEDIA_WEBP_QUALITY,
+)
+
+# Порог Pillow для DecompressionBombWarning/Error при декодировании.
+Image.MAX_IMAGE_PIXELS = MEDIA_MAX_PIXELS
+
+
+@dataclass(frozen=True)
+class ImageFormat:
+    """Формат сохранения варианта."""
+
+    ext: str
+    pil_format: str
+    media_type: str
+    options: dict[str, Any] = field(default_factory=dict)
+
+
+FORMATS: dict[str, ImageFormat] = {
+    'webp': ImageFormat(
+        'webp', 'WEBP', 'image/webp',
+        {'quality': MEDIA_WEBP_QUALITY, 'method': 4},
+    ),
+    'jpeg': ImageFormat(
+        'jpg', 'JPEG', 'image/jpeg',
+        {'quality': MEDIA_JPEG_QUALITY, 'optimize': True, 'progressive': True},
+    ),
+}
+DEFAULT_FORMAT = 'jpeg'
+
+
+def parse_variants(spec: str) -> dict[str, int]:
+    """Разбирает 'thumb:160,card:640' в словарь, упорядоченный по ширине."""
+    variants: dict[str, int] = {}
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        name, _, width = item.partition(':')
+        variants[name.strip()] = int(width)
+    return dict(sorted(variants.items(), key=lambda item: item[1]))
+
+
+VARIANTS = parse_variants(settings.MEDIA_VARIANTS)
+FULL_VARIANT = next(reversed(VARIANTS))
+
+
+def variant_filename(media_id: str, variant: str, fmt: str) -> str:
+    """Имя файла варианта; полный JPEG - под прежним именем."""
+    if variant == FULL_VARIANT and fmt == DEFAULT_FORMAT:
+        return f'{media_id}.jpg'
+    return f'{media_id}_{variant}.{FORMATS[fmt].ext}'
+
+
+def media_dir(media_id: str, root: Path) -> Path:
+    """Каталог файлов картинки: `root/ab/cd` по началу media_id.
+
+    media_id - uuid4, его первые символы равномерно случайны, поэтому
+    на каждый каталог приходится примерно 1/65536 всех картинок.
+    """
+    return root / media_id[:2] / media_id[2:4]
+
+
+def lookup_paths(
+    media_id: str,
+    variant: str,
+    fmt: str,
+    root: Path,
+) -> list[Path]:
+    """Где искать вариант: сначала вариант, потом полный JPEG.
+
+    Каждый файл ищется в каталоге шарда, затем в корне `root`, куда
+    его положили до перехода на шарды.
+    """
+    names = [
+        variant_filename(media_id, variant, fmt),
+        variant_filename(media_id, FULL_VARIANT, DEFAULT_FORMAT),
+    ]
+    directory = media_dir(media_id, root)
+    return [
+        path
+        for name in dict.fromkeys(names)
+        for path in (directory / name, root / name)
+    ]
+
+
+def pick_variant(width: Optional[int]) -> str:
+    """Наименьший вариант не уже `width`; без ширины - полный."""
+    if width is None:
+        return FULL_VARIANT
+    for name, variant_width in VARIANTS.items():
+        if variant_width >= width:
+            return name
+    return FULL_VARIANT
+
+
+def negotiate_format(accept: Optional[str]) -> str:
+    """Формат по заголовку Accept: WebP, если клиент его принимает."""
+    for item in (accept or '').split(','):
+        media_range, *params = (part.strip() for part in item.split(';'))
+        if media_range != FORMATS['webp'].media_type:
+            continue
+        for param in params:
+            key, _, value = param.partition('=')
+            if key.strip() == 'q' and value.strip() in {'0', '0.0', '0.00'}:
+                return DEFAULT_FORMAT
+        return 'webp'
+    return DEFAULT_FORMAT
+
+
+def save_variants(
+    source: Union[Path, BinaryIO],
+    media_id: str,
+    root: Path,
+    max_pixels: int = MEDIA_MAX_PIXELS,
+) -> list[str]:
+    """Сохранить все варианты картинки, вернуть имена файлов.
+
+    JPEG декодируется сразу в уменьшенном масштабе (`draft`), варианты
+    считаются каскадом от большего к меньшему через `resize` с
+    `reducing_gap` (целочисленный `reduce` перед фильтром). Файлы
+    пишутся через временное имя и `os.replace`, чтобы GET не отдал
+    недописанный файл. Полный JPEG появляется последним: его наличие
+    означает, что готовы все варианты. Файлы ложатся в каталог шарда
+    (`media_dir`).
+
+    Размер в пикселях проверяется по заголовку до декодирования:
+    картинка больше `max_pixels` отклоняется DecompressionBombError.
+    """
+    directory = media_dir(media_id, root)
+    saved = []
+    legacy = variant_filename(media_id, FULL_VARIANT, DEFAULT_FORMAT)
+    with Image.open(source) as image:
+        if image.width * image.height > max_pixels:
+            raise Image.DecompressionBombError(
+                f'Изображение {image.width}x{image.height} больше '
+                f'{max_pixels} пикселей',
+            )
+        directory.mkdir(parents=True, exist_ok=True)
+        largest = VARIANTS[FULL_VARIANT]
+        if image.width > largest:
+            image.draft(
+                'RGB',
+                (largest, max(1, image.height * largest // image.width)),
+            )
+        current = image if image.mode == 'RGB' else image.convert('RGB')
+        for name in reversed(VARIANTS):
+            width = VARIANTS[name]
+            if current.width > width:
+                height = max(1, round(current.height * width / current.width))
+                current = current.resize(
+                    (width, height),
+                    Image.Resampling.LANCZOS,
+                    reducing_gap=2.0,
+                )
+            for fmt, spec in FORMATS.items():
+                filename = variant_filename(media_id, name, fmt)
+                tmp_path = directory / f'.{filename}.tmp'
+                current.save(tmp_path, spec.pil_format, **spec.options)
+                if filename != legacy:
+                    os.replace(tmp_path, directory / filename)
+                saved.append(filename)
+    os.replace(directory / f'.{legacy}.tmp', directory / legacy)
+    return saved
+
+
+_inline_limiter = anyio.CapacityLimiter(MEDIA_INLINE_WORKERS)
+
+
+async def save_variants_inline(
+    source: Path,
+    media_id: str,
+    root: Path,
+    max_pixels: int,
+) -> Optional[list[str]]:
+    """`save_variants` в пуле потоков API-процесса.
+
+    Одновременно идёт не больше MEDIA_INLINE_WORKERS обработок. Если
+    все места заняты, возвращает None, не дожидаясь очереди: картинку
+    тогда обработает Celery.
+    """
+    if _inline_limiter.available_tokens < 1:
+        return None
+    return await anyio.to_thread.run_sync(
+        save_variants,
+        source,
+        media_id,
+        root,
+        max_pixels,
+        limiter=_inline_limiter,
+    )
+
+
+def delete_variants(media_id: str, root: Path) -> int:
+    """Удалить файлы всех вариантов картинки, вернуть их число.
+
+    Файлы ищутся и в каталоге шарда, и в корне `root`.
+    """
+    removed = 0
+    for directory in (media_dir(media_id, root), root):
+        for name in VARIANTS:
+            for fmt in FORMATS:
+                path = directory / variant_filename(media_id, name, fmt)
+                if path.exists():
+                    path.unlink(missing_ok=True)
+                    removed += 1
+    return removed
+
+
+def delete_stale_uploads(upload_dir: Path, older_than: float) -> int:
+    """Удалить временные файлы загрузок, изменённые раньше `older_than`.
+
+    Такие файлы остаются в каталоге загрузок, если событие outbox или
+    задача save_image потерялись. `older_than` - метка времени Unix.
+    """
+    if not upload_dir.is_dir():
+        return 0
+    removed = 0
+    for path in upload_dir.iterdir():
+        try:
+            if path.is_file() and path.stat().st_mtime < older_than:
+                path.unlink()
+                removed += 1
+        except FileNotFoundError:
+            # Файл успел удалить воркер или API.
+            continue
+    return removed
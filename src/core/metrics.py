@@ -0,0 +1,134 @@
+"""Метрики Prometheus для API и Celery-воркеров.
+
+С PROMETHEUS_MULTIPROC_DIR каждый процесс (воркеры uvicorn, процессы
+prefork Celery) пишет свои значения в файлы этого каталога, а
+`render_metrics` собирает их вместе. Каталог очищается при
+перезапуске сервиса: для API - командой запуска, для Celery - главным
+процессом воркера. Без переменной метрики живут в памяти
+единственного процесса.
+"""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Any
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import Engine, event
+
+from core.config import settings
+from core.constants import CELERY_TASK_BUCKETS
+
+if settings.PROMETHEUS_MULTIPROC_DIR:
+    # Файлы значений создаются вместе с метриками ниже.
+    os.makedirs(settings.PROMETHEUS_MULTIPROC_DIR, exist_ok=True)
+
+HTTP_REQUEST_DURATION = Histogram(
+    'http_request_duration_seconds',
+    'Время обработки HTTP-запроса',
+    ['method', 'route', 'status'],
+)
+CACHE_REQUESTS = Counter(
+    'cache_requests_total',
+    'Обращения cache_response к кэшу: hit, miss, error',
+    ['family', 'result'],
+)
+DB_POOL_SIZE = Gauge(
+    'db_pool_size',
+    'Постоянный размер пула соединений БД',
+    ['pool'],
+    multiprocess_mode='livesum',
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    'db_pool_checked_out',
+    'Соединения БД, выданные из пула',
+    ['pool'],
+    multiprocess_mode='livesum',
+)
+REDIS_UP = Gauge(
+    'redis_up',
+    'Последняя операция с Redis успешна (1) или нет (0)',
+    multiprocess_mode='livemin',
+)
+REDIS_ERRORS = Counter(
+    'redis_errors_total',
+    'Ошибки операций с Redis',
+    ['operation'],
+)
+CELERY_TASK_DURATION = Histogram(
+    'celery_task_duration_seconds',
+    'Время выполнения задачи Celery',
+    ['task', 'state'],
+    buckets=CELERY_TASK_BUCKETS,
+)
+CELERY_TASK_FAILURES = Counter(
+    'celery_task_failures_total',
+    'Задачи Celery, завершившиеся исключением',
+    ['task'],
+)
+
+
+def multiprocess_enabled() -> bool:
+    """Метрики собираются из файлов PROMETHEUS_MULTIPROC_DIR."""
+    return bool(settings.PROMETHEUS_MULTIPROC_DIR)
+
+
+def metrics_registry() -> CollectorRegistry:
+    """Реестр для выдачи: все процессы сервиса или текущий."""
+    if not multiprocess_enabled():
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Текст метрик в формате Prometheus и его Content-Type."""
+    return generate_latest(metrics_registry()), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: int | None = None) -> None:
+    """Убрать live-метрики завершившегося процесса."""
+    if multiprocess_enabled():
+        multiprocess.mark_process_dead(pid or os.getpid())
+
+
+def remove_stale_files(keep_pid: int | None = None) -> int:
+    """Удалить файлы метрик прежних процессов, вернуть их число.
+
+    Вызывается в главном процессе до запуска дочерних: значения
+    процессов прошлого запуска иначе попали бы в выдачу.
+    """
+    if not multiprocess_enabled():
+        return 0
+    suffix = f'_{keep_pid or os.getpid()}.db'
+    removed = 0
+    for path in Path(settings.PROMETHEUS_MULTIPROC_DIR).glob('*.db'):
+        if not path.name.endswith(suffix):
+            path.unlink(missing_ok=True)
+            removed += 1
+    return removed
+
+
+def instrument_pool(engine: Engine, name: str) -> None:
+    """Следить за пулом соединений движка под меткой `pool=name`."""
+    size = getattr(engine.pool, 'size', None)
+    DB_POOL_SIZE.labels(name).set(size() if callable(size) else 0)
+    checked_out = DB_POOL_CHECKED_OUT.labels(name)
+
+    @event.listens_for(engine, 'checkout')
+    def _checkout(*args: Any) -> None:
+        checked_out.inc()
+
+    @event.listens_for(engine, 'checkin')
+    def _checkin(*args: Any) -> None:
+        checked_out.dec()
@@ -0,0 +1,49 @@
+"""Время и текст уведомлений о бронировании.
+
+Общие для задач Celery и API: при переносе брони напоминание
+пересчитывается так же, как при создании.
+"""
+from collections.abc import Sequence
+from datetime import date, datetime, timedelta
+from typing import Any
+from zoneinfo import ZoneInfo
+
+from core.constants import BOOKING_REMINDER_BEFORE_HOURS, BOOKING_TIMEZONE
+from core.email_templates import BOOKING_CONFIRMATION_TEMPLATE
+
+SLOT_TIME_FORMAT = '%H:%M'
+
+
+def _slot_start(slot: Any) -> datetime:
+    return datetime.strptime(slot.start_time, SLOT_TIME_FORMAT)
+
+
+def slot_bounds(slots: Sequence[Any]) -> tuple[Any, Any]:
+    """Самый ранний и самый поздний по началу слоты брони."""
+    return min(slots, key=_slot_start), max(slots, key=_slot_start)
+
+
+def booking_confirmation_body(
+    booking_date: date,
+    cafe_name: str,
+    slots: Sequence[Any],
+) -> str:
+    """Текст подтверждения брони; он же уходит в напоминании."""
+    earliest_slot, lastest_slot = slot_bounds(slots)
+    return BOOKING_CONFIRMATION_TEMPLATE.format(
+        username='ddd',
+        booking_date=booking_date,
+        cafe=cafe_name,
+        first_slot=earliest_slot.start_time,
+        last_slot=lastest_slot.end_time,
+    )
+
+
+def reminder_due_at(booking_date: date, slots: Sequence[Any]) -> datetime:
+    """Время напоминания: за BOOKING_REMINDER_BEFORE_HOURS до начала."""
+    earliest_slot, _ = slot_bounds(slots)
+    return datetime.combine(
+        booking_date,
+        _slot_start(earliest_slot).time(),
+        tzinfo=ZoneInfo(BOOKING_TIMEZONE),
+    ) - timedelta(hours=BOOKING_REMINDER_BEFORE_HOURS)
@@ -0,0 +1,117 @@
+"""Профилирование отдельных запросов по флагу.
+
+Запрос с заголовком X-Profile или параметром `?profile=` (значение
+`html` или `speedscope`) выполняется под сэмплирующим профилировщиком
+pyinstrument, если зависимость `allow_profiling` пропустила его
+автора. Отчёты лежат в PROFILE_DIR, хранятся последние
+PROFILE_MAX_REPORTS.
+
+pyinstrument - необязательная зависимость: без пакета флаг
+игнорируется.
+"""
+from __future__ import annotations
+
+import re
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Optional
+from urllib.parse import parse_qs
+
+from starlette.datastructures import Headers
+from starlette.types import Scope
+
+from core.config import settings
+from core.constants import PROFILE_HEADER, PROFILE_QUERY
+
+try:
+    from pyinstrument import Profiler
+    from pyinstrument.renderers import SpeedscopeRenderer
+except ImportError:
+    Profiler = None
+
+HTML = 'html'
+SPEEDSCOPE = 'speedscope'
+REPORT_SUFFIXES = {HTML: '.html', SPEEDSCOPE: '.speedscope.json'}
+REPORT_MEDIA_TYPES = {HTML: 'text/html', SPEEDSCOPE: 'application/json'}
+REPORT_NAME_RE = re.compile(r'^[\w-]+(\.html|\.speedscope\.json)$')
+
+# Ключ в scope['state']: автор запроса может его профилировать.
+_ALLOWED_KEY = 'profile_allowed'
+
+
+def requested_format(scope: Scope) -> Optional[str]:
+    """Формат отчёта из флага запроса; None - профилирование не нужно.
+
+    Любое значение флага, кроме `speedscope`, даёт HTML-отчёт.
+    """
+    value = Headers(scope=scope).get(PROFILE_HEADER)
+    query_string = scope.get('query_string', b'')
+    if value is None and PROFILE_QUERY.encode() in query_string:
+        values = parse_qs(
+            query_string.decode('latin-1'), keep_blank_values=True,
+        ).get(PROFILE_QUERY)
+        value = values[0] if values else None
+    if value is None:
+        return None
+    return SPEEDSCOPE if value.strip().lower() == SPEEDSCOPE else HTML
+
+
+def allow_profile(scope: Scope) -> None:
+    """Отметить запрос как разрешённый к профилированию."""
+    scope.setdefault('state', {})[_ALLOWED_KEY] = True
+
+
+def profile_allowed(scope: Scope) -> bool:
+    """Запрос разрешено профилировать."""
+    return bool(scope.get('state', {}).get(_ALLOWED_KEY))
+
+
+def report_name(scope: Scope, fmt: str) -> str:
+    """Имя файла отчёта: время, метод, путь и случайный суффикс."""
+    slug = re.sub(r'\W+', '-', scope['path']).strip('-')[:40] or 'root'
+    return (
+        f'{time.strftime("%Y%m%dT%H%M%S")}-{scope["method"].lower()}-'
+        f'{slug}-{uuid.uuid4().hex[:8]}{REPORT_SUFFIXES[fmt]}'
+    )
+
+
+def save_report(profiler: Any, scope: Scope, fmt: str) -> str:
+    """Записать отчёт в PROFILE_DIR, вернуть имя файла.
+
+    Старые отчёты сверх PROFILE_MAX_REPORTS удаляются.
+    """
+    directory = Path(settings.PROFILE_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    name = report_name(scope, fmt)
+    if fmt == SPEEDSCOPE:
+        content = profiler.output(SpeedscopeRenderer())
+    else:
+        content = profiler.output_html()
+    (directory / name).write_text(content, encoding='utf-8')
+    prune_reports(directory, settings.PROFILE_MAX_REPORTS)
+    return name
+
+
+def prune_reports(directory: Path, keep: int) -> int:
+    """Оставить `keep` новейших отчётов, вернуть число удалённых."""
+    reports = sorted(
+        (path for path in directory.iterdir() if is_report_name(path.name)),
+        key=lambda path: path.stat().st_mtime,
+        reverse=True,
+    )
+    for path in reports[keep:]:
+        path.unlink(missing_ok=True)
+    return max(len(reports) - keep, 0)
+
+
+def is_report_name(name: str) -> bool:
+    """Имя похоже на отчёт, созданный `save_report`."""
+    return REPORT_NAME_RE.match(name) is not None
+
+
+def report_media_type(name: str) -> str:
+    """Content-Type отчёта по имени файла."""
+    if name.endswith(REPORT_SUFFIXES[SPEEDSCOPE]):
+        return REPORT_MEDIA_TYPES[SPEEDSCOPE]
+    return REPORT_MEDIA_TYPES[HTML]
@@ -5,13 +5,24 @@ from typing import Any, Optional
 import redis.asyncio as redis
 
 from core.config import settings
+from core.metrics import REDIS_ERRORS, REDIS_UP
 
 logger = logging.getLogger(__name__)
 
 
+def _redis_ok() -> None:
+    REDIS_UP.set(1)
+
+
+def _redis_failed(operation: str) -> None:
+    REDIS_UP.set(0)
+    REDIS_ERRORS.labels(operation).inc()
+
+
 class RedisCache:
     def __init__(self):
         self.redis: Optional[redis.Redis] = None
+        self.raw_redis: Optional[redis.Redis] = None
 
     async def init_redis(self) -> redis.Redis:
         """Инициализация Redis подключения."""
@@ -25,9 +36,11 @@ class RedisCache:
                 retry_on_timeout=True,
             )
             await self.redis.ping()
+            _redis_ok()
             logger.info("Redis connection established")
             return self.redis
         except Exception as e:
+            _redis_failed('connect')
             logger.error(f"Failed to connect to Redis: {str(e)}")
             raise
 
@@ -37,24 +50,46 @@ class RedisCache:
             await self.init_redis()
         return self.redis
 
+    async def get_raw_redis(self) -> redis.Redis:
+        """Клиент без декодирования ответов: значения - bytes.
+
+        Нужен для сжатых записей кэша, которые не являются UTF-8.
+        """
+        if self.raw_redis is None:
+            self.raw_redis = redis.from_url(
+                settings.REDIS_URL,
+                socket_connect_timeout=5,
+                socket_keepalive=True,
+                retry_on_timeout=True,
+            )
+        return self.raw_redis
+
     async def close_redis(self):
         """Закрытие Redis подключения."""
+        if self.raw_redis:
+            await self.raw_redis.close()
         if self.redis:
             await self.redis.close()
             logger.info("Redis connection closed")
 
-    async def get_cached_data(self, key: str) -> Optional[Any]:
-        """Получение данных из кэша."""
+    async def get_cached_data(
+        self,
+        key: str,
+        default: Any = None,
+    ) -> Optional[Any]:
+        """Получение данных из кэша; при ошибке Redis - `default`."""
         try:
             redis_client = await self.get_redis()
             cached = await redis_client.get(key)
+            _redis_ok()
             if cached:
                 return json.loads(cached)
             return None
         except Exception as e:
+            _redis_failed('get')
             logger.warning(
                 f"Error getting cached data for key {key}: {str(e)}")
-            return None
+            return default
 
     async def set_cached_data(self, key: str, data: Any, expire: int = 300):
         """Сохранение данных в кэш."""
@@ -65,7 +100,38 @@ class RedisCache:
                 expire,
                 json.dumps(data, default=str),
             )
+            _redis_ok()
+        except Exception as e:
+            _redis_failed('set')
+            logger.warning(
+                f"Error setting cached data for key {key}: {str(e)}")
+
+    async def get_raw(self, key: str, default: Any = None) -> Optional[bytes]:
+        """Байты из кэша как есть, без json.loads; при ошибке - `default`."""
+        try:
+            redis_client = await self.get_raw_redis()
+            cached = await redis_client.get(key)
+            _redis_ok()
+            return cached
+        except Exception as e:
+            _redis_failed('get')
+            logger.warning(
+                f"Error getting cached data for key {key}: {str(e)}")
+            return default
+
+    async def set_raw(
+        self,
+        key: str,
+        value: bytes,
+        expire: int = 300,
+    ) -> None:
+        """Сохранение готовых байтов (например, JSON ответа) в кэш."""
+        try:
+            redis_client = await self.get_raw_redis()
+            await redis_client.setex(key, expire, value)
+            _redis_ok()
         except Exception as e:
+            _redis_failed('set')
             logger.warning(
                 f"Error setting cached data for key {key}: {str(e)}")
 
@@ -78,7 +144,9 @@ class RedisCache:
                 await redis_client.delete(*keys)
                 logger.info(
                     f"Deleted {len(keys)} keys with pattern: {pattern}")
+            _redis_ok()
         except Exception as e:
+            _redis_failed('delete')
             logger.error(
                 f"Error deleting keys with pattern {pattern}: {str(e)}")
 
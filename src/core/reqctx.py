@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from contextvars import ContextVar
+from contextvars import ContextVar, Token
 from typing import Any, Tuple
 
 _request_id: ContextVar[str | None] = ContextVar(
@@ -8,6 +8,7 @@ _request_id: ContextVar[str | None] = ContextVar(
     default=None,
 )
 _user: ContextVar[Any | None] = ContextVar('user', default=None)
+_accept_encoding: ContextVar[str] = ContextVar('accept_encoding', default='')
 
 
 def set_ctx(request_id: str | None, user: Any | None) -> Tuple:
@@ -33,6 +34,15 @@ def reset_ctx(tokens: Tuple) -> None:
     _user.reset(t2)
 
 
+def set_user(user: Any | None) -> None:
+    """Обновить пользователя в контексте после аутентификации.
+
+    Middleware выставляет контекст до зависимостей FastAPI, поэтому
+    пользователь известен только после `inject_user_into_state`.
+    """
+    _user.set(user)
+
+
 def get_request_id() -> str | None:
     """Вернуть текущий `request_id` из контекста или `None`."""
     return _request_id.get()
@@ -41,3 +51,22 @@ def get_request_id() -> str | None:
 def get_user() -> Any | None:
     """Вернуть текущего пользователя из контекста или `None`."""
     return _user.get()
+
+
+def set_accept_encoding(value: str) -> Token:
+    """Сохранить заголовок Accept-Encoding запроса.
+
+    Нужен кэшу ответов: сжатую запись можно отдать как есть, только
+    если клиент принимает gzip. Токен передаётся в `reset_accept_encoding`.
+    """
+    return _accept_encoding.set(value)
+
+
+def reset_accept_encoding(token: Token) -> None:
+    """Вернуть прежнее значение Accept-Encoding."""
+    _accept_encoding.reset(token)
+
+
+def get_accept_encoding() -> str:
+    """Accept-Encoding текущего запроса; пусто - сжатие не принимается."""
+    return _accept_encoding.get()
@@ -0,0 +1,42 @@
+"""Сериализация ответов из готовых Pydantic-моделей в JSON."""
+from functools import lru_cache
+from typing import Any, Optional
+
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+
+from core.fieldsets import schema_of
+
+
+@lru_cache
+def _adapter(model: type, many: bool) -> TypeAdapter:
+    return TypeAdapter(list[model] if many else model)
+
+
+def dump_json(content: Any, model: Optional[type] = None) -> bytes:
+    """JSON ответа по схеме `model` (с алиасами, как у response_model).
+
+    Экземпляры ровно `model` и её частичных схем (`?fields=`)
+    повторно не валидируются и сериализуются по своей схеме;
+    остальное (ORM-объекты, наследники с лишними полями) сначала
+    приводится к `model`. Без `model` объекты сериализуются по своим
+    схемам.
+    """
+    if model is None:
+        return to_json(content, by_alias=True)
+    many = isinstance(content, list)
+    items = content if many else [content]
+    if all(schema_of(item) is model for item in items):
+        return to_json(content, by_alias=True)
+    adapter = _adapter(model, many)
+    content = adapter.validate_python(content, from_attributes=True)
+    return adapter.dump_json(content, by_alias=True)
+
+
+def json_response(content: Any, model: Optional[type] = None) -> Response:
+    """Ответ с JSON из `dump_json`, FastAPI его повторно не проверяет."""
+    return Response(
+        content=dump_json(content, model),
+        media_type='application/json',
+    )
@@ -6,7 +6,7 @@ from sqlalchemy.orm import selectinload
 
 from models.action import Action
 from models.cafe import Cafe
-from schemas.action import ActionCreate, ActionUpdate
+from schemas.action import ActionCreate, ActionInfo, ActionUpdate
 
 from .base import CRUDBase, audit_event
 
@@ -14,6 +14,8 @@ from .base import CRUDBase, audit_event
 class CRUDActions(CRUDBase[Action, ActionCreate, ActionUpdate]):
     """CRUD-операции для модели Action."""
 
+    response_schema = ActionInfo
+
     async def get(
         self,
         obj_id: int,
@@ -63,10 +65,11 @@ class CRUDActions(CRUDBase[Action, ActionCreate, ActionUpdate]):
                 raise ValueError('Один или несколько кафе не найдены')
             db_action.cafes = cafes
         session.add(db_action)
-        await session.commit()
-        await session.refresh(db_action)
+        await self._commit_for_response(db_action, session)
 
-        audit_event('action', 'created', id=db_action.id)
+        audit_event(
+            'action', 'created', session=session, id=db_action.id,
+        )
 
         return db_action
 
@@ -100,10 +103,9 @@ class CRUDActions(CRUDBase[Action, ActionCreate, ActionUpdate]):
                 db_obj.cafes = cafes
 
         session.add(db_obj)
-        await session.commit()
-        await session.refresh(db_obj)
+        await self._commit_for_response(db_obj, session)
 
-        audit_event('action', 'updated', id=db_obj.id)
+        audit_event('action', 'updated', session=session, id=db_obj.id)
 
         return db_obj
 
@@ -0,0 +1,53 @@
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.audit import AuditEvent
+
+
+class CRUDAudit:
+    """Чтение событий аудита; запись идёт через `core.audit.audit_sink`."""
+
+    def __init__(self) -> None:
+        """Сохранить модель событий аудита."""
+        self.model = AuditEvent
+
+    async def get_multi(
+        self,
+        session: AsyncSession,
+        resource: Optional[str] = None,
+        action: Optional[str] = None,
+        actor_id: Optional[int] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> List[AuditEvent]:
+        """Вернуть события по фильтрам, новые первыми.
+
+        Границы since/until попадают в условие по created_at, поэтому
+        PostgreSQL читает только секции нужных месяцев.
+        """
+        stmt = select(self.model)
+        if resource is not None:
+            stmt = stmt.where(self.model.resource == resource)
+        if action is not None:
+            stmt = stmt.where(self.model.action == action)
+        if actor_id is not None:
+            stmt = stmt.where(self.model.actor_id == actor_id)
+        if since is not None:
+            stmt = stmt.where(self.model.created_at >= since)
+        if until is not None:
+            stmt = stmt.where(self.model.created_at < until)
+        stmt = (
+            stmt.order_by(self.model.created_at.desc(), self.model.id.desc())
+            .limit(limit)
+            .offset(offset)
+        )
+        result = await session.execute(stmt)
+        return list(result.scalars().all())
+
+
+audit_crud = CRUDAudit()
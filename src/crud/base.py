@@ -1,9 +1,23 @@
-from typing import Any, Generic, List, Optional, TypeVar
+from functools import lru_cache
+from typing import (
+    Any,
+    Generic,
+    List,
+    Optional,
+    Sequence,
+    TypeVar,
+    get_args,
+)
 
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import insert, inspect, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import MANYTOONE, load_only, noload, selectinload
+from sqlalchemy.orm.interfaces import ORMOption
 
+from core.audit import audit_sink
+from core.db import after_commit, commit_or_flush
+from core.fieldsets import Fieldset, public_names
 from core.logging import get_user_logger
 from core.reqctx import get_request_id, get_user
 
@@ -12,10 +26,41 @@ CreateSchemaType = TypeVar('CreateSchemaType', bound=BaseModel)
 UpdateSchemaType = TypeVar('UpdateSchemaType', bound=BaseModel)
 
 
-def audit_event(resource: str, action: str, **fields: Any) -> None:
-    """Пишет бизнес-аудит: <resource>.<action> + произвольные поля."""
-    log = get_user_logger(f'app.audit.{resource}', get_user())
+def audit_event(
+    resource: str,
+    action: str,
+    *,
+    session: Optional[AsyncSession] = None,
+    **fields: Any,
+) -> None:
+    """Пишет бизнес-аудит: <resource>.<action> + произвольные поля.
+
+    В приложении событие только ставится в очередь `audit_sink`; без
+    запущенного приёмника (Celery, скрипты) оно пишется в лог. С
+    `session` внутри `uow()` событие уходит только после commit
+    единицы работы и пропадает при её откате.
+    """
+    user = get_user()
     rid = get_request_id()
+    if session is None:
+        _emit_audit(resource, action, fields, user, rid)
+    else:
+        after_commit(
+            session,
+            lambda: _emit_audit(resource, action, fields, user, rid),
+        )
+
+
+def _emit_audit(
+    resource: str,
+    action: str,
+    fields: dict[str, Any],
+    user: Any,
+    rid: Optional[str],
+) -> None:
+    if audit_sink.enqueue(resource, action, fields, user, rid):
+        return
+    log = get_user_logger(f'app.audit.{resource}', user)
     body = ' '.join(f'{k}={v}' for k, v in fields.items())
     if rid:
         body = f'{body} req_id={rid}' if body else 'req_id={rid}'
@@ -38,9 +83,111 @@ def _collect_fk_fields(obj: Any) -> dict[str, Any]:
     return fields
 
 
+def changed_references(db_obj: Any) -> tuple[str, ...]:
+    """Связи many-to-one, внешний ключ которых изменён и не записан.
+
+    Такие связи, уже загруженные в сессию, после коммита указывают на
+    прежний объект. Вызывать до flush: он сбрасывает историю изменений.
+    """
+    state = inspect(db_obj)
+    names = []
+    for relationship in state.mapper.relationships:
+        if relationship.direction is not MANYTOONE:
+            continue
+        if any(
+            state.attrs[
+                state.mapper.get_property_by_column(column).key
+            ].history.has_changes()
+            for column in relationship.local_columns
+        ):
+            names.append(relationship.key)
+    return tuple(names)
+
+
+@lru_cache(maxsize=None)
+def response_relationships(
+    model: type[ModelType],
+    schema: Optional[type[BaseModel]],
+) -> tuple[str, ...]:
+    """Связи модели, которые читает схема ответа (по имени или алиасу)."""
+    if schema is None:
+        return ()
+    relationships = inspect(model).relationships.keys()
+    names = []
+    for name, field in schema.model_fields.items():
+        attr = field.validation_alias or field.alias or name
+        if isinstance(attr, str) and attr in relationships:
+            names.append(attr)
+    return tuple(names)
+
+
+def _nested_schema(annotation: Any) -> Optional[type[BaseModel]]:
+    """Схема вложенного объекта из аннотации (X, List[X], Optional[X])."""
+    for candidate in (annotation, *get_args(annotation)):
+        if isinstance(candidate, type) and issubclass(candidate, BaseModel):
+            return candidate
+    return None
+
+
+@lru_cache(maxsize=None)
+def response_load_options(
+    model: type[ModelType],
+    schema: type[BaseModel],
+    fields: Optional[Fieldset] = None,
+) -> tuple[ORMOption, ...]:
+    """Loader-опции, читающие из БД только поля схемы ответа.
+
+    Колонки ограничиваются через load_only, запрошенные связи грузятся
+    selectinload с теми же правилами для вложенной схемы, остальные
+    связи (в том числе lazy='selectin' в модели) не грузятся. `fields`
+    (`?fields=`) сужает набор полей верхнего уровня.
+    """
+    mapper = inspect(model)
+    names = public_names(schema)
+    attrs = {}
+    for key in fields or names:
+        field = schema.model_fields[names[key]]
+        attr = field.validation_alias or field.alias or names[key]
+        if isinstance(attr, str):
+            attrs[attr] = field
+    columns = [
+        getattr(model, prop.key)
+        for prop in mapper.column_attrs
+        if prop.key in attrs or any(
+            column.primary_key for column in prop.columns
+        )
+    ]
+    options: list[ORMOption] = []
+    for relationship in mapper.relationships:
+        attr = getattr(model, relationship.key)
+        if relationship.key not in attrs:
+            options.append(noload(attr))
+            continue
+        # Внешние ключи нужны selectinload для связей many-to-one.
+        columns.extend(
+            getattr(model, mapper.get_property_by_column(column).key)
+            for column in relationship.local_columns
+            if column.table is mapper.local_table
+        )
+        loader = selectinload(attr)
+        nested = _nested_schema(attrs[relationship.key].annotation)
+        if nested is not None:
+            loader = loader.options(
+                *response_load_options(relationship.mapper.class_, nested),
+            )
+        options.append(loader)
+    return (load_only(*columns), *options)
+
+
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     """Базовый CRUD класс."""
 
+    bulk_load_options: Sequence[ORMOption] = ()
+    """Loader-опции для объектов, возвращаемых массовыми операциями."""
+
+    response_schema: Optional[type[BaseModel]] = None
+    """Схема ответа: после записи догружаются только её связи."""
+
     def __init__(self, model: type[ModelType]) -> None:
         """Сохранить класс ORM-модели, с которой работает CRUD."""
         self.model = model
@@ -65,6 +212,24 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         result = await session.execute(stmt)
         return result.scalars().all()
 
+    async def get_by_ids(
+        self,
+        ids: Sequence[int],
+        session: AsyncSession,
+        options: Sequence[ORMOption] = (),
+    ) -> List[ModelType]:
+        """Вернуть объекты по списку ID одним запросом."""
+        if not ids:
+            return []
+        stmt = (
+            select(self.model)
+            .where(self.model.id.in_(ids))
+            .options(*options)
+            .order_by(self.model.id)
+        )
+        result = await session.execute(stmt)
+        return list(result.scalars().all())
+
     async def create(
         self,
         obj_in: CreateSchemaType,
@@ -77,12 +242,12 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             obj_in_data['user_id'] = user_id
         db_obj = self.model(**obj_in_data)
         session.add(db_obj)
-        await session.commit()
-        await session.refresh(db_obj)
+        await self._commit_for_response(db_obj, session)
 
         audit_event(
             _resource_name(self.model),
             'created',
+            session=session,
             **_collect_fk_fields(db_obj),
         )
         return db_obj
@@ -101,12 +266,12 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
                 setattr(db_obj, field, value)
 
         session.add(db_obj)
-        await session.commit()
-        await session.refresh(db_obj)
+        await self._commit_for_response(db_obj, session)
 
         audit_event(
             _resource_name(self.model),
             'updated',
+            session=session,
             id=getattr(db_obj, 'id', None),
         )
         return db_obj
@@ -124,12 +289,146 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
 
         db_obj.is_active = False
         session.add(db_obj)
-        await session.commit()
-        await session.refresh(db_obj)
+        await self._commit_for_response(db_obj, session)
 
         audit_event(
             _resource_name(self.model),
             'deactivated',
+            session=session,
             id=getattr(db_obj, 'id', None),
         )
         return db_obj
+
+    async def create_many(
+        self,
+        objs_in: Sequence[CreateSchemaType],
+        session: AsyncSession,
+        **extra: Any,
+    ) -> List[ModelType]:
+        """Создать пачку объектов одним INSERT ... RETURNING.
+
+        `extra` добавляется в каждую строку (например, `cafe_id` из URL).
+        Все строки вставляются в одной транзакции, аудит пишется одним
+        событием на всю пачку.
+        """
+        if not objs_in:
+            return []
+        rows = [{**obj_in.model_dump(), **extra} for obj_in in objs_in]
+        stmt = (
+            insert(self.model)
+            .returning(self.model, sort_by_parameter_order=True)
+            .options(*self.bulk_load_options)
+        )
+        result = await session.scalars(stmt, rows)
+        db_objs = list(result.all())
+        await commit_or_flush(session)
+
+        self._audit_bulk('bulk_created', db_objs, session, **extra)
+        return db_objs
+
+    async def update_many(
+        self,
+        ids: Sequence[int],
+        obj_in: UpdateSchemaType,
+        session: AsyncSession,
+    ) -> List[ModelType]:
+        """Обновить объекты с `ids` одним UPDATE ... WHERE id IN (...)."""
+        update_data = {
+            field: value
+            for field, value in obj_in.model_dump(exclude_unset=True).items()
+            if hasattr(self.model, field)
+        }
+        if not update_data:
+            return await self.get_by_ids(ids, session, self.bulk_load_options)
+        db_objs = await self._update_many_values(ids, update_data, session)
+        await commit_or_flush(session)
+
+        self._audit_bulk('bulk_updated', db_objs, session)
+        return db_objs
+
+    async def deactivate_many(
+        self,
+        ids: Sequence[int],
+        session: AsyncSession,
+    ) -> List[ModelType]:
+        """Массовая деактивация объектов одним UPDATE."""
+        if not hasattr(self.model, 'is_active'):
+            raise AttributeError(
+                f'Модель {self.model.__name__} не имеет поля is_active',
+            )
+        db_objs = await self._update_many_values(
+            ids,
+            {'is_active': False},
+            session,
+        )
+        await commit_or_flush(session)
+
+        self._audit_bulk('bulk_deactivated', db_objs, session)
+        return db_objs
+
+    async def _update_many_values(
+        self,
+        ids: Sequence[int],
+        values: dict[str, Any],
+        session: AsyncSession,
+        options: Optional[Sequence[ORMOption]] = None,
+    ) -> List[ModelType]:
+        """Выполнить UPDATE ... RETURNING по списку ID без коммита."""
+        if not ids:
+            return []
+        stmt = (
+            update(self.model)
+            .where(self.model.id.in_(ids))
+            .values(**values)
+            .returning(self.model)
+            .options(
+                *(self.bulk_load_options if options is None else options),
+            )
+        )
+        result = await session.scalars(stmt)
+        return sorted(result.all(), key=lambda obj: obj.id)
+
+    async def _commit_for_response(
+        self,
+        db_obj: ModelType,
+        session: AsyncSession,
+    ) -> None:
+        """Закоммитить запись без повторного SELECT всей строки.
+
+        INSERT/UPDATE уже вернули колонки через RETURNING (eager_defaults),
+        а expire_on_commit=False сохраняет их после коммита. Отдельным
+        запросом догружаются ещё не загруженные связи из
+        `response_schema` и связи, чей внешний ключ изменён в этом
+        обновлении.
+        """
+        changed = changed_references(db_obj)
+        await commit_or_flush(session)
+        unloaded = inspect(db_obj).unloaded
+        names = [
+            name
+            for name in response_relationships(
+                self.model,
+                self.response_schema,
+            )
+            if name in unloaded and name not in changed
+        ]
+        names.extend(changed)
+        if names:
+            await session.refresh(db_obj, attribute_names=names)
+
+    def _audit_bulk(
+        self,
+        action: str,
+        db_objs: Sequence[ModelType],
+        session: AsyncSession,
+        **fields: Any,
+    ) -> None:
+        """Одно агрегированное событие аудита на всю пачку объектов."""
+        audit_event(
+            _resource_name(self.model),
+            action,
+            session=session,
+            count=len(db_objs),
+            ids=','.join(str(getattr(obj, 'id', None)) for obj in db_objs),
+            **fields,
+        )
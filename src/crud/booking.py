@@ -3,25 +3,39 @@ from typing import Optional
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from models.booking import Booking
+from core.db import uow
+from core.fieldsets import Fieldset, partial_schema
+from models.booking import Booking, BookingStatus
+from models.cafe import Cafe
 from models.slots import Slot
 from models.table import Table
 from models.user import User
 from schemas.booking import BookingCreate, BookingUpdate, BookingInfo
 
-from .base import CRUDBase, audit_event
+from .base import CRUDBase, audit_event, response_load_options
+from .notifications import notification_crud
+from .outbox import outbox_crud
 
 
 class CRUDBooking(CRUDBase[Booking, BookingCreate, BookingUpdate]):
     """CRUD для бронирования."""
 
+    response_schema = BookingInfo
+
     async def get_multi_booking(
         self,
         session: AsyncSession,
+        fields: Optional[Fieldset] = None,
         **kwargs: dict,
     ) -> list[BookingInfo]:
-        """Получение всех бронированний с дополнительными параметрами."""
-        query = select(Booking)
+        """Получение всех бронированний с дополнительными параметрами.
+
+        Из БД читаются только поля ответа (или `fields`) и нужные им
+        связи.
+        """
+        query = select(Booking).options(
+            *response_load_options(self.model, self.response_schema, fields),
+        )
         show_all = kwargs.pop('show_all', False)
         if not show_all:
             query = query.where(Booking.is_active)
@@ -30,36 +44,59 @@ class CRUDBooking(CRUDBase[Booking, BookingCreate, BookingUpdate]):
                 query = query.where(getattr(self.model, field) == value)
         result = await session.execute(query)
         bookings_db = result.scalars().all()
+        schema = partial_schema(BookingInfo, fields)
         return [
-            BookingInfo.model_validate(
+            schema.model_validate(
                 booking, from_attributes=True
             ) for booking in bookings_db]
 
-    async def get_booking_current_user(
+    async def get_booking(
         self,
         booking_id: int,
-        user: User,
         session: AsyncSession,
-    ) -> BookingInfo:
-        """Получение бронирования для конкретного юзера."""
+        fields: Optional[Fieldset] = None,
+        **filters: int,
+    ) -> Optional[BookingInfo]:
+        """Бронирование для ответа API с условиями `filters` или None."""
         query = await session.execute(
-            select(Booking).where(
-                Booking.id == booking_id,
-                Booking.user_id == user.id,
-            ),
+            select(Booking)
+            .options(
+                *response_load_options(
+                    self.model, self.response_schema, fields,
+                ),
+            )
+            .where(Booking.id == booking_id)
+            .filter_by(**filters),
         )
         booking_db = query.scalars().first()
         if booking_db:
-            return BookingInfo.model_validate(booking_db, from_attributes=True)
+            return partial_schema(BookingInfo, fields).model_validate(
+                booking_db, from_attributes=True,
+            )
         return None
 
+    async def get_booking_current_user(
+        self,
+        booking_id: int,
+        user: User,
+        session: AsyncSession,
+        fields: Optional[Fieldset] = None,
+    ) -> BookingInfo:
+        """Получение бронирования для конкретного юзера."""
+        return await self.get_booking(
+            booking_id, session, fields, user_id=user.id,
+        )
+
     async def create_booking(
         self,
         obj_in: BookingCreate,
         user_id: Optional[int] = None,
         session: AsyncSession = None,
     ) -> BookingInfo:
-        """Создать бронирование с обработкой отношений."""
+        """Создать бронирование с обработкой отношений.
+
+        Уведомление о бронировании пишется в outbox той же транзакцией.
+        """
         slots = await session.execute(
             select(Slot).where(Slot.id.in_(obj_in.slots_id)),
         )
@@ -74,13 +111,20 @@ class CRUDBooking(CRUDBase[Booking, BookingCreate, BookingUpdate]):
         db_obj = self.model(**obj_in_data)
         db_obj.slots_id = slots_objs
         db_obj.tables_id = tables_objs
-        session.add(db_obj)
-        await session.commit()
-        await session.refresh(db_obj)
+        async with uow(session):
+            session.add(db_obj)
+            await session.flush()
+            outbox_crud.add(
+                session,
+                'send_booking_notification',
+                booking_id=db_obj.id,
+            )
+            await self._commit_for_response(db_obj, session)
 
         audit_event(
             'booking',
             'created',
+            session=session,
             id=(
                 getattr(db_obj, 'id', None)
                 or getattr(db_obj, 'booking_id', None)
@@ -90,5 +134,52 @@ class CRUDBooking(CRUDBase[Booking, BookingCreate, BookingUpdate]):
 
         return BookingInfo.model_validate(db_obj, from_attributes=True)
 
+    async def update(
+        self,
+        db_obj: Booking,
+        obj_in: BookingUpdate,
+        session: AsyncSession,
+    ) -> Booking:
+        """Обновить бронирование и его отложенные напоминания.
+
+        Слоты и столы из `obj_in` заменяют связи брони. При отмене
+        напоминания снимаются, при смене даты или слотов -
+        пересчитываются в той же транзакции.
+        """
+        relations = obj_in.model_dump(
+            include={'slots_id', 'tables_id'}, exclude_none=True,
+        )
+        fields = obj_in.model_dump(
+            exclude_unset=True, exclude={'slots_id', 'tables_id'},
+        )
+        rescheduled = (
+            'slots_id' in relations
+            or fields.get('booking_date', db_obj.booking_date)
+            != db_obj.booking_date
+        )
+        async with uow(session):
+            if 'slots_id' in relations:
+                db_obj.slots_id = list(await session.scalars(
+                    select(Slot).where(Slot.id.in_(relations['slots_id'])),
+                ))
+            if 'tables_id' in relations:
+                db_obj.tables_id = list(await session.scalars(
+                    select(Table).where(Table.id.in_(relations['tables_id'])),
+                ))
+            db_obj = await super().update(
+                db_obj, BookingUpdate.model_construct(**fields), session,
+            )
+            if (
+                not db_obj.is_active
+                or db_obj.status == BookingStatus.CANCELLED
+            ):
+                await notification_crud.cancel_for_booking(db_obj.id, session)
+            elif rescheduled:
+                cafe = await session.get(Cafe, db_obj.cafe_id)
+                await notification_crud.reschedule_for_booking(
+                    db_obj, cafe.name, session,
+                )
+        return db_obj
+
 
 booking_crud = CRUDBooking(Booking)
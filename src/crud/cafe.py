@@ -1,19 +1,22 @@
-from typing import Any, List
+from typing import Any, List, Optional
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from core.fieldsets import Fieldset
 from models.cafe import Cafe
 from models.user import User
-from schemas.cafe import CafeCreate, CafeUpdate
+from schemas.cafe import CafeCreate, CafeInfo, CafeUpdate
 
-from .base import CRUDBase, audit_event
+from .base import CRUDBase, audit_event, response_load_options
 
 
 class CRUDCafe(CRUDBase[Cafe, CafeCreate, CafeUpdate]):
     """CRUD-операции для модели Cafe."""
 
+    response_schema = CafeInfo
+
     async def get_by_name_and_address(
         self,
         session: AsyncSession,
@@ -29,11 +32,26 @@ class CRUDCafe(CRUDBase[Cafe, CafeCreate, CafeUpdate]):
         result = await session.execute(query)
         return result.scalar_one_or_none()
 
-    async def get(self, obj_id: int, session: AsyncSession) -> Cafe | None:
-        """Получение кафе с загрузкой связанных менеджеров."""
+    async def get(
+        self,
+        obj_id: int,
+        session: AsyncSession,
+        fields: Optional[Fieldset] = None,
+    ) -> Cafe | None:
+        """Получение кафе с загрузкой связанных менеджеров.
+
+        С `fields` читаются только эти поля ответа: объект годится лишь
+        для выдачи клиенту.
+        """
+        if fields is None:
+            options = (selectinload(self.model.managers),)
+        else:
+            options = response_load_options(
+                self.model, self.response_schema, fields,
+            )
         query = (
             select(self.model)
-            .options(selectinload(self.model.managers))
+            .options(*options)
             .where(self.model.id == obj_id)
         )
         result = await session.execute(query)
@@ -42,10 +60,20 @@ class CRUDCafe(CRUDBase[Cafe, CafeCreate, CafeUpdate]):
     async def get_multi(
         self,
         session: AsyncSession,
+        only_active: bool = False,
+        fields: Optional[Fieldset] = None,
         **kwargs: Any,
     ) -> List[Cafe]:
-        """Получение всех кафе с загрузкой связанных менеджеров."""
-        query = select(self.model).options(selectinload(self.model.managers))
+        """Получение кафе для ответа API.
+
+        Читаются только поля схемы ответа (или `fields`), менеджеры -
+        если они в неё входят.
+        """
+        query = select(self.model).options(
+            *response_load_options(self.model, self.response_schema, fields),
+        )
+        if only_active:
+            query = query.where(self.model.is_active.is_(True))
         result = await session.execute(query)
         return result.scalars().all()
 
@@ -66,10 +94,9 @@ class CRUDCafe(CRUDBase[Cafe, CafeCreate, CafeUpdate]):
             db_cafe.managers = managers
 
         session.add(db_cafe)
-        await session.commit()
-        await session.refresh(db_cafe)
+        await self._commit_for_response(db_cafe, session)
 
-        audit_event('cafe', 'created', id=db_cafe.id)
+        audit_event('cafe', 'created', session=session, id=db_cafe.id)
 
         return db_cafe
 
@@ -107,10 +134,9 @@ class CRUDCafe(CRUDBase[Cafe, CafeCreate, CafeUpdate]):
                 db_obj.managers = managers
 
         session.add(db_obj)
-        await session.commit()
-        await session.refresh(db_obj)
+        await self._commit_for_response(db_obj, session)
 
-        audit_event('cafe', 'updated', id=db_obj.id)
+        audit_event('cafe', 'updated', session=session, id=db_obj.id)
 
         return db_obj
 
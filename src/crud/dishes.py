@@ -1,17 +1,26 @@
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import delete, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import noload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
+from core.db import commit_or_flush
 from crud.base import CRUDBase
 from models.cafe import Cafe
 from models.dish import Dish
-from schemas.dish import DishCreate, DishUpdate
+from models.relations import cafe_dishes
+from schemas.dish import DishCreate, DishInfo, DishUpdate
+
+_BULK_NOLOAD = (noload(Dish.cafes), noload(Dish.bookings))
 
 
 class CRUDDish(CRUDBase[Dish, DishCreate, DishUpdate]):
     """CRUD для блюд."""
 
+    bulk_load_options = (selectinload(Dish.cafes), noload(Dish.bookings))
+    response_schema = DishInfo
+
     async def get_dishes(
         self,
         session: AsyncSession,
@@ -44,8 +53,7 @@ class CRUDDish(CRUDBase[Dish, DishCreate, DishUpdate]):
 
         db_obj = self.model(**obj_in_data, cafes=cafes)
         session.add(db_obj)
-        await session.commit()
-        await session.refresh(db_obj)
+        await self._commit_for_response(db_obj, session)
         return db_obj
 
     async def update(
@@ -66,9 +74,103 @@ class CRUDDish(CRUDBase[Dish, DishCreate, DishUpdate]):
             if hasattr(db_obj, field):
                 setattr(db_obj, field, value)
         session.add(db_obj)
-        await session.commit()
-        await session.refresh(db_obj)
+        await self._commit_for_response(db_obj, session)
         return db_obj
 
+    async def create_many(
+        self,
+        objs_in: Sequence[DishCreate],
+        session: AsyncSession,
+    ) -> List[Dish]:
+        """Массовое создание блюд с привязкой к кафе.
+
+        Блюда вставляются одним INSERT ... RETURNING, связи с кафе -
+        одним многострочным INSERT в `cafe_dishes`.
+        """
+        if not objs_in:
+            return []
+        rows = [obj_in.model_dump(exclude={'cafes_id'}) for obj_in in objs_in]
+        result = await session.scalars(
+            insert(self.model)
+            .returning(self.model, sort_by_parameter_order=True)
+            .options(*_BULK_NOLOAD),
+            rows,
+        )
+        db_objs = list(result.all())
+        await self._link_cafes(
+            db_objs,
+            [obj_in.cafes_id for obj_in in objs_in],
+            session,
+        )
+        await commit_or_flush(session)
+
+        self._audit_bulk('bulk_created', db_objs, session)
+        return db_objs
+
+    async def update_many(
+        self,
+        ids: Sequence[int],
+        obj_in: DishUpdate,
+        session: AsyncSession,
+    ) -> List[Dish]:
+        """Массовое обновление блюд с заменой списка кафе."""
+        update_data = obj_in.model_dump(exclude_unset=True)
+        cafe_ids = update_data.pop('cafes_id', None)
+        if cafe_ids is None:
+            return await super().update_many(ids, obj_in, session)
+
+        if update_data:
+            db_objs = await self._update_many_values(
+                ids,
+                update_data,
+                session,
+                options=_BULK_NOLOAD,
+            )
+        else:
+            db_objs = await self.get_by_ids(ids, session, _BULK_NOLOAD)
+        await session.execute(
+            delete(cafe_dishes).where(cafe_dishes.c.dish_id.in_(ids)),
+        )
+        await self._link_cafes(
+            db_objs,
+            [cafe_ids] * len(db_objs),
+            session,
+        )
+        await commit_or_flush(session)
+
+        self._audit_bulk('bulk_updated', db_objs, session)
+        return db_objs
+
+    async def _link_cafes(
+        self,
+        db_objs: Sequence[Dish],
+        cafe_ids_per_dish: Sequence[List[int]],
+        session: AsyncSession,
+    ) -> None:
+        """Вставить связи блюдо-кафе одним запросом и проставить `cafes`."""
+        all_cafe_ids = {
+            cafe_id for cafe_ids in cafe_ids_per_dish for cafe_id in cafe_ids
+        }
+        cafes_by_id: Dict[int, Cafe] = {}
+        if all_cafe_ids:
+            result = await session.execute(
+                select(Cafe).where(Cafe.id.in_(all_cafe_ids)),
+            )
+            cafes_by_id = {cafe.id: cafe for cafe in result.scalars().all()}
+
+        rows = []
+        for db_obj, cafe_ids in zip(db_objs, cafe_ids_per_dish):
+            cafes = [
+                cafes_by_id[cafe_id]
+                for cafe_id in dict.fromkeys(cafe_ids)
+                if cafe_id in cafes_by_id
+            ]
+            rows.extend(
+                {'dish_id': db_obj.id, 'cafe_id': cafe.id} for cafe in cafes
+            )
+            set_committed_value(db_obj, 'cafes', cafes)
+        if rows:
+            await session.execute(insert(cafe_dishes), rows)
+
 
 dish_crud = CRUDDish(Dish)
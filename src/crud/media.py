@@ -0,0 +1,64 @@
+import uuid
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.db import commit_or_flush
+from models.media import MediaFile
+
+from .base import audit_event
+
+
+class CRUDMedia:
+    """Индекс загруженных изображений по хэшу содержимого."""
+
+    def __init__(self) -> None:
+        """Сохранить модель индекса."""
+        self.model = MediaFile
+
+    async def get_by_hash(
+        self,
+        sha256: str,
+        session: AsyncSession,
+    ) -> Optional[MediaFile]:
+        """Вернуть запись по хэшу содержимого или None."""
+        return await session.scalar(
+            select(self.model).where(self.model.sha256 == sha256),
+        )
+
+    async def register(
+        self,
+        sha256: str,
+        size: int,
+        session: AsyncSession,
+    ) -> tuple[uuid.UUID, bool]:
+        """Вернуть media_id для содержимого и признак новой записи.
+
+        Для уже известного хэша продлевается отсрочка сборки мусора
+        (updated_at), чтобы выданный id не удалили до привязки. Гонку
+        двух одинаковых загрузок разрешает уникальный индекс по sha256.
+        """
+        existing = await self.get_by_hash(sha256, session)
+        if existing is None:
+            media = self.model(media_id=uuid.uuid4(), sha256=sha256, size=size)
+            try:
+                async with session.begin_nested():
+                    session.add(media)
+            except IntegrityError:
+                existing = await self.get_by_hash(sha256, session)
+            else:
+                await commit_or_flush(session)
+                audit_event(
+                    'media', 'created',
+                    session=session, media_id=media.media_id,
+                )
+                return media.media_id, True
+        existing.updated_at = datetime.now(timezone.utc)
+        await commit_or_flush(session)
+        return existing.media_id, False
+
+
+media_crud = CRUDMedia()
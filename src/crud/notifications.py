@@ -0,0 +1,88 @@
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.constants import BOOKING_REMINDER_KIND
+from core.db import commit_or_flush
+from core.notifications import booking_confirmation_body, reminder_due_at
+from models.booking import Booking
+from models.notification import ScheduledNotification
+
+from .base import audit_event
+
+
+class CRUDNotification:
+    """Операции с отложенными уведомлениями со стороны API."""
+
+    def __init__(self) -> None:
+        """Сохранить модель отложенных уведомлений."""
+        self.model = ScheduledNotification
+
+    async def cancel_for_booking(
+        self,
+        booking_id: int,
+        session: AsyncSession,
+    ) -> int:
+        """Отменить ещё не отправленные уведомления бронирования.
+
+        Отмена - обычный UPDATE строки: диспетчер такие строки больше
+        не выбирает. Возвращает число отменённых уведомлений.
+        """
+        result = await session.execute(
+            update(self.model)
+            .where(
+                self.model.booking_id == booking_id,
+                self.model.is_active.is_(True),
+                self.model.dispatched_at.is_(None),
+            )
+            .values(is_active=False),
+        )
+        await commit_or_flush(session)
+        if result.rowcount:
+            audit_event(
+                'scheduled_notifications',
+                'cancelled',
+                session=session,
+                booking_id=booking_id,
+                count=result.rowcount,
+            )
+        return result.rowcount
+
+    async def reschedule_for_booking(
+        self,
+        booking: Booking,
+        cafe_name: str,
+        session: AsyncSession,
+    ) -> int:
+        """Пересчитать неотправленные напоминания перенесённой брони.
+
+        Время и текст берутся из текущих даты и слотов `booking`.
+        Возвращает число обновлённых уведомлений.
+        """
+        result = await session.execute(
+            update(self.model)
+            .where(
+                self.model.booking_id == booking.id,
+                self.model.kind == BOOKING_REMINDER_KIND,
+                self.model.is_active.is_(True),
+                self.model.dispatched_at.is_(None),
+            )
+            .values(
+                due_at=reminder_due_at(booking.booking_date, booking.slots_id),
+                body=booking_confirmation_body(
+                    booking.booking_date, cafe_name, booking.slots_id,
+                ),
+            ),
+        )
+        await commit_or_flush(session)
+        if result.rowcount:
+            audit_event(
+                'scheduled_notifications',
+                'rescheduled',
+                session=session,
+                booking_id=booking.id,
+                count=result.rowcount,
+            )
+        return result.rowcount
+
+
+notification_crud = CRUDNotification()
@@ -0,0 +1,31 @@
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.outbox import OutboxEvent
+
+
+class CRUDOutbox:
+    """Запись событий в transactional outbox."""
+
+    def __init__(self) -> None:
+        """Сохранить модель outbox."""
+        self.model = OutboxEvent
+
+    def add(
+        self,
+        session: AsyncSession,
+        task: str,
+        **payload: Any,
+    ) -> OutboxEvent:
+        """Добавить событие в текущую транзакцию сессии без коммита.
+
+        Строка фиксируется вместе с бизнес-изменением; если транзакция
+        откатится, задача не будет опубликована.
+        """
+        event = self.model(task=task, payload=payload)
+        session.add(event)
+        return event
+
+
+outbox_crud = CRUDOutbox()
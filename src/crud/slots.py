@@ -1,14 +1,18 @@
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import noload
 
 from crud.base import CRUDBase
 from models.slots import Slot
-from schemas.slots import TimeSlotCreate, TimeSlotUpdate
+from schemas.slots import TimeSlotCreate, TimeSlotInfo, TimeSlotUpdate
 
 
 class CRUDSlot(CRUDBase[Slot, TimeSlotCreate, TimeSlotUpdate]):
     """CRUD для временных слотов."""
 
+    bulk_load_options = (noload(Slot.cafe), noload(Slot.bookings))
+    response_schema = TimeSlotInfo
+
     async def get_by_cafe(
         self,
         cafe_id: int,
@@ -33,8 +37,7 @@ class CRUDSlot(CRUDBase[Slot, TimeSlotCreate, TimeSlotUpdate]):
         obj_in_data['cafe_id'] = cafe_id
         db_obj = self.model(**obj_in_data)
         session.add(db_obj)
-        await session.commit()
-        await session.refresh(db_obj)
+        await self._commit_for_response(db_obj, session)
         return db_obj
 
 
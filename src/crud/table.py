@@ -5,7 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from models.table import Table
-from schemas.table import TableCreate, TableUpdate
+from schemas.table import TableCreate, TableInfo, TableUpdate
 
 from .base import CRUDBase, audit_event
 
@@ -13,6 +13,9 @@ from .base import CRUDBase, audit_event
 class CRUDTable(CRUDBase[Table, TableCreate, TableUpdate]):
     """CRUD-операции для модели Table с поддержкой загрузки кафе."""
 
+    bulk_load_options = (selectinload(Table.cafe),)
+    response_schema = TableInfo
+
     async def create(
         self,
         obj_in: TableCreate,
@@ -30,10 +33,12 @@ class CRUDTable(CRUDBase[Table, TableCreate, TableUpdate]):
         db_obj = self.model(**obj_in_data)
 
         session.add(db_obj)
-        await session.commit()
-        await session.refresh(db_obj)
+        await self._commit_for_response(db_obj, session)
 
-        audit_event('table', 'created', id=db_obj.id, cafe_id=db_obj.cafe_id)
+        audit_event(
+            'table', 'created',
+            session=session, id=db_obj.id, cafe_id=db_obj.cafe_id,
+        )
 
         return db_obj
 
@@ -80,10 +85,9 @@ class CRUDTable(CRUDBase[Table, TableCreate, TableUpdate]):
                 setattr(db_obj, field, value)
 
         session.add(db_obj)
-        await session.commit()
-        await session.refresh(db_obj)
+        await self._commit_for_response(db_obj, session)
 
-        audit_event('table', 'updated', id=db_obj.id)
+        audit_event('table', 'updated', session=session, id=db_obj.id)
 
         return db_obj
 
@@ -1,12 +1,13 @@
 from typing import List
 
-from sqlalchemy import select
+from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.security import hash_password
 from crud.base import CRUDBase
+from models.relations import cafe_managers
 from models.user import User
-from schemas.user import UserCreate, UserUpdate
+from schemas.user import UserCreate, UserInfo, UserUpdate
 from services.users import apply_user_update
 
 from .base import audit_event
@@ -15,6 +16,8 @@ from .base import audit_event
 class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
     """CRUD для пользователей с логикой пароля и флагов."""
 
+    response_schema = UserInfo
+
     async def list_all(
         self,
         session: AsyncSession,
@@ -43,10 +46,12 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             password_hash=hash_password(obj_in.password),
         )
         session.add(db_obj)
-        await session.commit()
-        await session.refresh(db_obj)
+        await self._commit_for_response(db_obj, session)
 
-        audit_event('user', 'created', id=db_obj.id, role=db_obj.role)
+        audit_event(
+            'user', 'created',
+            session=session, id=db_obj.id, role=db_obj.role,
+        )
 
         return db_obj
 
@@ -56,13 +61,23 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         obj_in: UserUpdate,
         session: AsyncSession,
     ) -> User:
-        """Частичное обновление через apply_user_update."""
+        """Частичное обновление через apply_user_update.
+
+        При включении дайджеста его окно начинается с текущего момента,
+        а не с отметки до прошлого отключения.
+        """
+        opted_in = obj_in.booking_digest is True and not db_obj.booking_digest
         apply_user_update(db_obj, obj_in)
         session.add(db_obj)
-        await session.commit()
-        await session.refresh(db_obj)
+        if opted_in:
+            await session.execute(
+                update(cafe_managers)
+                .where(cafe_managers.c.user_id == db_obj.id)
+                .values(digest_sent_at=func.now()),
+            )
+        await self._commit_for_response(db_obj, session)
 
-        audit_event('user', 'updated', id=db_obj.id)
+        audit_event('user', 'updated', session=session, id=db_obj.id)
 
         return db_obj
 
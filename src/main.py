@@ -5,10 +5,15 @@ from fastapi import Depends, FastAPI
 from fastapi.responses import Response
 
 from api import api_router
-from api.deps import inject_user_into_state
+from api.deps import allow_profiling, inject_user_into_state
 from api.exceptions import install as install_exception_handlers
+from core.audit import audit_sink
 from core.config import settings
 from core.logging import get_logger, setup_logging
+from core.metrics import mark_process_dead, render_metrics
+from middleware.compression import CompressionMiddleware
+from middleware.metrics import MetricsMiddleware
+from middleware.profiling import ProfilingMiddleware
 from middleware.request_logging import RequestLoggingMiddleware
 
 
@@ -22,21 +27,30 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     except Exception:
         tail = '<unparsed>'
     log.info(f'db_url_tail={tail}')
+    audit_sink.start()
     log.info('service started')
     try:
         yield
     finally:
+        await audit_sink.stop()
+        mark_process_dead()
         log.info('service shutdown')
 
 
 app = FastAPI(
     title='Booking Cafe API',
     lifespan=lifespan,
-    dependencies=[Depends(inject_user_into_state)],
+    dependencies=[
+        Depends(inject_user_into_state),
+        Depends(allow_profiling),
+    ],
 )
 """Основное приложение FastAPI."""
 
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(CompressionMiddleware)
 app.add_middleware(RequestLoggingMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 install_exception_handlers(app)
 
@@ -53,6 +67,13 @@ def favicon() -> Response:
     return Response(status_code=204)
 
 
+@app.get('/metrics', include_in_schema=False)
+def metrics() -> Response:
+    """Метрики Prometheus всех процессов сервиса."""
+    content, media_type = render_metrics()
+    return Response(content=content, media_type=media_type)
+
+
 app.include_router(api_router)
 """Подключение всех маршрутов API."""
 
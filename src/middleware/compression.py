@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.compression import (
+    BrotliEncoder,
+    GzipEncoder,
+    compress,
+    is_compressible,
+    negotiate_encoding,
+    new_encoder,
+)
+from core.config import settings
+from core.reqctx import reset_accept_encoding, set_accept_encoding
+
+# Статусы без тела или с частью тела: сжимать нельзя.
+_SKIP_STATUSES = frozenset({204, 206, 304})
+
+
+class CompressionMiddleware:
+    """Сжимает ответы gzip или brotli по Accept-Encoding клиента.
+
+    Сжимаются только типы из COMPRESSIBLE_CONTENT_TYPES (картинки
+    /media уже сжаты и идут как есть) не короче `minimum_size` байт,
+    и только если приложение не выставило Content-Encoding само
+    (например, сжатая запись кэша). Ответ из одной порции сжимается
+    целиком, потоковый - по порциям, без буферизации всего тела.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = settings.COMPRESSION_MIN_SIZE,
+    ) -> None:
+        """Инициализирует middleware.
+
+        Args:
+            app: ASGI-приложение.
+            minimum_size: ответы короче (байт) не сжимаются.
+
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        """Передаёт запрос дальше, сжимая ответ на лету."""
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        accept_encoding = Headers(scope=scope).get('accept-encoding', '')
+        token = set_accept_encoding(accept_encoding)
+        responder = _CompressingSend(
+            send, negotiate_encoding(accept_encoding), self.minimum_size,
+        )
+        try:
+            await self.app(scope, receive, responder)
+        finally:
+            reset_accept_encoding(token)
+
+
+class _CompressingSend:
+    """`send` ответа: откладывает начало ответа до первой порции тела."""
+
+    def __init__(
+        self,
+        send: Send,
+        encoding: Optional[str],
+        minimum_size: int,
+    ) -> None:
+        self.send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.start: Optional[Message] = None
+        self.encoder: Optional[GzipEncoder | BrotliEncoder] = None
+        self.passthrough = False
+
+    async def __call__(self, message: Message) -> None:
+        if message['type'] == 'http.response.start':
+            await self._on_start(message)
+        elif message['type'] != 'http.response.body' or self.passthrough:
+            await self.send(message)
+        else:
+            await self._on_body(message)
+
+    async def _on_start(self, message: Message) -> None:
+        headers = MutableHeaders(scope=message)
+        if (
+            message['status'] in _SKIP_STATUSES
+            or 'content-encoding' in headers
+            or 'no-transform' in headers.get('cache-control', '')
+            or not is_compressible(headers.get('content-type'))
+        ):
+            self.passthrough = True
+            await self.send(message)
+            return
+        if 'accept-encoding' not in headers.get('vary', '').lower():
+            headers.add_vary_header('Accept-Encoding')
+        length = headers.get('content-length')
+        if self.encoding is None or (
+            length is not None and int(length) < self.minimum_size
+        ):
+            self.passthrough = True
+            await self.send(message)
+            return
+        self.start = message
+
+    async def _on_body(self, message: Message) -> None:
+        body = message.get('body', b'')
+        more_body = message.get('more_body', False)
+        if self.encoder is not None:
+            message['body'] = (
+                self.encoder.compress(body)
+                if more_body
+                else self.encoder.finish(body)
+            )
+            await self.send(message)
+            return
+        headers = MutableHeaders(scope=self.start)
+        if not more_body:
+            if len(body) >= self.minimum_size:
+                message['body'] = compress(body, self.encoding)
+                headers['Content-Encoding'] = self.encoding
+                headers['Content-Length'] = str(len(message['body']))
+            await self.send(self.start)
+            await self.send(message)
+            return
+        headers['Content-Encoding'] = self.encoding
+        del headers['Content-Length']
+        self.encoder = new_encoder(self.encoding)
+        message['body'] = self.encoder.compress(body)
+        await self.send(self.start)
+        await self.send(message)
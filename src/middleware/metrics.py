@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.constants import UNMATCHED_ROUTE
+from core.metrics import HTTP_REQUEST_DURATION
+
+
+class MetricsMiddleware:
+    """Гистограмма времени HTTP-запросов по маршруту и статусу.
+
+    Маршрут берётся шаблоном (`/cafes/{cafe_id}`), а не фактическим
+    путём, чтобы число рядов не росло с числом объектов. Запросы без
+    маршрута (404 роутера) попадают в UNMATCHED_ROUTE. Время считается
+    до отправки последнего байта ответа.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Инициализирует middleware."""
+        self.app = app
+
+    async def __call__(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        """Передаёт запрос дальше и записывает время и статус ответа."""
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = getattr(scope.get('route'), 'path', UNMATCHED_ROUTE)
+            HTTP_REQUEST_DURATION.labels(
+                scope['method'], route, str(status),
+            ).observe(time.perf_counter() - started)
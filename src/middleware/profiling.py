@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import anyio.to_thread
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.constants import PROFILE_INTERVAL, PROFILE_REPORT_HEADER
+from core.logging import get_logger
+from core.profiling import (
+    Profiler,
+    profile_allowed,
+    requested_format,
+    save_report,
+)
+
+logger = get_logger(__name__)
+
+
+class ProfilingMiddleware:
+    """Профилирует запросы с флагом X-Profile или `?profile=`.
+
+    Сэмплирующий профилировщик запускается только для запросов с
+    флагом, остальные платят лишь за проверку заголовка. Право на
+    профилирование проверяет зависимость `allow_profiling`; если она
+    его не дала, профиль выбрасывается. Замер идёт до начала ответа,
+    отчёт сохраняется в PROFILE_DIR, а путь к нему - в заголовке
+    X-Profile-Report.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Инициализирует middleware."""
+        self.app = app
+
+    async def __call__(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        """Передаёт запрос дальше, при флаге - под профилировщиком."""
+        fmt = requested_format(scope) if scope['type'] == 'http' else None
+        if fmt is None or Profiler is None:
+            await self.app(scope, receive, send)
+            return
+
+        profiler = Profiler(interval=PROFILE_INTERVAL, async_mode='enabled')
+
+        async def send_wrapper(message: Message) -> None:
+            if (
+                message['type'] == 'http.response.start'
+                and profiler.is_running
+            ):
+                profiler.stop()
+                if profile_allowed(scope):
+                    name = await anyio.to_thread.run_sync(
+                        save_report, profiler, scope, fmt,
+                    )
+                    logger.info('profile saved %s', name)
+                    MutableHeaders(scope=message)[PROFILE_REPORT_HEADER] = (
+                        f'/profiles/{name}'
+                    )
+            await send(message)
+
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if profiler.is_running:
+                profiler.stop()
@@ -3,20 +3,24 @@ from __future__ import annotations
 import logging
 import time
 import uuid
-from typing import Callable, Optional
+from typing import Any, Optional
 
 from sqlalchemy.orm.exc import DetachedInstanceError
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
-from starlette.types import ASGIApp
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from core.logging import get_logger, get_user_logger
 from core.reqctx import reset_ctx, set_ctx
 
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    """Логирует каждый HTTP-запрос/ответ в единый лог проекта."""
+class RequestLoggingMiddleware:
+    """Логирует каждый HTTP-запрос/ответ в единый лог проекта.
+
+    Чистый ASGI-middleware: не создаёт отдельной задачи и потока на
+    ответ, поэтому не мешает потоковым ответам (FileResponse и т.п.).
+    Статус и время до первого байта снимаются с сообщения
+    `http.response.start`.
+    """
 
     def __init__(self, app: ASGIApp, logger_name: str = 'api') -> None:
         """Инициализирует middleware.
@@ -26,65 +30,98 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
             logger_name: имя базового логгера для сообщений без user-контекста.
 
         """
-        super().__init__(app)
+        self.app = app
         self._base_logger = get_logger(logger_name)
 
-    async def dispatch(
+    async def __call__(
         self,
-        request: Request,
-        call_next: Callable,
-    ) -> Response:
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> None:
         """Обрабатывает запрос, логируя запрос/ответ и время выполнения.
 
         Формирует/проставляет X-Request-ID, пишет access-лог (info на успех,
-        exception на ошибку) и возвращает ответ.
+        exception на ошибку) с общим временем и временем до первого байта.
         """
-        req_id = request.headers.get('X-Request-ID') or str(uuid.uuid4())
-        request.state.request_id = req_id
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        req_id = headers.get('x-request-id') or str(uuid.uuid4())
+        state = scope.setdefault('state', {})
+        state['request_id'] = req_id
 
-        user = getattr(request.state, 'user', None)
-        tokens = set_ctx(req_id, user)
+        tokens = set_ctx(req_id, state.get('user'))
 
-        ip = request.client.host if request.client else '-'
-        ua = request.headers.get('user-agent', '-')
-        method = request.method
-        path = request.url.path
+        client = scope.get('client')
+        ip = client[0] if client else '-'
+        ua = headers.get('user-agent', '-')
+        method = scope['method']
+        path = scope['path']
 
+        status: Optional[int] = None
+        ttfb_ms: Optional[int] = None
         started = time.perf_counter()
 
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, ttfb_ms
+            if message['type'] == 'http.response.start':
+                status = message['status']
+                ttfb_ms = int((time.perf_counter() - started) * 1000)
+                MutableHeaders(scope=message).setdefault(
+                    'X-Request-ID',
+                    req_id,
+                )
+            await send(message)
+
         try:
-            response: Response = await call_next(request)
-            status = response.status_code
+            await self.app(scope, receive, send_wrapper)
         except Exception as exc:
-            logger = self._logger_with_user(request)
-            status_for_log = getattr(exc, 'status_code', 500)
-            duration_ms = int((time.perf_counter() - started) * 1000)
-            msg = (
-                f'HTTP {method} {path} -> {status_for_log} '
-                f'[{duration_ms}ms; req_id={req_id}; ip={ip}; ua={ua}]'
+            status_for_log = status or getattr(exc, 'status_code', 500)
+            self._logger_with_user(state).exception(
+                self._format(
+                    method, path, status_for_log, started, ttfb_ms,
+                    req_id, ip, ua,
+                ),
             )
-            logger.exception(msg)
             raise
         finally:
             reset_ctx(tokens)
 
+        self._logger_with_user(state).info(
+            self._format(
+                method, path, status, started, ttfb_ms, req_id, ip, ua,
+            ),
+        )
+
+    @staticmethod
+    def _format(
+        method: str,
+        path: str,
+        status: Optional[int],
+        started: float,
+        ttfb_ms: Optional[int],
+        req_id: str,
+        ip: str,
+        ua: str,
+    ) -> str:
+        """Строка access-лога."""
         duration_ms = int((time.perf_counter() - started) * 1000)
-        logger = self._logger_with_user(request)
-        msg = (
+        ttfb = '-' if ttfb_ms is None else f'{ttfb_ms}ms'
+        return (
             f'HTTP {method} {path} -> {status} '
-            f'[{duration_ms}ms; req_id={req_id}; ip={ip}; ua={ua}]'
+            f'[{duration_ms}ms; ttfb={ttfb}; req_id={req_id}; '
+            f'ip={ip}; ua={ua}]'
         )
-        logger.info(msg)
-
-        response.headers.setdefault('X-Request-ID', req_id)
-        return response
 
-    def _logger_with_user(self, request: Request) -> logging.Logger:
+    def _logger_with_user(self, state: dict[str, Any]) -> logging.Logger:
         """Возвращает логгер с user-контекстом, если он есть в state."""
         user: Optional[object] = (
-            getattr(request.state, 'user', None)
-            or getattr(request.state, 'current_user', None)
-            or getattr(request.state, 'actor', None)
+            state.get('user')
+            or state.get('current_user')
+            or state.get('actor')
         )
         if not user:
             return self._base_logger
@@ -1,7 +1,11 @@
 from . import action as _action  # noqa: F401
+from . import audit as _audit  # noqa: F401
 from . import booking as _booking  # noqa: F401
 from . import cafe as _cafe  # noqa: F401
 from . import dish as _dish  # noqa: F401
+from . import media as _media  # noqa: F401
+from . import notification as _notification  # noqa: F401
+from . import outbox as _outbox  # noqa: F401
 from . import relations as _rels  # noqa: F401
 from . import slots as _slots  # noqa: F401
 from . import table as _table  # noqa: F401
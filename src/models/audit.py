@@ -0,0 +1,38 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, String
+from sqlalchemy.dialects.postgresql import JSONB
+
+from core.constants import (
+    AUDIT_ACTION_MAX,
+    AUDIT_REQUEST_ID_MAX,
+    AUDIT_RESOURCE_MAX,
+)
+from core.db import Base
+
+
+class AuditEvent(Base):
+    """Событие бизнес-аудита.
+
+    Таблица секционирована по месяцам (RANGE по created_at), поэтому
+    created_at входит в первичный ключ. Секции создаёт `core.audit`.
+    """
+
+    __tablename__ = 'audit_events'
+    __table_args__ = (
+        Index('ix_audit_events_resource_created', 'resource', 'created_at'),
+        Index('ix_audit_events_actor_created', 'actor_id', 'created_at'),
+        {'postgresql_partition_by': 'RANGE (created_at)'},
+    )
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    created_at = Column(
+        DateTime(timezone=True),
+        primary_key=True,
+        default=lambda: datetime.now(timezone.utc),
+    )
+    resource = Column(String(AUDIT_RESOURCE_MAX), nullable=False)
+    action = Column(String(AUDIT_ACTION_MAX), nullable=False)
+    actor_id = Column(Integer, nullable=True)
+    request_id = Column(String(AUDIT_REQUEST_ID_MAX), nullable=True)
+    payload = Column(JSONB, nullable=False, default=dict)
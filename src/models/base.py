@@ -9,6 +9,7 @@ class BaseModel(Base):
     """Базовая модель."""
 
     __abstract__ = True
+    __mapper_args__ = {'eager_defaults': True}
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     created_at = Column(
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+
+from core.constants import MEDIA_HASH_LEN
+
+from .base import BaseModel
+
+
+class MediaFile(BaseModel):
+    """Загруженное изображение, адресуемое по содержимому.
+
+    `sha256` - хэш загруженных байтов; повторная загрузка тех же байтов
+    получает тот же `media_id`. `ref_count` - сколько кафе, блюд и акций
+    ссылаются на картинку; его пересчитывает сборщик мусора.
+    """
+
+    __tablename__ = 'media_files'
+
+    media_id = Column(PG_UUID(as_uuid=True), nullable=False, unique=True)
+    sha256 = Column(String(MEDIA_HASH_LEN), nullable=False, unique=True)
+    size = Column(Integer, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)
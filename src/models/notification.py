@@ -0,0 +1,48 @@
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    text,
+)
+
+from core.constants import (
+    EMAIL_MAX,
+    NOTIFICATION_KIND_MAX,
+    NOTIFICATION_SUBJECT_MAX,
+)
+
+from .base import BaseModel
+
+
+class ScheduledNotification(BaseModel):
+    """Отложенное письмо (например, напоминание о бронировании).
+
+    Ждёт в БД до `due_at`; Celery beat забирает созревшие строки и
+    ставит отправку в очередь. Отмена - `is_active = False`.
+    """
+
+    __tablename__ = 'scheduled_notifications'
+    __table_args__ = (
+        Index(
+            'ix_scheduled_notifications_due_at',
+            'due_at',
+            postgresql_where=text('is_active AND dispatched_at IS NULL'),
+        ),
+    )
+
+    booking_id = Column(
+        Integer,
+        ForeignKey('bookings.id', ondelete='CASCADE'),
+        nullable=True,
+        index=True,
+    )
+    kind = Column(String(NOTIFICATION_KIND_MAX), nullable=False)
+    recipient = Column(String(EMAIL_MAX), nullable=False)
+    subject = Column(String(NOTIFICATION_SUBJECT_MAX), nullable=False)
+    body = Column(Text, nullable=False)
+    due_at = Column(DateTime(timezone=True), nullable=False)
+    dispatched_at = Column(DateTime(timezone=True), nullable=True)
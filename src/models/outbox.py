@@ -0,0 +1,28 @@
+from sqlalchemy import Column, DateTime, Index, Integer, String, text
+from sqlalchemy.dialects.postgresql import JSONB
+
+from core.constants import OUTBOX_TASK_MAX
+
+from .base import BaseModel
+
+
+class OutboxEvent(BaseModel):
+    """Событие transactional outbox.
+
+    Пишется в той же транзакции, что и бизнес-изменение; relay
+    публикует его в Celery как задачу `task` с kwargs из `payload`.
+    """
+
+    __tablename__ = 'outbox'
+    __table_args__ = (
+        Index(
+            'ix_outbox_pending',
+            'id',
+            postgresql_where=text('published_at IS NULL'),
+        ),
+    )
+
+    task = Column(String(OUTBOX_TASK_MAX), nullable=False)
+    payload = Column(JSONB, nullable=False, default=dict)
+    published_at = Column(DateTime(timezone=True), nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Integer, Table
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, Table
 
 from core.db import Base
 
@@ -7,6 +7,8 @@ cafe_managers = Table(
     Base.metadata,
     Column('cafe_id', Integer, ForeignKey('cafes.id'), primary_key=True),
     Column('user_id', Integer, ForeignKey('users.id'), primary_key=True),
+    # Конец окна последнего дайджеста бронирований для менеджера кафе.
+    Column('digest_sent_at', DateTime(timezone=True), nullable=True),
 )
 
 cafe_dishes = Table(
@@ -1,5 +1,5 @@
-from sqlalchemy import (CheckConstraint, Column, Integer, String,
-                        UniqueConstraint)
+from sqlalchemy import (Boolean, CheckConstraint, Column, Integer, String,
+                        UniqueConstraint, false)
 from sqlalchemy.orm import relationship
 
 from core.constants import (CK_USERS_CONTACT_REQUIRED, EMAIL_MAX,
@@ -30,6 +30,12 @@ class User(BaseModel):
     tg_id = Column(String(TG_ID_MAX), nullable=True)
     role = Column(Integer, nullable=False, default=int(UserRole.USER))
     password_hash = Column(String(PASSWORD_HASH_MAX), nullable=False)
+    booking_digest = Column(
+        Boolean,
+        nullable=False,
+        default=False,
+        server_default=false(),
+    )
 
     managed_cafes = relationship(
         'Cafe',
@@ -0,0 +1,23 @@
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel
+from pydantic.config import ConfigDict
+
+
+class AuditEventInfo(BaseModel):
+    """Схема ответа с событием аудита.
+
+    resource/action - что произошло, actor_id - кто инициировал
+    (None для системных операций), payload - поля события.
+    """
+
+    id: int
+    created_at: datetime
+    resource: str
+    action: str
+    actor_id: int | None
+    request_id: str | None
+    payload: dict[str, Any]
+
+    model_config = ConfigDict(from_attributes=True)
@@ -1,8 +1,16 @@
 from __future__ import annotations
 
-from typing import Annotated
+from typing import Annotated, List
 
-from pydantic import BaseModel, ConfigDict, StringConstraints
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    PositiveInt,
+    StringConstraints,
+)
+
+from core.constants import BULK_MAX_ITEMS
 
 ErrorCodeStr = Annotated[
     str,
@@ -17,6 +25,11 @@ ErrorMessageStr = Annotated[
     StringConstraints(strip_whitespace=True, min_length=1),
 ]
 
+BulkIdList = Annotated[
+    List[PositiveInt],
+    Field(min_length=1, max_length=BULK_MAX_ITEMS),
+]
+
 
 class ErrorResponse(BaseModel):
     """Стандартизированная схема ответа об ошибке."""
@@ -25,3 +38,9 @@ class ErrorResponse(BaseModel):
 
     code: ErrorCodeStr
     message: ErrorMessageStr
+
+
+class BulkDeactivate(BaseModel):
+    """Схема массовой деактивации объектов по списку ID."""
+
+    ids: BulkIdList
@@ -4,9 +4,10 @@ from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field
 
-from core.constants import DESCRIPTION_MIN, NAME_MAX, NAME_MIN
+from core.constants import BULK_MAX_ITEMS, DESCRIPTION_MIN, NAME_MAX, NAME_MIN
 
 from .cafe import CafeShortInfo
+from .common import BulkIdList
 
 
 class DishBase(BaseModel):
@@ -59,6 +60,24 @@ class DishUpdate(BaseModel):
     is_active: Optional[bool] = Field(None, description="Активно ли блюдо")
 
 
+class DishBulkCreate(BaseModel):
+    """Массовое создание блюд."""
+
+    items: List[DishCreate] = Field(
+        ...,
+        min_length=1,
+        max_length=BULK_MAX_ITEMS,
+        description="Список создаваемых блюд",
+    )
+
+
+class DishBulkUpdate(BaseModel):
+    """Массовое обновление блюд одинаковыми данными."""
+
+    ids: BulkIdList = Field(..., description="Список ID блюд")
+    data: DishUpdate
+
+
 class DishInfo(DishBase):
     """Информация о блюде."""
 
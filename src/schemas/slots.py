@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Annotated, Optional, Self
+from typing import Annotated, List, Optional, Self
 
 from pydantic import (
     BaseModel,
@@ -11,8 +11,10 @@ from pydantic import (
 from pydantic import (BaseModel, ConfigDict, Field, StringConstraints,
                       field_validator, model_validator)
 
-from core.constants import DESCRIPTION_MAX, DESCRIPTION_MIN, TIME_LENGTH
+from core.constants import (BULK_MAX_ITEMS, DESCRIPTION_MAX,
+                            DESCRIPTION_MIN, TIME_LENGTH)
 
+from .common import BulkIdList
 from .validators import validate_time_format, validate_time_range
 
 DescriptionStr = Annotated[
@@ -81,6 +83,22 @@ class TimeSlotUpdate(BaseModel):
         return self
 
 
+class TimeSlotBulkCreate(BaseModel):
+    """Схема массового создания временных слотов."""
+
+    items: List[TimeSlotCreate] = Field(
+        min_length=1,
+        max_length=BULK_MAX_ITEMS,
+    )
+
+
+class TimeSlotBulkUpdate(BaseModel):
+    """Схема массового обновления временных слотов."""
+
+    ids: BulkIdList
+    data: TimeSlotUpdate
+
+
 class TimeSlotShortInfo(BaseModel):
     """Краткая информация о временном слоте."""
 
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Annotated, Optional
+from typing import Annotated, List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field, StringConstraints
 
+from core.constants import BULK_MAX_ITEMS
+
 from .cafe import CafeShortInfo
+from .common import BulkIdList
 
 TableDescriptionStr = Annotated[
     str,
@@ -30,6 +33,19 @@ class TableUpdate(BaseModel):
     is_active: Optional[bool] = None
 
 
+class TableBulkCreate(BaseModel):
+    """Схема массового создания Столов."""
+
+    items: List[TableCreate] = Field(min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class TableBulkUpdate(BaseModel):
+    """Схема массового обновления Столов одинаковыми данными."""
+
+    ids: BulkIdList
+    data: TableUpdate
+
+
 class TableShortInfo(BaseModel):
     """Краткая информация о Столе."""
 
@@ -81,6 +81,7 @@ class UserInfo(BaseModel):
     tg_id: Optional[str] = None
     role: UserRole
     is_active: bool
+    booking_digest: bool = False
     created_at: datetime
     updated_at: datetime
 
@@ -94,6 +95,10 @@ class UserUpdate(BaseModel):
     tg_id: Optional[TgIdStr] = None
     role: Optional[UserRole] = None
     password: Optional[str] = None
+    booking_digest: Optional[bool] = Field(
+        default=None,
+        description='Получать бронирования кафе дайджестом, а не по одному',
+    )
 
     @field_validator('email', 'phone', 'tg_id', mode='before')
     @classmethod
@@ -6,6 +6,7 @@ from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
 from core.config import settings
+from core.db import uow
 from core.security import hash_password
 from crud.cafe import cafe_crud
 from crud.slots import slot_crud
@@ -157,11 +158,13 @@ async def seed_database():
                 description='Это кафе не работает.',
                 managers_id={manager1.id},
             )
-            inactive_cafe = await cafe_crud.create(inactive_cafe_data, session)
-            stmt = update(Cafe).where(
-                Cafe.id == inactive_cafe.id).values(is_active=False)
-            await session.execute(stmt)
-            await session.commit()
+            async with uow(session):
+                inactive_cafe = await cafe_crud.create(
+                    inactive_cafe_data, session,
+                )
+                stmt = update(Cafe).where(
+                    Cafe.id == inactive_cafe.id).values(is_active=False)
+                await session.execute(stmt)
             print(f"-> Создано неактивное кафе: '{inactive_cafe.name}'.")
         else:
             print(f"-> Неактивное кафе '{inactive_cafe.name}' уже существует.")
@@ -177,8 +180,11 @@ async def seed_database():
                 TableCreateSchema(
                     description='Большой стол в центре', seat_number=6),
             ]
-            for table_data in tables_for_cafe1:
-                await table_crud.create(table_data, session, cafe_id=cafe1.id)
+            async with uow(session):
+                for table_data in tables_for_cafe1:
+                    await table_crud.create(
+                        table_data, session, cafe_id=cafe1.id,
+                    )
             print(f"-> Созданы активные столы для кафе '{cafe1.name}'.")
         else:
             print(f"-> Столы для кафе '{cafe1.name}' уже существуют.")
@@ -188,13 +194,13 @@ async def seed_database():
         ):
             inactive_table_data = TableCreateSchema(
                 description="Сломанный столик", seat_number=1)
-            inactive_table = await table_crud.create(
-                inactive_table_data, session, cafe_id=cafe1.id,
-            )
-            stmt = update(Table).where(
-                Table.id == inactive_table.id).values(is_active=False)
-            await session.execute(stmt)
-            await session.commit()
+            async with uow(session):
+                inactive_table = await table_crud.create(
+                    inactive_table_data, session, cafe_id=cafe1.id,
+                )
+                stmt = update(Table).where(
+                    Table.id == inactive_table.id).values(is_active=False)
+                await session.execute(stmt)
             print(
                 f"-> Создан неактивный стол '{inactive_table.description}' "
                 f"в кафе '{cafe1.name}'.",
@@ -210,8 +216,11 @@ async def seed_database():
                 TableCreateSchema(
                     description='Стол на веранде', seat_number=4),
             ]
-            for table_data in tables_for_cafe2:
-                await table_crud.create(table_data, session, cafe_id=cafe2.id)
+            async with uow(session):
+                for table_data in tables_for_cafe2:
+                    await table_crud.create(
+                        table_data, session, cafe_id=cafe2.id,
+                    )
             print(f"-> Созданы столы для кафе '{cafe2.name}'.")
         else:
             print(f"-> Столы для кафе '{cafe2.name}' уже существуют.")
@@ -228,10 +237,11 @@ async def seed_database():
                 TimeSlotCreate(start_time='13:00', end_time='14:00',
                                description='Временной слот 2'),
             ]
-            for slot_data in existing_slots:
-                await slot_crud.create_with_cafe_id(
-                    slot_data, session, cafe_id=cafe1.id)
-                print(f"-> Создан временой слот кафе '{cafe1.id}'.")
+            async with uow(session):
+                for slot_data in existing_slots:
+                    await slot_crud.create_with_cafe_id(
+                        slot_data, session, cafe_id=cafe1.id)
+                    print(f"-> Создан временой слот кафе '{cafe1.id}'.")
         else:
             print(f"-> Временной слот кафе '{cafe1.id}' уже существует.")
 
@@ -0,0 +1,95 @@
+"""Перенос картинок из плоского MEDIA_PATH в каталоги шардов.
+
+Запуск: python -m services.media_migrate [--workers N] [--dry-run]
+
+Каждый файл переносится атомарным os.replace, поэтому прерванный
+перенос можно просто запустить снова: в корне останутся только ещё не
+перенесённые файлы. Пока перенос идёт, GET /media находит файлы в обоих
+местах (см. core.media.lookup_paths).
+"""
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Iterator, Optional
+
+from core.constants import MEDIA_MIGRATE_BATCH, MEDIA_MIGRATE_WORKERS
+from core.media import media_dir
+
+__all__ = ['iter_flat_media', 'migrate_media']
+
+
+def _media_id(filename: str) -> Optional[str]:
+    """media_id из имени `<id>.jpg` / `<id>_<вариант>.<ext>`."""
+    stem = filename.partition('.')[0].partition('_')[0]
+    try:
+        return str(uuid.UUID(stem))
+    except ValueError:
+        return None
+
+
+def iter_flat_media(root: Path) -> Iterator[tuple[str, str]]:
+    """Файлы картинок в корне `root`: пары (имя, media_id).
+
+    Каталоги, скрытые и временные файлы пропускаются. Корень читается
+    лениво через os.scandir, без списка всех имён в памяти.
+    """
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.name.startswith('.') or not entry.is_file():
+                continue
+            media_id = _media_id(entry.name)
+            if media_id is not None:
+                yield entry.name, media_id
+
+
+def _move(root: Path, filename: str, media_id: str) -> bool:
+    """Перенести один файл в каталог шарда; False, если его уже нет."""
+    directory = media_dir(media_id, root)
+    directory.mkdir(parents=True, exist_ok=True)
+    try:
+        os.replace(root / filename, directory / filename)
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def migrate_media(
+    root: Path,
+    workers: int = MEDIA_MIGRATE_WORKERS,
+    dry_run: bool = False,
+) -> int:
+    """Перенести файлы из корня `root` в шарды, вернуть их число.
+
+    Файлы обрабатываются пачками по MEDIA_MIGRATE_BATCH в пуле из
+    `workers` потоков (операции с файловой системой отпускают GIL).
+    """
+    moved = 0
+    files = iter_flat_media(root)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while batch := list(islice(files, MEDIA_MIGRATE_BATCH)):
+            if dry_run:
+                moved += len(batch)
+                continue
+            moved += sum(pool.map(lambda item: _move(root, *item), batch))
+    return moved
+
+
+if __name__ == '__main__':
+    import argparse
+
+    from core.config import settings
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--root', type=Path, default=settings.MEDIA_PATH)
+    parser.add_argument('--workers', type=int, default=MEDIA_MIGRATE_WORKERS)
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='только посчитать файлы в корне',
+    )
+    args = parser.parse_args()
+    count = migrate_media(args.root, args.workers, args.dry_run)
+    action = 'Найдено' if args.dry_run else 'Перенесено'
+    print(f'{action} файлов: {count}')
@@ -0,0 +1,30 @@
+import pytest
+from httpx import AsyncClient
+
+
+@pytest.mark.anyio
+async def test_audit_forbidden_for_user(
+    client: AsyncClient,
+    token_email: str,
+) -> None:
+    """Журнал аудита недоступен обычному пользователю - 403."""
+    r = await client.get(
+        '/audit',
+        headers={'Authorization': f'Bearer {token_email}'},
+    )
+    assert r.status_code == 403
+
+
+@pytest.mark.anyio
+async def test_audit_list_for_admin(
+    client: AsyncClient,
+    admin_token: str,
+) -> None:
+    """Админ получает список событий с фильтрами - 200."""
+    r = await client.get(
+        '/audit',
+        params={'resource': 'cafe', 'since': '2025-01-01T00:00:00Z'},
+        headers={'Authorization': f'Bearer {admin_token}'},
+    )
+    assert r.status_code == 200
+    assert isinstance(r.json(), list)
@@ -0,0 +1,201 @@
+from datetime import date, timedelta
+from typing import Any
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from api import idempotency
+from core.idempotency import IdempotencyStore, fingerprint
+from crud.booking import booking_crud
+from models.booking import Booking
+from models.cafe import Cafe
+from models.user import User
+from schemas.booking import BookingCreate, BookingInfo, BookingUpdate
+
+fake_aioredis = pytest.importorskip('fakeredis.aioredis')
+
+
+@pytest.mark.anyio
+async def test_update_cafe_id_returns_new_cafe(
+    sessionmaker: async_sessionmaker[AsyncSession],
+) -> None:
+    """После смены cafe_id в ответе вложенное кафе - новое."""
+    async with sessionmaker() as session:
+        user = User(
+            username='guest', email='guest@a.com', password_hash='x', role=0,
+        )
+        old_cafe = Cafe(
+            name='Старое', address='Адрес 1', phone='+70000000001',
+            description='Кафе',
+        )
+        new_cafe = Cafe(
+            name='Новое', address='Адрес 2', phone='+70000000002',
+            description='Кафе',
+        )
+        session.add_all([user, old_cafe, new_cafe])
+        await session.flush()
+        booking = Booking(
+            user_id=user.id,
+            cafe_id=old_cafe.id,
+            guest_number=2,
+            booking_date=date.today() + timedelta(days=3),
+        )
+        session.add(booking)
+        await session.commit()
+        booking_id, new_cafe_id = booking.id, new_cafe.id
+
+    async with sessionmaker() as session:
+        booking = await session.get(Booking, booking_id)
+        assert booking.cafe.name == 'Старое'
+
+        booking = await booking_crud.update(
+            booking, BookingUpdate(cafe_id=new_cafe_id), session,
+        )
+
+    info = BookingInfo.model_validate(booking, from_attributes=True)
+    assert info.cafe.id == new_cafe_id
+    assert info.cafe.name == 'Новое'
+
+
+@pytest.fixture()
+def store(monkeypatch: pytest.MonkeyPatch) -> IdempotencyStore:
+    """Хранилище Idempotency-Key поверх fakeredis."""
+    store = IdempotencyStore(
+        fake_aioredis.FakeRedis(decode_responses=True), wait=0.1, poll=0.01,
+    )
+    monkeypatch.setattr(idempotency, 'idempotency_store', store)
+    return store
+
+
+@pytest.fixture()
+async def booking_payload(
+    client: AsyncClient,
+    manager1: dict,
+    admin_token: str,
+) -> dict[str, Any]:
+    """Тело POST /booking/ для кафе со столом и слотом."""
+    headers = {'Authorization': f'Bearer {admin_token}'}
+    cafe = await client.post('/cafes', headers=headers, json={
+        'name': 'Кафе для брони',
+        'address': 'г. Тест, ул. Брони, д. 1',
+        'phone': '+7(111)111-11-12',
+        'managers_id': [manager1['id']],
+    })
+    cafe_id = cafe.json()['id']
+    table = await client.post(
+        f'/cafe/{cafe_id}/tables',
+        headers=headers,
+        json={'description': 'Столик у окна', 'seat_number': 2},
+    )
+    slot = await client.post(
+        f'/cafe/{cafe_id}/time_slots',
+        headers=headers,
+        json={
+            'start_time': '12:00',
+            'end_time': '13:00',
+            'description': 'Обед',
+        },
+    )
+    return {
+        'cafe_id': cafe_id,
+        'tables_id': [table.json()['id']],
+        'slots_id': [slot.json()['id']],
+        'guest_number': 2,
+        'note': 'Окно',
+        'status': 0,
+        'booking_date': str(date.today() + timedelta(days=3)),
+    }
+
+
+async def _bookings_of(
+    sessionmaker: async_sessionmaker[AsyncSession],
+    user_id: int,
+) -> int:
+    async with sessionmaker() as session:
+        return await session.scalar(
+            select(func.count())
+            .select_from(Booking)
+            .where(Booking.user_id == user_id),
+        )
+
+
+@pytest.mark.anyio
+async def test_create_booking_replayed_by_idempotency_key(
+    client: AsyncClient,
+    user_email: dict,
+    token_email: str,
+    booking_payload: dict[str, Any],
+    store: IdempotencyStore,
+    sessionmaker: async_sessionmaker[AsyncSession],
+) -> None:
+    """Повтор с тем же ключом отдаёт первый ответ без второй брони."""
+    headers = {
+        'Authorization': f'Bearer {token_email}',
+        'Idempotency-Key': 'booking-1',
+    }
+    first = await client.post(
+        '/booking/', headers=headers, json=booking_payload,
+    )
+    second = await client.post(
+        '/booking/', headers=headers, json=booking_payload,
+    )
+
+    assert first.status_code == 200
+    assert idempotency.REPLAYED_HEADER not in first.headers
+    assert second.status_code == first.status_code
+    assert second.json() == first.json()
+    assert second.headers[idempotency.REPLAYED_HEADER] == 'true'
+    assert await _bookings_of(sessionmaker, user_email['id']) == 1
+
+
+@pytest.mark.anyio
+async def test_idempotency_key_reused_with_other_body(
+    client: AsyncClient,
+    token_email: str,
+    booking_payload: dict[str, Any],
+    store: IdempotencyStore,
+) -> None:
+    """Тот же ключ с другим телом запроса - 422."""
+    headers = {
+        'Authorization': f'Bearer {token_email}',
+        'Idempotency-Key': 'booking-2',
+    }
+    await client.post('/booking/', headers=headers, json=booking_payload)
+    r = await client.post(
+        '/booking/',
+        headers=headers,
+        json={**booking_payload, 'note': 'Другое'},
+    )
+    assert r.status_code == 422
+
+
+@pytest.mark.anyio
+async def test_idempotency_key_in_flight(
+    client: AsyncClient,
+    user_email: dict,
+    token_email: str,
+    booking_payload: dict[str, Any],
+    store: IdempotencyStore,
+    sessionmaker: async_sessionmaker[AsyncSession],
+) -> None:
+    """Пока запрос с ключом выполняется, повтор получает 409."""
+    digest = fingerprint(
+        jsonable_encoder(BookingCreate.model_validate(booking_payload)),
+    )
+    assert await store.acquire(
+        f'booking:{user_email["id"]}:booking-3', digest,
+    ) is None
+
+    r = await client.post(
+        '/booking/',
+        headers={
+            'Authorization': f'Bearer {token_email}',
+            'Idempotency-Key': 'booking-3',
+        },
+        json=booking_payload,
+    )
+    assert r.status_code == 409
+    assert await _bookings_of(sessionmaker, user_email['id']) == 0
@@ -0,0 +1,79 @@
+from collections.abc import AsyncIterator
+
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+
+from middleware.compression import CompressionMiddleware
+
+BODY = b'{"name": "cafe"}' * 200
+
+
+async def json_body(request: Request) -> Response:
+    """JSON длиннее порога."""
+    return Response(BODY, media_type='application/json')
+
+
+async def small_json(request: Request) -> Response:
+    """JSON короче порога."""
+    return Response(b'{}', media_type='application/json')
+
+
+async def image(request: Request) -> Response:
+    """Картинка: тип не из списка сжимаемых."""
+    return Response(BODY, media_type='image/jpeg')
+
+
+async def stream(request: Request) -> StreamingResponse:
+    """Потоковый текст без Content-Length."""
+    async def chunks() -> AsyncIterator[bytes]:
+        for _ in range(10):
+            yield BODY
+
+    return StreamingResponse(chunks(), media_type='text/plain')
+
+
+def make_client() -> AsyncClient:
+    """Клиент приложения с CompressionMiddleware, принимающий gzip."""
+    app = Starlette(routes=[
+        Route('/json', json_body),
+        Route('/small', small_json),
+        Route('/image', image),
+        Route('/stream', stream),
+    ])
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+    return AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url='http://test',
+        headers={'Accept-Encoding': 'gzip'},
+    )
+
+
+async def test_compresses_allowed_types_above_threshold() -> None:
+    """JSON сжимается, маленький ответ и картинка - нет."""
+    client = make_client()
+
+    response = await client.get('/json')
+    assert response.headers['content-encoding'] == 'gzip'
+    assert response.headers['vary'] == 'Accept-Encoding'
+    assert int(response.headers['content-length']) < len(BODY)
+    assert response.content == BODY
+
+    for path in ('/small', '/image'):
+        response = await client.get(path)
+        assert 'content-encoding' not in response.headers
+    assert (await client.get('/image')).content == BODY
+    response = await client.get(
+        '/json', headers={'Accept-Encoding': 'identity'},
+    )
+    assert 'content-encoding' not in response.headers
+
+
+async def test_streaming_response_is_compressed_by_chunks() -> None:
+    """Потоковый ответ сжимается без Content-Length и собирается целиком."""
+    response = await make_client().get('/stream')
+    assert response.headers['content-encoding'] == 'gzip'
+    assert 'content-length' not in response.headers
+    assert response.content == BODY * 10
@@ -0,0 +1,32 @@
+import pytest
+from sqlalchemy import select
+
+from core.fieldsets import parse_fields, partial_schema
+from crud.base import response_load_options
+from models.booking import Booking
+from schemas.booking import BookingInfo
+
+
+def test_parse_fields_validates_public_names() -> None:
+    """Поля сортируются, алиасы принимаются, неизвестные отклоняются."""
+    assert parse_fields(None, BookingInfo) is None
+    fields = parse_fields('slots_id, id,id', BookingInfo)
+    assert fields == ('id', 'slots_id')
+    assert str(fields) == 'id,slots_id'
+    with pytest.raises(ValueError, match='slots'):
+        parse_fields('id,slots', BookingInfo)
+
+
+def test_fields_pushed_down_to_select() -> None:
+    """Читаются только запрошенные колонки, схема ответа урезается."""
+    fields = parse_fields('booking_date,id', BookingInfo)
+    query = str(
+        select(Booking).options(
+            *response_load_options(Booking, BookingInfo, fields),
+        ),
+    )
+    assert 'bookings.booking_date' in query
+    assert 'bookings.note' not in query
+    schema = partial_schema(BookingInfo, fields)
+    assert list(schema.model_fields) == ['id', 'booking_date']
+    assert partial_schema(BookingInfo, None) is BookingInfo
@@ -0,0 +1,44 @@
+import asyncio
+
+import pytest
+
+from core.idempotency import (
+    IdempotencyInFlight,
+    IdempotencyKeyReused,
+    IdempotencyStore,
+)
+
+fake_aioredis = pytest.importorskip('fakeredis.aioredis')
+
+
+@pytest.fixture()
+def store() -> IdempotencyStore:
+    """Хранилище поверх fakeredis с короткими таймаутами."""
+    client = fake_aioredis.FakeRedis(decode_responses=True)
+    return IdempotencyStore(client, wait=0.5, poll=0.01)
+
+
+async def test_duplicate_waits_for_first_response(
+    store: IdempotencyStore,
+) -> None:
+    """Параллельный дубликат получает ответ первого запроса."""
+    assert await store.acquire('k', 'a') is None
+
+    async def finish() -> None:
+        await asyncio.sleep(0.05)
+        await store.save('k', 'a', 200, {'id': 1})
+
+    saved, _ = await asyncio.gather(store.acquire('k', 'a'), finish())
+    assert saved == {'status': 200, 'body': {'id': 1}}
+
+
+async def test_key_reuse_and_release(store: IdempotencyStore) -> None:
+    """Другое тело с тем же ключом отклоняется, release освобождает."""
+    assert await store.acquire('k', 'a') is None
+    with pytest.raises(IdempotencyKeyReused):
+        await store.acquire('k', 'b')
+    store.wait = 0.05
+    with pytest.raises(IdempotencyInFlight):
+        await store.acquire('k', 'a')
+    await store.release('k')
+    assert await store.acquire('k', 'a') is None
@@ -0,0 +1,66 @@
+import smtplib
+
+import pytest
+
+from celery_tasks import tasks
+
+
+class _Pool:
+    """Пул SMTP, отклоняющий письма на адреса из `rejected`."""
+
+    def __init__(self, rejected: dict[str, smtplib.SMTPException]) -> None:
+        """Запомнить отказы по адресам."""
+        self.rejected = rejected
+        self.delivered: list[str] = []
+
+    def sendmail(self, sender: str, recipient: str, message: str) -> None:
+        """Принять письмо или поднять отказ для адреса."""
+        if recipient in self.rejected:
+            raise self.rejected.pop(recipient)
+        self.delivered.append(recipient)
+
+
+def test_rejected_recipient_does_not_stop_batch(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Отказ 5xx по одному адресу в середине пачки не вызывает повтор."""
+    pool = _Pool({'b@a.com': smtplib.SMTPDataError(550, b'Rejected')})
+    monkeypatch.setattr(tasks, 'smtp_pool', pool)
+    retries: list[dict] = []
+    monkeypatch.setattr(
+        tasks.send_mail_batch,
+        'retry',
+        lambda **kwargs: retries.append(kwargs),
+    )
+
+    result = tasks.send_mail_batch.run(
+        ['a@a.com', 'b@a.com', 'c@a.com'], 'Тема', 'Текст',
+    )
+
+    assert result == {'sent': 2, 'failed': 1}
+    assert pool.delivered == ['a@a.com', 'c@a.com']
+    assert retries == []
+
+
+def test_disconnect_retries_unsent_tail(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Обрыв соединения ставит повтор только для неотправленных адресов."""
+    pool = _Pool({'b@a.com': smtplib.SMTPServerDisconnected('gone')})
+    monkeypatch.setattr(tasks, 'smtp_pool', pool)
+    retries: list[dict] = []
+
+    def retry(**kwargs: object) -> Exception:
+        retries.append(kwargs)
+        return RuntimeError('retry')
+
+    monkeypatch.setattr(tasks.send_mail_batch, 'retry', retry)
+
+    with pytest.raises(RuntimeError):
+        tasks.send_mail_batch.run(
+            ['a@a.com', 'b@a.com', 'c@a.com'], 'Тема', 'Текст',
+        )
+
+    assert pool.delivered == ['a@a.com']
+    assert retries[0]['args'] == (['b@a.com', 'c@a.com'], 'Тема', 'Текст')
+    assert retries[0]['kwargs'] == {'sent': 1, 'failed': 0}
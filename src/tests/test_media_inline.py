@@ -0,0 +1,95 @@
+import hashlib
+import io
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from PIL import Image
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from api.endpoints import media
+from api.validators.media import Upload
+from core import media as core_media
+from core.constants import MEDIA_INLINE_MAX_PIXELS, MEDIA_UPLOAD_DIR
+from models.media import MediaFile
+
+MEDIA_ID = '0a1b2c3d-2222-4222-8222-222222222222'
+
+
+def _upload(tmp_path: Path, size: tuple[int, int]) -> Upload:
+    """Файл загрузки с PNG заданного размера."""
+    path = tmp_path / 'image.upload'
+    Image.new('RGB', size, 'green').save(path, 'PNG')
+    data = path.read_bytes()
+    return Upload(path, hashlib.sha256(data).hexdigest(), len(data))
+
+
+@pytest.fixture()
+def media_root(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> Iterator[Path]:
+    """Каталог вариантов вместо MEDIA_PATH и UPLOAD_PATH."""
+    root = tmp_path / 'media'
+    monkeypatch.setattr(media, 'MEDIA_PATH', root)
+    monkeypatch.setattr(media, 'UPLOAD_PATH', root / MEDIA_UPLOAD_DIR)
+    yield root
+
+
+async def test_busy_pool_leaves_image_to_celery(
+    tmp_path: Path,
+    media_root: Path,
+) -> None:
+    """Когда пул обработки занят, картинка уходит в Celery."""
+    limiter = core_media._inline_limiter
+    borrowers = [object() for _ in range(int(limiter.total_tokens))]
+    for borrower in borrowers:
+        await limiter.acquire_on_behalf_of(borrower)
+    try:
+        upload = _upload(tmp_path, (64, 64))
+        assert await core_media.save_variants_inline(
+            upload.path, MEDIA_ID, media_root, MEDIA_INLINE_MAX_PIXELS,
+        ) is None
+        assert await media._save_inline(upload, MEDIA_ID) is False
+    finally:
+        for borrower in borrowers:
+            limiter.release_on_behalf_of(borrower)
+    assert not media_root.exists()
+
+
+async def test_pixel_limit_leaves_image_to_celery(
+    tmp_path: Path,
+    media_root: Path,
+) -> None:
+    """Маленький файл с большим числом пикселей уходит в Celery."""
+    upload = _upload(tmp_path, (2_100, 2_000))
+    assert 2_100 * 2_000 > MEDIA_INLINE_MAX_PIXELS
+
+    assert await media._save_inline(upload, MEDIA_ID) is False
+    assert not media_root.exists()
+
+
+async def test_undecodable_image_rejected_and_rolled_back(
+    client: AsyncClient,
+    manager1_token: str,
+    sessionmaker: async_sessionmaker[AsyncSession],
+    media_root: Path,
+) -> None:
+    """Битая картинка - 400, запись media_files и файлы не сохраняются."""
+    data = b'\x89PNG\r\n\x1a\n' + b'x' * 64
+    r = await client.post(
+        '/media',
+        files={'file': ('broken.png', io.BytesIO(data), 'image/png')},
+        headers={'Authorization': f'Bearer {manager1_token}'},
+    )
+    assert r.status_code == 400
+    assert [p for p in media_root.rglob('*') if p.is_file()] == []
+
+    async with sessionmaker() as session:
+        assert await session.scalar(
+            select(func.count())
+            .select_from(MediaFile)
+            .where(MediaFile.sha256 == hashlib.sha256(data).hexdigest()),
+        ) == 0
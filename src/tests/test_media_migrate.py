@@ -0,0 +1,54 @@
+import os
+import time
+from pathlib import Path
+
+from core.media import delete_stale_uploads, lookup_paths, media_dir
+from services.media_migrate import migrate_media
+
+MEDIA_ID = '0a1b2c3d-1111-4111-8111-111111111111'
+
+
+def test_migrate_moves_flat_files_to_shards(tmp_path: Path) -> None:
+    """Файлы из корня переносятся в шард, повторный запуск ничего не делает."""
+    names = [f'{MEDIA_ID}.jpg', f'{MEDIA_ID}_thumb.webp']
+    for name in names:
+        (tmp_path / name).write_bytes(b'img')
+    (tmp_path / '.incoming').mkdir()
+    (tmp_path / 'notes.txt').write_text('keep')
+
+    assert migrate_media(tmp_path, workers=2) == 2
+    assert migrate_media(tmp_path, workers=2) == 0
+
+    directory = media_dir(MEDIA_ID, tmp_path)
+    assert directory == tmp_path / '0a' / '1b'
+    assert sorted(p.name for p in directory.iterdir()) == sorted(names)
+    assert (tmp_path / 'notes.txt').exists()
+
+
+def test_lookup_falls_back_to_flat_layout(tmp_path: Path) -> None:
+    """Вариант ищется в шарде, затем в корне, затем полный JPEG."""
+    paths = lookup_paths(MEDIA_ID, 'thumb', 'webp', tmp_path)
+    shard = media_dir(MEDIA_ID, tmp_path)
+    assert paths == [
+        shard / f'{MEDIA_ID}_thumb.webp',
+        tmp_path / f'{MEDIA_ID}_thumb.webp',
+        shard / f'{MEDIA_ID}.jpg',
+        tmp_path / f'{MEDIA_ID}.jpg',
+    ]
+
+
+def test_stale_uploads_removed_after_grace(tmp_path: Path) -> None:
+    """Удаляются только временные загрузки старше отсечки."""
+    upload_dir = tmp_path / '.incoming'
+    upload_dir.mkdir()
+    stale = upload_dir / 'stale.upload'
+    fresh = upload_dir / 'fresh.upload'
+    stale.write_bytes(b'img')
+    fresh.write_bytes(b'img')
+    cutoff = time.time() - 60
+    os.utime(stale, (cutoff - 60, cutoff - 60))
+
+    assert delete_stale_uploads(upload_dir, cutoff) == 1
+    assert not stale.exists()
+    assert fresh.exists()
+    assert delete_stale_uploads(tmp_path / 'missing', cutoff) == 0
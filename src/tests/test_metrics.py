@@ -0,0 +1,36 @@
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from prometheus_client import REGISTRY
+
+from core.constants import UNMATCHED_ROUTE
+from middleware.metrics import MetricsMiddleware
+
+
+def _count(route: str, status: str) -> float:
+    return REGISTRY.get_sample_value(
+        'http_request_duration_seconds_count',
+        {'method': 'GET', 'route': route, 'status': status},
+    ) or 0.0
+
+
+async def test_requests_counted_by_route_template() -> None:
+    """Запросы учитываются по шаблону маршрута, а не по пути."""
+    app = FastAPI()
+
+    @app.get('/items/{item_id}')
+    async def item(item_id: int) -> dict[str, int]:
+        return {'id': item_id}
+
+    app.add_middleware(MetricsMiddleware)
+    before = _count('/items/{item_id}', '200')
+    unmatched = _count(UNMATCHED_ROUTE, '404')
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url='http://test',
+    ) as client:
+        for item_id in (1, 2):
+            await client.get(f'/items/{item_id}')
+        await client.get('/missing')
+
+    assert _count('/items/{item_id}', '200') == before + 2
+    assert _count(UNMATCHED_ROUTE, '404') == unmatched + 1
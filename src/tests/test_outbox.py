@@ -0,0 +1,128 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import date, timedelta
+from typing import Any
+
+import pytest
+from sqlalchemy import Connection, func, select
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncSession,
+    async_sessionmaker,
+)
+from sqlalchemy.orm import Session
+
+from celery_tasks import tasks
+from core.db import uow
+from crud.booking import booking_crud
+from crud.outbox import outbox_crud
+from models.booking import Booking
+from models.cafe import Cafe
+from models.outbox import OutboxEvent
+from models.user import User
+from schemas.booking import BookingCreate
+
+
+async def _booking_in(
+    session: AsyncSession,
+) -> tuple[BookingCreate, int]:
+    """Данные брони в новом кафе от нового пользователя."""
+    user = User(
+        username='outbox', email='outbox@a.com', password_hash='x', role=0,
+    )
+    cafe = Cafe(
+        name='Outbox', address='Адрес', phone='+70000000000',
+        description='Кафе',
+    )
+    session.add_all([user, cafe])
+    await session.commit()
+    return BookingCreate(
+        cafe_id=cafe.id,
+        tables_id=[],
+        slots_id=[],
+        guest_number=2,
+        note='Окно',
+        status=0,
+        booking_date=date.today() + timedelta(days=3),
+    ), user.id
+
+
+async def _outbox_for(session: AsyncSession, booking_id: int) -> int:
+    return await session.scalar(
+        select(func.count())
+        .select_from(OutboxEvent)
+        .where(OutboxEvent.payload['booking_id'].as_integer() == booking_id),
+    )
+
+
+@pytest.mark.anyio
+async def test_booking_and_outbox_commit_together(
+    sessionmaker: async_sessionmaker[AsyncSession],
+) -> None:
+    """Бронь и событие outbox фиксируются одной транзакцией."""
+    async with sessionmaker() as session:
+        obj_in, user_id = await _booking_in(session)
+        booking = await booking_crud.create_booking(obj_in, user_id, session)
+
+    async with sessionmaker() as session:
+        assert await session.get(Booking, booking.id) is not None
+        assert await _outbox_for(session, booking.id) == 1
+
+
+@pytest.mark.anyio
+async def test_booking_and_outbox_roll_back_together(
+    sessionmaker: async_sessionmaker[AsyncSession],
+) -> None:
+    """Откат внешней единицы работы отменяет и бронь, и событие."""
+    async with sessionmaker() as session:
+        obj_in, user_id = await _booking_in(session)
+        with pytest.raises(RuntimeError):
+            async with uow(session):
+                await booking_crud.create_booking(obj_in, user_id, session)
+                raise RuntimeError
+
+    async with sessionmaker() as session:
+        assert await session.scalar(
+            select(func.count())
+            .select_from(Booking)
+            .where(Booking.user_id == user_id),
+        ) == 0
+        assert await session.scalar(
+            select(func.count()).select_from(OutboxEvent),
+        ) == 0
+
+
+@pytest.mark.anyio
+async def test_relay_publishes_and_marks_event(
+    db_conn: AsyncConnection,
+    sessionmaker: async_sessionmaker[AsyncSession],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Relay отправляет задачу в брокер и ставит published_at."""
+    async with sessionmaker() as session:
+        async with uow(session):
+            event = outbox_crud.add(
+                session, 'send_booking_notification', booking_id=1,
+            )
+    sent: list[tuple[str, dict[str, Any]]] = []
+    monkeypatch.setattr(
+        tasks.celery_app,
+        'send_task',
+        lambda name, kwargs: sent.append((name, kwargs)),
+    )
+
+    def relay(conn: Connection) -> int:
+        @contextmanager
+        def task_session() -> Iterator[Session]:
+            with Session(bind=conn) as session:
+                yield session
+
+        monkeypatch.setattr(tasks, 'task_session', task_session)
+        return tasks.relay_outbox()
+
+    assert await db_conn.run_sync(relay) == 1
+    assert sent == [('send_booking_notification', {'booking_id': 1})]
+    async with sessionmaker() as session:
+        event = await session.get(OutboxEvent, event.id)
+        assert event.published_at is not None
+        assert event.attempts == 1
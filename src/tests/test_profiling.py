@@ -0,0 +1,110 @@
+import os
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+from httpx import AsyncClient
+
+from core import profiling
+from core.config import settings
+from core.constants import PROFILE_HEADER, PROFILE_REPORT_HEADER
+from core.profiling import (
+    HTML,
+    SPEEDSCOPE,
+    Profiler,
+    prune_reports,
+    report_name,
+    requested_format,
+)
+
+
+def _scope(query: bytes = b'', headers: tuple = ()) -> dict:
+    return {
+        'type': 'http',
+        'method': 'GET',
+        'path': '/cafes/1',
+        'query_string': query,
+        'headers': list(headers),
+    }
+
+
+def test_requested_format_from_header_or_query() -> None:
+    """Флаг читается из X-Profile или ?profile=, без флага - None."""
+    assert requested_format(_scope()) is None
+    assert requested_format(_scope(b'profiles=1')) is None
+    assert requested_format(_scope(b'profile')) == HTML
+    assert requested_format(_scope(b'a=1&profile=speedscope')) == SPEEDSCOPE
+    assert requested_format(_scope(headers=[(b'x-profile', b'1')])) == HTML
+
+
+def test_prune_keeps_newest_reports(tmp_path: Path) -> None:
+    """Хранятся только последние отчёты, чужие файлы не трогаются."""
+    names = [report_name(_scope(), HTML) for _ in range(4)]
+    for age, name in enumerate(reversed(names)):
+        path = tmp_path / name
+        path.write_text('report')
+        os.utime(path, (1000 + age, 1000 + age))
+    (tmp_path / 'notes.txt').write_text('keep')
+
+    assert prune_reports(tmp_path, keep=2) == 2
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(
+        [*names[:2], 'notes.txt'],
+    )
+
+
+@pytest.fixture()
+def profile_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Каталог отчётов вместо PROFILE_DIR."""
+    monkeypatch.setattr(
+        profiling, 'settings', replace(settings, PROFILE_DIR=str(tmp_path)),
+    )
+    return tmp_path
+
+
+@pytest.mark.anyio
+async def test_profile_flag_rejected_for_anonymous(
+    client: AsyncClient,
+    profile_dir: Path,
+) -> None:
+    """Аноним с флагом профилирования получает 401 без отчёта."""
+    r = await client.get('/cafes', headers={PROFILE_HEADER: '1'})
+    assert r.status_code == 401
+    assert PROFILE_REPORT_HEADER not in r.headers
+    assert not list(profile_dir.iterdir())
+
+
+@pytest.mark.anyio
+async def test_profile_flag_forbidden_for_user(
+    client: AsyncClient,
+    token_email: str,
+    profile_dir: Path,
+) -> None:
+    """Обычный пользователь с флагом получает 403 без отчёта."""
+    r = await client.get(
+        '/cafes',
+        params={'profile': 'html'},
+        headers={'Authorization': f'Bearer {token_email}'},
+    )
+    assert r.status_code == 403
+    assert PROFILE_REPORT_HEADER not in r.headers
+    assert not list(profile_dir.iterdir())
+
+
+@pytest.mark.anyio
+@pytest.mark.skipif(Profiler is None, reason='pyinstrument не установлен')
+async def test_profile_report_for_manager(
+    client: AsyncClient,
+    manager1_token: str,
+    profile_dir: Path,
+) -> None:
+    """Менеджер получает ссылку на сохранённый отчёт."""
+    r = await client.get(
+        '/cafes',
+        headers={
+            'Authorization': f'Bearer {manager1_token}',
+            PROFILE_HEADER: '1',
+        },
+    )
+    assert r.status_code == 200
+    name = r.headers[PROFILE_REPORT_HEADER].removeprefix('/profiles/')
+    assert (profile_dir / name).is_file()
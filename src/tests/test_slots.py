@@ -0,0 +1,81 @@
+import pytest
+from httpx import AsyncClient
+
+
+@pytest.fixture
+async def cafe_id(
+    client: AsyncClient, admin_token: str, manager1: dict,
+) -> int:
+    """Фикстура: кафе для тестов слотов."""
+    res = await client.post(
+        '/cafes',
+        headers={'Authorization': f'Bearer {admin_token}'},
+        json={
+            'name': 'Кафе для Тестов Слотов',
+            'address': 'г. Тест, ул. Фикстур, д. 3',
+            'phone': '+7(111)111-11-13',
+            'managers_id': [manager1['id']],
+        },
+    )
+    assert res.status_code == 200
+    return res.json()['id']
+
+
+async def _create_slot(
+    client: AsyncClient, headers: dict, cafe_id: int, start: str, end: str,
+) -> int:
+    res = await client.post(
+        f'/cafe/{cafe_id}/time_slots',
+        headers=headers,
+        json={'start_time': start, 'end_time': end, 'description': 'Слот'},
+    )
+    assert res.status_code == 201
+    return res.json()['id']
+
+
+@pytest.mark.anyio
+async def test_bulk_reactivation_checks_overlap(
+    client: AsyncClient, admin_token: str, cafe_id: int,
+) -> None:
+    """Массовая активация слота, пересекающегося с активным, - 400."""
+    headers = {'Authorization': f'Bearer {admin_token}'}
+    lunch = await _create_slot(client, headers, cafe_id, '12:00', '13:00')
+    await client.post(
+        f'/cafe/{cafe_id}/time_slots/bulk/deactivate',
+        headers=headers,
+        json={'ids': [lunch]},
+    )
+    await _create_slot(client, headers, cafe_id, '12:30', '13:30')
+
+    res = await client.patch(
+        f'/cafe/{cafe_id}/time_slots/bulk',
+        headers=headers,
+        json={'ids': [lunch], 'data': {'is_active': True}},
+    )
+
+    assert res.status_code == 400
+    res = await client.get(
+        f'/cafe/{cafe_id}/time_slots/{lunch}', headers=headers,
+    )
+    assert res.json()['is_active'] is False
+
+
+@pytest.mark.anyio
+async def test_bulk_update_of_active_slots_passes_overlap_check(
+    client: AsyncClient, admin_token: str, cafe_id: int,
+) -> None:
+    """Уже активные слоты не пересекаются сами с собой."""
+    headers = {'Authorization': f'Bearer {admin_token}'}
+    ids = [
+        await _create_slot(client, headers, cafe_id, '12:00', '13:00'),
+        await _create_slot(client, headers, cafe_id, '13:00', '14:00'),
+    ]
+
+    res = await client.patch(
+        f'/cafe/{cafe_id}/time_slots/bulk',
+        headers=headers,
+        json={'ids': ids, 'data': {'is_active': True, 'description': 'Обед'}},
+    )
+
+    assert res.status_code == 200
+    assert [slot['description'] for slot in res.json()] == ['Обед', 'Обед']
@@ -0,0 +1,95 @@
+import socket
+from typing import Any, Iterator
+
+import pytest
+
+from celery_tasks.smtp import SMTPPool
+
+aiosmtpd_controller = pytest.importorskip('aiosmtpd.controller')
+
+
+class _Handler:
+    """Локальный SMTP-сервер: считает сессии и принятые письма."""
+
+    def __init__(self) -> None:
+        self.sessions = 0
+        self.recipients: list[str] = []
+
+    async def handle_EHLO(  # noqa: N802
+        self,
+        server: Any,
+        session: Any,
+        envelope: Any,
+        hostname: str,
+        responses: list[str],
+    ) -> list[str]:
+        self.sessions += 1
+        session.host_name = hostname
+        return responses
+
+    async def handle_DATA(  # noqa: N802
+        self,
+        server: Any,
+        session: Any,
+        envelope: Any,
+    ) -> str:
+        self.recipients.extend(envelope.rcpt_tos)
+        return '250 OK'
+
+
+@pytest.fixture()
+def smtp_server() -> Iterator[tuple[_Handler, int]]:
+    """Локальная замена SMTP-сервера на aiosmtpd."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    handler = _Handler()
+    controller = aiosmtpd_controller.Controller(
+        handler,
+        hostname='127.0.0.1',
+        port=port,
+    )
+    controller.start()
+    try:
+        yield handler, port
+    finally:
+        controller.stop()
+
+
+def _pool(port: int, **kwargs: Any) -> SMTPPool:
+    return SMTPPool('127.0.0.1', port, starttls=False, **kwargs)
+
+
+def test_pool_reuses_connection(smtp_server: tuple[_Handler, int]) -> None:
+    """Несколько писем уходят через одну SMTP-сессию."""
+    handler, port = smtp_server
+    pool = _pool(port)
+    for i in range(5):
+        pool.sendmail('from@a.com', f'u{i}@a.com', 'Subject: t\n\nbody')
+    pool.close()
+    assert handler.sessions == 1
+    assert len(handler.recipients) == 5
+
+
+def test_pool_max_messages(smtp_server: tuple[_Handler, int]) -> None:
+    """Соединение закрывается после max_messages писем."""
+    handler, port = smtp_server
+    pool = _pool(port, max_messages=2)
+    for i in range(5):
+        pool.sendmail('from@a.com', f'u{i}@a.com', 'Subject: t\n\nbody')
+    pool.close()
+    assert handler.sessions == 3
+
+
+def test_pool_reconnects_after_disconnect(
+    smtp_server: tuple[_Handler, int],
+) -> None:
+    """Оборванное соединение заменяется новым, письмо не теряется."""
+    handler, port = smtp_server
+    pool = _pool(port)
+    pool.sendmail('from@a.com', 'u1@a.com', 'Subject: t\n\nbody')
+    pool._idle[0].server.sock.shutdown(socket.SHUT_RDWR)
+    pool.sendmail('from@a.com', 'u2@a.com', 'Subject: t\n\nbody')
+    pool.close()
+    assert handler.sessions == 2
+    assert handler.recipients == ['u1@a.com', 'u2@a.com']
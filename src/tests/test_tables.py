@@ -83,3 +83,47 @@ async def test_user_cannot_create_table(
     res = await client.post(f'/cafe/{cafe_id}/tables', headers=headers, json=TABLE_PAYLOAD)
 
     assert res.status_code == 403
+
+
+@pytest.mark.anyio
+async def test_manager_bulk_create_tables_success(
+    client: AsyncClient, manager1_token: str, cafe_for_manager1: dict,
+) -> None:
+    """Менеджер может создать пачку столов в своем кафе."""
+    headers = {'Authorization': f'Bearer {manager1_token}'}
+    cafe_id = cafe_for_manager1['id']
+    payload = {'items': [TABLE_PAYLOAD, {**TABLE_PAYLOAD, 'seat_number': 6}]}
+
+    res = await client.post(
+        f'/cafe/{cafe_id}/tables/bulk', headers=headers, json=payload,
+    )
+
+    assert res.status_code == 200
+    data = res.json()
+    assert [table['seat_number'] for table in data] == [2, 6]
+    assert all(table['cafe']['id'] == cafe_id for table in data)
+
+
+@pytest.mark.anyio
+async def test_bulk_deactivate_tables_in_foreign_cafe_forbidden(
+    client: AsyncClient,
+    manager1_token: str,
+    manager2_token: str,
+    cafe_for_manager1: dict,
+) -> None:
+    """Менеджер не может массово деактивировать столы чужого кафе."""
+    cafe_id = cafe_for_manager1['id']
+    res_create = await client.post(
+        f'/cafe/{cafe_id}/tables/bulk',
+        headers={'Authorization': f'Bearer {manager1_token}'},
+        json={'items': [TABLE_PAYLOAD]},
+    )
+    table_ids = [table['id'] for table in res_create.json()]
+
+    res = await client.post(
+        f'/cafe/{cafe_id}/tables/bulk/deactivate',
+        headers={'Authorization': f'Bearer {manager2_token}'},
+        json={'ids': table_ids},
+    )
+
+    assert res.status_code == 403
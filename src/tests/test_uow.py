@@ -0,0 +1,75 @@
+from typing import Any
+
+import pytest
+
+from core.db import after_commit, commit_or_flush, in_uow, uow
+
+
+class RecordingSession:
+    """Сессия, записывающая commit/flush/rollback вместо работы с БД."""
+
+    def __init__(self) -> None:
+        """Пустые info и журнал вызовов."""
+        self.info: dict[str, Any] = {}
+        self.calls: list[str] = []
+
+    async def commit(self) -> None:
+        """Записать commit."""
+        self.calls.append('commit')
+
+    async def flush(self) -> None:
+        """Записать flush."""
+        self.calls.append('flush')
+
+    async def rollback(self) -> None:
+        """Записать rollback."""
+        self.calls.append('rollback')
+
+
+async def test_single_commit_at_outermost_level() -> None:
+    """Внутри uow CRUD делает flush, commit - один раз на выходе."""
+    session = RecordingSession()
+    async with uow(session):
+        await commit_or_flush(session)
+        async with uow(session):
+            assert in_uow(session)
+            await commit_or_flush(session)
+        assert session.calls == ['flush', 'flush']
+    assert session.calls == ['flush', 'flush', 'commit']
+    assert not in_uow(session)
+
+
+async def test_rollback_on_exception_in_nested_block() -> None:
+    """Исключение во вложенном блоке откатывает всю единицу работы."""
+    session = RecordingSession()
+    with pytest.raises(RuntimeError):
+        async with uow(session):
+            await commit_or_flush(session)
+            async with uow(session):
+                raise RuntimeError
+    assert session.calls == ['flush', 'rollback']
+    assert not in_uow(session)
+
+
+async def test_commit_per_call_outside_uow() -> None:
+    """Вне uow каждый вызов CRUD коммитит сам."""
+    session = RecordingSession()
+    await commit_or_flush(session)
+    await commit_or_flush(session)
+    assert session.calls == ['commit', 'commit']
+
+
+async def test_after_commit_runs_only_after_outer_commit() -> None:
+    """Отложенные действия выполняются после commit, при откате - нет."""
+    session = RecordingSession()
+    done: list[str] = []
+    with pytest.raises(RuntimeError):
+        async with uow(session):
+            after_commit(session, lambda: done.append('lost'))
+            raise RuntimeError
+    async with uow(session):
+        async with uow(session):
+            after_commit(session, lambda: done.append('kept'))
+        assert done == []
+    after_commit(session, lambda: done.append('now'))
+    assert done == ['kept', 'now']